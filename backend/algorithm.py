@@ -0,0 +1,227 @@
+"""
+분석 알고리즘 파라미터 버전 관리
+- 버전별 파라미터는 algorithm_versions 테이블에, 운영 중인 버전은 schema_meta에 저장합니다.
+- 버전은 만든 뒤 바꾸지 않으므로 프로세스마다 한 번만 읽어 AlgorithmParams로 보관합니다.
+  (numpy 계수 행렬도 처음 쓸 때 한 번만 만듦)
+- 운영 버전은 ALGORITHM_REFRESH_SECONDS마다 다시 확인하므로, 다른 워커에서 활성화해도
+  그 시간 안에 반영됩니다. (캐시/ETag/저장 결과는 버전으로 구분)
+- preview: 저장된 분석 결과에 새 버전을 배치 엔진(logic_batch)으로 적용해 바뀌는 비율을 비교
+"""
+
+from collections import Counter
+import json
+import threading
+import time
+
+from sqlalchemy import func, select
+
+from core.cache import TTLCache
+from core.config import settings
+from migrations import get_meta, set_meta
+import crud
+import logic
+import models
+
+# schema_meta 키: 운영 중인 알고리즘 버전
+ACTIVE_VERSION_KEY = "algorithm_version"
+
+# 버전 -> AlgorithmParams (버전은 바뀌지 않으므로 만료 없음)
+_algorithms = {logic.DEFAULT_ALGORITHM_VERSION: logic.DEFAULT_ALGORITHM}
+_algorithms_lock = threading.Lock()
+# 운영 버전 (다른 워커의 활성화를 반영하도록 짧게 캐시)
+_active_version = TTLCache(maxsize=1, ttl=settings.ALGORITHM_REFRESH_SECONDS)
+
+
+def get_algorithm(db, version: str):
+    """버전의 파라미터 (없으면 None)"""
+    algorithm = _algorithms.get(version)
+    if algorithm is not None:
+        return algorithm
+
+    params = db.execute(
+        select(models.AlgorithmVersion.params).where(
+            models.AlgorithmVersion.version == version
+        )
+    ).scalar()
+    if params is None:
+        return None
+    with _algorithms_lock:
+        algorithm = _algorithms.setdefault(
+            version, logic.AlgorithmParams(version, json.loads(params))
+        )
+    return algorithm
+
+
+def active_algorithm(db) -> logic.AlgorithmParams:
+    """운영 중인 버전의 파라미터 (설정된 버전이 없으면 기본 파라미터)"""
+    version = _active_version.get("active")
+    if version is None:
+        version = get_meta(db, ACTIVE_VERSION_KEY) or logic.DEFAULT_ALGORITHM_VERSION
+        _active_version.set("active", version)
+    return get_algorithm(db, version) or logic.DEFAULT_ALGORITHM
+
+
+def list_versions(db) -> dict:
+    """버전 목록 (버전별 저장된 분석 결과 수 포함)과 운영 버전"""
+    counts = dict(
+        db.query(models.AnalysisResult.algorithm_version, func.count())
+        .group_by(models.AnalysisResult.algorithm_version)
+        .all()
+    )
+    rows = (
+        db.query(models.AlgorithmVersion)
+        .order_by(models.AlgorithmVersion.created_at)
+        .all()
+    )
+    return {
+        "active": active_algorithm(db).version,
+        "versions": [
+            {
+                "version": row.version,
+                "description": row.description,
+                "params": json.loads(row.params),
+                "stored_results": counts.get(row.version, 0),
+                "created_at": row.created_at.isoformat(),
+            }
+            for row in rows
+        ],
+    }
+
+
+def create_version(db, version: str, params: dict, description: str = ""):
+    """
+    새 버전 등록 (params는 기본 파라미터에서 바꿀 값만 줘도 됨)
+    - 파라미터가 잘못되면 ValueError
+    """
+    algorithm = logic.AlgorithmParams(version, params)
+    db.add(
+        models.AlgorithmVersion(
+            version=version,
+            params=json.dumps(algorithm.params),
+            description=description,
+        )
+    )
+    db.commit()
+    return algorithm
+
+
+def activate(db, version: str) -> int:
+    """
+    운영 버전 변경 후 다른 버전으로 계산된 저장 결과 수 반환
+    - 저장된 결과는 조회할 때 다시 계산되고, 미리 바꾸려면 python recompute.py 실행
+    """
+    set_meta(db, ACTIVE_VERSION_KEY, version)
+    db.commit()
+    _active_version.set("active", version)
+    return (
+        db.query(func.count(models.AnalysisResult.id))
+        .filter(
+            (models.AnalysisResult.algorithm_version != version)
+            | models.AnalysisResult.algorithm_version.is_(None)
+        )
+        .scalar()
+    )
+
+
+def _distribution(codes, labels: list) -> dict:
+    """코드 배열 -> {라벨: 개수} (개수가 0인 라벨 제외)"""
+    import numpy as np
+
+    counts = np.bincount(codes[codes >= 0], minlength=len(labels))
+    return {label: int(n) for label, n in zip(labels, counts) if n}
+
+
+def preview(
+    db,
+    algorithm: logic.AlgorithmParams,
+    date_from: str = None,
+    date_to: str = None,
+    limit: int = None,
+) -> dict:
+    """
+    최근 저장된 분석 결과(최대 limit행)를 algorithm으로 다시 계산해 저장된 값과 비교
+    - 유저의 현재 생년월일 기준, 계산 결과는 저장하지 않음
+    - changed: MBTI/운명 MBTI/행운의 원소가 바뀌는 비율, axis_flips: 축별 MBTI 글자가 바뀌는 비율
+    """
+    import numpy as np
+
+    import logic_batch
+
+    started = time.perf_counter()
+    max_rows = settings.ALGORITHM_PREVIEW_LIMIT
+    limit = min(limit or max_rows, max_rows)
+    result = models.AnalysisResult
+    query = select(
+        result.analysis_date,
+        models.User.birthdate,
+        result.my_persona,
+        result.my_destiny,
+        result.lucky_element,
+        result.algorithm_version,
+    ).join(models.User, models.User.username == result.username)
+    if date_from:
+        query = query.where(result.analysis_date >= date_from)
+    if date_to:
+        query = query.where(result.analysis_date <= date_to)
+    rows = db.execute(query.order_by(result.id.desc()).limit(limit)).all()
+
+    saju_map = crud.get_saju_map(db, {d for row in rows for d in row[:2] if d})
+    rows = [row for row in rows if row[0] in saju_map and row[1] in saju_map]
+    report = {
+        "version": algorithm.version,
+        "rows": len(rows),
+        "baseline_versions": dict(Counter(row[5] for row in rows)),
+    }
+    if not rows:
+        return report
+
+    # 같은 날짜의 사주는 한 번만 배열로 만들고 인덱스로 펼침
+    dates = sorted(saju_map)
+    position = {d: i for i, d in enumerate(dates)}
+    sajus = logic_batch.saju_array([saju_map[d] for d in dates])
+    day_idx = np.fromiter((position[row[0]] for row in rows), np.int64, len(rows))
+    birth_idx = np.fromiter((position[row[1]] for row in rows), np.int64, len(rows))
+    scored = logic_batch.score(algorithm.compiled(), sajus, sajus, birth_idx, day_idx)
+
+    mbti_code = {mbti: i for i, mbti in enumerate(logic_batch.MBTI_TYPES)}
+    elements = [logic.ELEMENT_KO[e][0] for e in logic.ELEMENT_LIST]
+    element_code = {name: i for i, name in enumerate(elements)}
+
+    def codes(column, mapping):
+        return np.fromiter(
+            (mapping.get(row[column], -1) for row in rows), np.int64, len(rows)
+        )
+
+    stored = {
+        "persona": codes(2, mbti_code),
+        "destiny": codes(3, mbti_code),
+        "lucky": codes(4, element_code),
+    }
+    flipped = stored["persona"] ^ scored["persona"]
+    report.update(
+        {
+            "changed": {
+                "persona": float(np.mean(stored["persona"] != scored["persona"])),
+                "destiny": float(np.mean(stored["destiny"] != scored["destiny"])),
+                "lucky_element": float(np.mean(stored["lucky"] != scored["lucky"])),
+            },
+            "axis_flips": {
+                axis: float(np.mean((flipped >= 0) & ((flipped >> (3 - i)) & 1 > 0)))
+                for i, (axis, _, _) in enumerate(logic.AXES)
+            },
+            "persona": {
+                "before": _distribution(stored["persona"], logic_batch.MBTI_TYPES),
+                "after": _distribution(scored["persona"], logic_batch.MBTI_TYPES),
+            },
+            "destiny": {
+                "before": _distribution(stored["destiny"], logic_batch.MBTI_TYPES),
+                "after": _distribution(scored["destiny"], logic_batch.MBTI_TYPES),
+            },
+            "lucky_element": {
+                "before": _distribution(stored["lucky"], elements),
+                "after": _distribution(scored["lucky"], elements),
+            },
+            "seconds": round(time.perf_counter() - started, 3),
+        }
+    )
+    return report
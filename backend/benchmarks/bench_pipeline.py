@@ -0,0 +1,395 @@
+"""
+분석 파이프라인 / 주요 API 벤치마크
+- logic.py 함수(간지 파싱, 프로필/축 계산, 설명 문장 생성, 전체 파이프라인)와
+  유명인 태그 필터링을 함수 단위로 측정합니다.
+- 임시 SQLite DB에 유저/분석 기록을 채운 뒤 TestClient로 main.app을 거쳐
+  /api/analyze/today, /api/calendar/month, /api/stats/all-time 응답 시간을 측정합니다.
+- 결과는 JSON으로 저장하고, --compare로 이전 결과와 비교해 느려진 항목이 있으면
+  종료 코드 1을 반환합니다. (커밋 간 성능 회귀 확인용)
+- TestClient에 httpx가 필요합니다. (pip install -r requirements-dev.txt)
+
+사용법 (backend 폴더에서):
+    python benchmarks/bench_pipeline.py [--users 200] [--days 30] [--requests 100]
+    python benchmarks/bench_pipeline.py --output new.json --compare old.json
+"""
+
+import argparse
+from datetime import date, timedelta
+import json
+import math
+import os
+from pathlib import Path
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+RESULTS_DIR = BACKEND_DIR / "benchmarks" / "results"
+sys.path.insert(0, str(BACKEND_DIR))
+
+# 결과 비교에 쓰는 대표 지표
+PRIMARY_METRIC = {"function": "median_us", "http": "p50_ms"}
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _percentile(sorted_values: list, q: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def bench_function(fn, inputs: list, repeat: int, min_time: float = 0.1) -> dict:
+    """inputs(인자 튜플 목록)를 모두 호출하는 시간을 repeat번 측정 (호출 1회당 시간)"""
+    started = time.perf_counter()
+    for args in inputs:
+        fn(*args)
+    once = time.perf_counter() - started
+    passes = max(1, math.ceil(min_time / max(once, 1e-9)))
+
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(passes):
+            for args in inputs:
+                fn(*args)
+        samples.append((time.perf_counter() - started) / (passes * len(inputs)))
+
+    median = statistics.median(samples)
+    return {
+        "kind": "function",
+        "calls": passes * len(inputs) * repeat,
+        "median_us": round(median * 1e6, 3),
+        "min_us": round(min(samples) * 1e6, 3),
+        "ops_per_sec": round(1 / median, 1),
+    }
+
+
+def bench_requests(client, requests: list, before=None, warmup: int = 5) -> dict:
+    """(url, headers) 목록을 순서대로 GET 요청해 응답 시간 분포 측정"""
+    for url, headers in requests[:warmup]:
+        client.get(url, headers=headers)
+
+    latencies = []
+    errors = 0
+    started = time.perf_counter()
+    for url, headers in requests:
+        if before:
+            before()
+        sent = time.perf_counter()
+        response = client.get(url, headers=headers)
+        latencies.append(time.perf_counter() - sent)
+        if response.status_code != 200:
+            errors += 1
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "kind": "http",
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(_percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 3),
+        "mean_ms": round(statistics.mean(latencies) * 1000, 3),
+        "rps": round(len(latencies) / elapsed, 1),
+    }
+
+
+def _configure_env(tmp_dir: str) -> None:
+    """임시 디렉터리의 SQLite DB / 블랙리스트 / 메트릭 파일을 쓰도록 설정 (앱 import 전)"""
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}"
+    os.environ["TOKEN_BLACKLIST_PATH"] = os.path.join(tmp_dir, "blacklist.db")
+    os.environ["MIGRATION_LOCK_PATH"] = os.path.join(tmp_dir, ".migration.lock")
+    os.environ["METRICS_DIR"] = os.path.join(tmp_dir, "metrics")
+    os.environ["AUTO_MIGRATE"] = "true"
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+
+
+def seed(db, users: int, days: int, rng: random.Random) -> list:
+    """벤치마크 유저와 최근 days일 분석 기록 생성, (username, 생일) 목록 반환"""
+    import crud
+    import logic
+
+    first = date(1960, 1, 1).toordinal()
+    last = date(2005, 12, 31).toordinal()
+    people = [
+        (f"bench{i:05d}", date.fromordinal(rng.randint(first, last)).isoformat())
+        for i in range(users)
+    ]
+    # 로그인하지 않고 토큰을 직접 발급하므로 비밀번호 해시는 검증되지 않는 값
+    rows = [
+        {
+            "username": username,
+            "hashed_password": "benchmark",
+            "nickname": username,
+            "birthdate": birthdate,
+            "gender": rng.choice(["M", "F"]),
+        }
+        for username, birthdate in people
+    ]
+    for i in range(0, len(rows), 500):
+        crud.insert_users(db, rows[i : i + 500])
+
+    today = date.today()
+    history = [(today - timedelta(days=n)).isoformat() for n in range(days)]
+    saju_map = crud.get_saju_map(db, history + [b for _, b in people])
+
+    batch = []
+    for username, birthdate in people:
+        for day in history:
+            result = logic.analyze_daily(saju_map[birthdate], saju_map[day])
+            batch.append(crud.analysis_row(username, day, result))
+            if len(batch) >= 500:
+                crud.upsert_analysis_results(db, batch)
+                batch = []
+    if batch:
+        crud.upsert_analysis_results(db, batch)
+    db.commit()
+    return people
+
+
+def run_logic_benchmarks(db, people: list, repeat: int, rng: random.Random) -> dict:
+    import crud
+    import logic
+    import logic_batch
+    import models
+    from core.saju_file import PILLAR_NAMES
+    from routers.analysis import get_random_celebrity
+
+    today = date.today()
+    days = [
+        (today + timedelta(days=rng.randint(-3650, 365))).isoformat() for _ in range(50)
+    ]
+    saju_map = crud.get_saju_map(db, days + [b for _, b in people])
+    pairs = [
+        (saju_map[birthdate], saju_map[rng.choice(days)])
+        for _, birthdate in people[:500]
+    ]
+
+    profiles = [
+        (logic.saju_to_profile(birth), logic.saju_to_profile(day))
+        for birth, day in pairs
+    ]
+    combined = [logic.combine_profiles(b, t, birth_weight=0.4) for b, t in profiles]
+    base_axes = [logic.profile_to_axes(c) for c in combined]
+    axes = [logic.apply_daily_rotation(a, day) for a, (_, day) in zip(base_axes, pairs)]
+    explanation_inputs = [
+        (c, a, logic.axes_to_mbti(a), logic.get_destiny_partner(a), day)
+        for c, a, (_, day) in zip(combined, axes, pairs)
+    ]
+    ganji = [(name,) for name in PILLAR_NAMES]
+    ganji_triples = [
+        (rng.choice(PILLAR_NAMES), rng.choice(PILLAR_NAMES), rng.choice(PILLAR_NAMES))
+        for _ in range(200)
+    ]
+
+    # 유명인 태그 필터: 실제 데이터에서 자주 쓰이는 태그로 조회
+    tag_counts = {}
+    for (tags,) in db.query(models.MbtiCelebrity.tags):
+        for tag in json.loads(tags or "[]"):
+            tag_counts[tag] = tag_counts.get(tag, 0) + 1
+    top_tags = sorted(tag_counts, key=tag_counts.get, reverse=True)[:2]
+    mbtis = [logic.axes_to_mbti(a) for a in axes[:64]]
+
+    # 배치 엔진: pairs 전체를 한 번에 계산 (호출 1회 = len(pairs)쌍)
+    compiled = logic.DEFAULT_ALGORITHM.compiled()
+    batch = (
+        logic_batch.saju_array([birth for birth, _ in pairs]),
+        logic_batch.saju_array([day for _, day in pairs]),
+    )
+
+    return {
+        "logic.parse_ganji_to_index": bench_function(
+            logic.parse_ganji_to_index, ganji, repeat
+        ),
+        "logic.ganji_to_saju": bench_function(
+            logic.ganji_to_saju, ganji_triples, repeat
+        ),
+        "logic.saju_to_profile": bench_function(
+            logic.saju_to_profile, [(birth,) for birth, _ in pairs], repeat
+        ),
+        "logic.combine_profiles": bench_function(
+            logic.combine_profiles, profiles, repeat
+        ),
+        "logic.profile_to_axes": bench_function(
+            logic.profile_to_axes, [(c,) for c in combined], repeat
+        ),
+        "logic.apply_daily_rotation": bench_function(
+            logic.apply_daily_rotation,
+            [(a, day) for a, (_, day) in zip(base_axes, pairs)],
+            repeat,
+        ),
+        "logic.generate_explanation": bench_function(
+            logic.generate_explanation, explanation_inputs, repeat
+        ),
+        "logic.analyze_daily": bench_function(logic.analyze_daily, pairs, repeat),
+        f"logic_batch.score ({len(pairs)}쌍)": bench_function(
+            lambda birth, day: logic_batch.score(compiled, birth, day), [batch], repeat
+        ),
+        "celebrity.filter (태그 없음)": bench_function(
+            lambda mbti: get_random_celebrity(db, mbti),
+            [(m,) for m in mbtis],
+            repeat,
+        ),
+        "celebrity.filter (include_tags)": bench_function(
+            lambda mbti: get_random_celebrity(db, mbti, include_tags=top_tags),
+            [(m,) for m in mbtis],
+            repeat,
+        ),
+    }
+
+
+def run_http_benchmarks(client, people: list, count: int) -> dict:
+    from core.cache import analysis_cache
+    from core.security import create_access_token
+
+    headers = [
+        {"Authorization": f"Bearer {create_access_token({'sub': username})}"}
+        for username, _ in people
+    ]
+    today = date.today()
+
+    def rotate(url: str) -> list:
+        return [(url, headers[i % len(headers)]) for i in range(count)]
+
+    return {
+        "GET /api/analyze/today (캐시 미스)": bench_requests(
+            client, rotate("/api/analyze/today"), before=analysis_cache.clear
+        ),
+        "GET /api/analyze/today (캐시 적중)": bench_requests(
+            client, rotate("/api/analyze/today")
+        ),
+        "GET /api/calendar/month": bench_requests(
+            client, rotate(f"/api/calendar/month/{today.year}/{today.month}")
+        ),
+        "GET /api/stats/all-time": bench_requests(
+            client, rotate("/api/stats/all-time")
+        ),
+    }
+
+
+def compare(results: dict, baseline_path: str, threshold: float) -> list:
+    """기준 결과 대비 대표 지표가 threshold 비율 이상 느려진 항목 목록"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    print(f"\n📈 기준 결과와 비교: {baseline_path} ({baseline['meta']['commit']})")
+    regressions = []
+    for name, result in results.items():
+        old = baseline["results"].get(name)
+        if old is None or old["kind"] != result["kind"]:
+            continue
+        metric = PRIMARY_METRIC[result["kind"]]
+        change = result[metric] / old[metric] - 1 if old[metric] else 0.0
+        mark = "🔺" if change > threshold else "  "
+        print(
+            f"  {mark} {name:<36} {old[metric]:>10.3f} -> {result[metric]:>10.3f}"
+            f" {metric} ({change:+.1%})"
+        )
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="분석 파이프라인 / API 벤치마크")
+    parser.add_argument("--users", type=int, default=200, help="시드 유저 수")
+    parser.add_argument("--days", type=int, default=30, help="유저별 분석 기록 일수")
+    parser.add_argument("--requests", type=int, default=100, help="API별 요청 수")
+    parser.add_argument("--repeat", type=int, default=5, help="함수별 측정 반복 횟수")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="", help="결과 JSON 경로")
+    parser.add_argument("--compare", default="", help="비교할 이전 결과 JSON")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="회귀로 볼 변화율 (0.2 = 20%%)"
+    )
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    commit = _git_commit()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        _configure_env(tmp_dir)
+
+        from fastapi.testclient import TestClient
+
+        from database import SessionLocal, engine
+        import main as app_main
+
+        # lifespan에서 테이블 생성 / 사주·유명인 데이터 적재
+        with TestClient(app_main.app) as client:
+            db = SessionLocal()
+            try:
+                started = time.perf_counter()
+                people = seed(db, args.users, args.days, rng)
+                print(
+                    f"🌱 유저 {args.users}명 x {args.days}일 시드"
+                    f" ({time.perf_counter() - started:.1f}s)"
+                )
+                results = run_logic_benchmarks(db, people, args.repeat, rng)
+            finally:
+                db.close()
+            results.update(run_http_benchmarks(client, people, args.requests))
+        engine.dispose()
+
+    report = {
+        "meta": {
+            "commit": commit,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "users": args.users,
+            "days": args.days,
+            "requests": args.requests,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+    print(f"\n📊 벤치마크 결과 ({commit})")
+    for name, result in results.items():
+        if result["kind"] == "function":
+            print(
+                f"  {name:<36} 중앙값 {result['median_us']:>10.3f} us"
+                f"  ({result['ops_per_sec']:,.0f} ops/s)"
+            )
+        else:
+            print(
+                f"  {name:<36} p50 {result['p50_ms']:>8.2f} ms"
+                f"  p95 {result['p95_ms']:>8.2f} ms  {result['rps']:>7.1f} req/s"
+                f"  오류 {result['errors']}"
+            )
+
+    output = args.output or str(RESULTS_DIR / f"pipeline-{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 {output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions:
+            print(
+                f"❌ {len(regressions)}개 항목이 {args.threshold:.0%} 이상 느려졌습니다."
+            )
+            sys.exit(1)
+        print("✅ 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+사주 CSV 적재 벤치마크
+- 기존 방식(DataFrame.to_sql)과 saju_loader.load_saju(CSV / 바이너리 파일)의
+  적재 시간, 바이너리 파일 조회 시간을 비교합니다.
+- 기본은 임시 SQLite 파일, --database-url로 PostgreSQL 등 다른 DB를 지정할 수 있습니다.
+  (지정한 DB의 saju_table 내용은 덮어씁니다)
+
+사용법 (backend 폴더에서):
+    python benchmarks/bench_saju_load.py [--repeat 3] [--database-url URL]
+"""
+
+import argparse
+import os
+from pathlib import Path
+import statistics
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+# 설정 검사를 통과하도록 (벤치마크는 자체 engine을 사용)
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import pandas as pd  # noqa: E402
+from sqlalchemy import create_engine, text  # noqa: E402
+
+import models  # noqa: E402
+from core.saju_file import SajuFile  # noqa: E402
+from saju_loader import (  # noqa: E402
+    DEFAULT_CSV_PATH,
+    build_saju_file,
+    file_checksum,
+    load_saju,
+    read_saju_csv,
+)
+
+
+def _timed(fn, repeat: int) -> list:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return times
+
+
+def _fresh_engine(database_url: str, tmp_dir: str, name: str):
+    """빈 saju_table이 있는 engine (SQLite는 매번 새 파일)"""
+    if database_url:
+        engine = create_engine(database_url)
+        models.SchemaMeta.__table__.create(bind=engine, checkfirst=True)
+        models.Saju.__table__.create(bind=engine, checkfirst=True)
+        with engine.begin() as conn:
+            conn.execute(text("DELETE FROM saju_table"))
+            conn.execute(text("DELETE FROM schema_meta WHERE key = 'saju_checksum'"))
+        return engine
+    path = os.path.join(tmp_dir, f"{name}.db")
+    if os.path.exists(path):
+        os.remove(path)
+    engine = create_engine(f"sqlite:///{path}")
+    models.SchemaMeta.__table__.create(bind=engine)
+    models.Saju.__table__.create(bind=engine)
+    return engine
+
+
+def main():
+    parser = argparse.ArgumentParser(description="사주 CSV 적재 벤치마크")
+    parser.add_argument("--csv", default=str(DEFAULT_CSV_PATH))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--database-url", default="")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+
+        def legacy():
+            engine = _fresh_engine(args.database_url, tmp_dir, "legacy")
+            df = pd.read_csv(args.csv)
+            df.to_sql("saju_table", engine, if_exists="append", index=False)
+            engine.dispose()
+
+        no_bin = os.path.join(tmp_dir, "missing.bin")
+        bin_path = os.path.join(tmp_dir, "saju.bin")
+
+        def bulk(source):
+            engine = _fresh_engine(args.database_url, tmp_dir, "bulk")
+            load_saju(engine, args.csv, force=True, bin_path=source)
+            engine.dispose()
+
+        skip_engine = _fresh_engine(args.database_url, tmp_dir, "skip")
+        load_saju(skip_engine, args.csv, bin_path=no_bin)
+
+        build_saju_file(args.csv, bin_path)
+        saju_file = SajuFile(bin_path)
+        dates = [row[0] for row in saju_file.iter_rows()]
+
+        def lookup_all():
+            for d in dates:
+                saju_file.get_saju(d)
+
+        results = {
+            "checksum": _timed(lambda: file_checksum(args.csv), args.repeat),
+            "read + 검증": _timed(lambda: read_saju_csv(args.csv), args.repeat),
+            "to_sql (기존)": _timed(legacy, args.repeat),
+            "load_saju (CSV)": _timed(lambda: bulk(no_bin), args.repeat),
+            "load_saju (바이너리)": _timed(lambda: bulk(bin_path), args.repeat),
+            "load_saju (체크섬 일치)": _timed(
+                lambda: load_saju(skip_engine, args.csv, bin_path=no_bin), args.repeat
+            ),
+            "바이너리 파일 생성": _timed(
+                lambda: build_saju_file(args.csv, bin_path), args.repeat
+            ),
+            "바이너리 전체 날짜 조회": _timed(lookup_all, args.repeat),
+        }
+        skip_engine.dispose()
+        saju_file.close()
+
+    rows = len(read_saju_csv(args.csv))
+    target = args.database_url.split("://")[0] if args.database_url else "sqlite"
+    print(f"📊 {args.csv} ({rows}행, DB: {target}, {args.repeat}회 반복)")
+    for name, times in results.items():
+        print(
+            f"  {name:<24} 중앙값 {statistics.median(times) * 1000:9.1f} ms"
+            f"  (최소 {min(times) * 1000:.1f} ms)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+앱 import 시간 예산 검사
+- 새 프로세스에서 `python -X importtime -c "import main"`을 실행해 결과를 집계합니다.
+- 시딩 전용 무거운 모듈(pandas 등)이 import되거나, import 시간이 예산을 넘으면
+  종료 코드 1로 실패합니다. (CI/배포 전 점검용)
+- 예산은 같은 실행에서 잰 기준 import(fastapi, sqlalchemy)의 배수입니다.
+  기계 속도와 상관없이 앱 자체 코드가 늘린 시간만 봅니다.
+  (개발 환경 기준 main 약 700 ms / 기준 약 470 ms = 약 1.5배)
+- 다른 프로세스의 부하 영향을 줄이도록 여러 번 실행해 가장 빠른 값을 씁니다.
+- --budget-ms를 주면 절대 시간 예산도 함께 검사합니다.
+- pytest(tests/test_import_time.py)도 같은 예산으로 검사합니다.
+
+사용법 (backend 폴더에서):
+    python benchmarks/check_import_time.py [--max-ratio 2.0] [--budget-ms N]
+        [--top 15] [--runs 5]
+"""
+
+import argparse
+import os
+from pathlib import Path
+import subprocess
+import sys
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# 예산 기준: 앱이 반드시 쓰는 프레임워크만 import
+BASELINE_MODULES = "fastapi, sqlalchemy"
+
+# 앱 시작(워커 부팅) 시 import되면 안 되는 모듈
+FORBIDDEN_MODULES = ("pandas", "numpy", "init_celebrities", "saju_loader", "passlib")
+
+
+def run_importtime(module: str) -> list:
+    """
+    -X importtime 결과 파싱 -> [(모듈명, 자체 us, 누적 us, 깊이)]
+    """
+    env = dict(os.environ)
+    env.setdefault("SECRET_KEY", "import-time-check")
+    env.setdefault("DATABASE_URL", "sqlite://")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} 실패:\n{proc.stderr[-2000:]}")
+
+    entries = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="앱 import 시간 예산 검사")
+    parser.add_argument("--module", default="main")
+    parser.add_argument(
+        "--max-ratio",
+        type=float,
+        default=2.0,
+        help=f"기준 import({BASELINE_MODULES}) 대비 최대 배수",
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=None,
+        help="절대 시간 예산 (기본: 검사 안 함)",
+    )
+    parser.add_argument("--top", type=int, default=15, help="출력할 무거운 모듈 수")
+    parser.add_argument(
+        "--runs", type=int, default=5, help="실행 횟수 (가장 빠른 값 사용)"
+    )
+    args = parser.parse_args()
+
+    # 부하 변화가 양쪽에 비슷하게 반영되도록 번갈아 실행
+    totals = []
+    baselines = []
+    for _ in range(args.runs):
+        baseline = run_importtime(BASELINE_MODULES)
+        baselines.append(sum(e[1] for e in baseline) / 1000)
+        entries = run_importtime(args.module)
+        totals.append(sum(e[1] for e in entries) / 1000)
+    total_ms = min(totals)
+    baseline_ms = min(baselines)
+    ratio = total_ms / baseline_ms
+
+    # 마지막 실행 기준: 최상위(깊이 0/1) 모듈별 누적 시간
+    print(
+        f"📊 import {args.module}: 최소 {total_ms:.0f} ms, "
+        f"기준({BASELINE_MODULES}) {baseline_ms:.0f} ms, {ratio:.2f}배 ({args.runs}회)"
+    )
+    top_level = sorted(
+        (e for e in entries if e[3] <= 1), key=lambda e: e[2], reverse=True
+    )
+    for name, _, cumulative_us, _ in top_level[: args.top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+    failed = False
+    imported = {e[0] for e in entries}
+    forbidden = [m for m in FORBIDDEN_MODULES if m in imported]
+    if forbidden:
+        failed = True
+        print(f"❌ 시작 시 import되면 안 되는 모듈: {', '.join(forbidden)}")
+    if ratio > args.max_ratio:
+        failed = True
+        print(
+            f"❌ import 시간 예산 초과: 기준의 {ratio:.2f}배 > {args.max_ratio:.2f}배"
+        )
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        failed = True
+        print(f"❌ import 시간 예산 초과: {total_ms:.0f} ms > {args.budget_ms:.0f} ms")
+
+    if failed:
+        sys.exit(1)
+    print(f"✅ 예산 이내 (기준의 {ratio:.2f}배 <= {args.max_ratio:.2f}배)")
+
+
+if __name__ == "__main__":
+    main()
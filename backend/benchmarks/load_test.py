@@ -0,0 +1,393 @@
+"""
+로컬 부하 테스트
+- 실제 main.app을 띄운 uvicorn(이미 실행 중인 서버 또는 --spawn으로 직접 실행)에
+  비동기 httpx 클라이언트로 요청을 보냅니다.
+- 현실적인 생년월일의 유저 N명을 가입/로그인시킨 뒤, 분석/캘린더/통계/유명인 요청을
+  --mix 비율로 섞어 목표 초당 요청 수(--rate)만큼 --duration초 동안 보냅니다.
+- 요청은 정해진 시각에 보내며(개방형 부하), 응답 시간은 예정 시각부터 재므로
+  서버가 밀려 대기한 시간도 지연에 포함됩니다.
+- 요청 종류별 처리량, 응답 시간 백분위(p50/p90/p95/p99), 오류율을 출력합니다.
+
+사용법 (backend 폴더에서):
+    # 이미 실행 중인 서버
+    python benchmarks/load_test.py --base-url http://127.0.0.1:8000 --rate 100
+    # uvicorn 워커 4개를 임시 SQLite DB로 띄워서 실행 (워커 수 비교용)
+    python benchmarks/load_test.py --spawn --workers 4 --rate 200 --duration 60
+    # 로컬 PostgreSQL로 실행
+    python benchmarks/load_test.py --spawn --database-url postgresql://localhost/db
+"""
+
+import argparse
+import asyncio
+from datetime import date, timedelta
+import json
+import os
+from pathlib import Path
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+DEFAULT_MIX = "analyze=50,calendar=20,stats=10,celebrity=20"
+MBTI_TYPES = [a + b + c + d for a in "EI" for b in "SN" for c in "TF" for d in "JP"]
+PASSWORD = "loadtest-password"
+
+
+def parse_mix(text: str) -> dict:
+    """'analyze=50,calendar=20' -> {"analyze": 50.0, "calendar": 20.0}"""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in REQUESTS:
+            raise ValueError(f"알 수 없는 요청 종류: {name} ({', '.join(REQUESTS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def random_birthdate(rng: random.Random) -> str:
+    """10~50대 위주 생년월일 (20대 후반이 가장 많도록)"""
+    year = int(rng.triangular(1965, 2010, 1997))
+    day = rng.randrange(365)
+    return (date(year, 1, 1) + timedelta(days=day)).isoformat()
+
+
+# --- 요청 종류별 경로 ---
+
+
+def _analyze(rng, today):
+    return "/api/analyze/today"
+
+
+def _calendar(rng, today):
+    # 대부분 이번 달, 가끔 지난 달
+    month = today.replace(day=1)
+    if rng.random() < 0.2:
+        month = (month - timedelta(days=1)).replace(day=1)
+    return f"/api/calendar/month/{month.year}/{month.month}"
+
+
+def _stats(rng, today):
+    if rng.random() < 0.5:
+        return "/api/stats/all-time"
+    return f"/api/stats/monthly?year={today.year}&month={today.month}"
+
+
+def _celebrity(rng, today):
+    return f"/api/celebrities/{rng.choice(MBTI_TYPES)}"
+
+
+REQUESTS = {
+    "analyze": _analyze,
+    "calendar": _calendar,
+    "stats": _stats,
+    "celebrity": _celebrity,
+}
+
+
+class Recorder:
+    """요청 종류별 응답 시간 / 오류 집계"""
+
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+
+    def add(self, kind: str, latency: float, error: str = None) -> None:
+        self.latencies.setdefault(kind, []).append(latency)
+        if error:
+            errors = self.errors.setdefault(kind, {})
+            errors[error] = errors.get(error, 0) + 1
+
+    def summary(self, elapsed: float) -> dict:
+        def describe(latencies, errors):
+            latencies = sorted(latencies)
+            count = len(latencies)
+            failed = sum(errors.values())
+
+            def pct(q):
+                index = min(count - 1, int(round(q * (count - 1))))
+                return round(latencies[index] * 1000, 2)
+
+            return {
+                "requests": count,
+                "errors": failed,
+                "error_rate": round(failed / count, 4) if count else 0.0,
+                "error_kinds": errors,
+                "rps": round(count / elapsed, 1),
+                "p50_ms": pct(0.50),
+                "p90_ms": pct(0.90),
+                "p95_ms": pct(0.95),
+                "p99_ms": pct(0.99),
+                "max_ms": round(latencies[-1] * 1000, 2),
+                "mean_ms": round(statistics.mean(latencies) * 1000, 2),
+            }
+
+        result = {
+            kind: describe(latencies, self.errors.get(kind, {}))
+            for kind, latencies in sorted(self.latencies.items())
+        }
+        all_errors = {}
+        for errors in self.errors.values():
+            for key, count in errors.items():
+                all_errors[key] = all_errors.get(key, 0) + count
+        all_latencies = [x for values in self.latencies.values() for x in values]
+        if all_latencies:
+            result["total"] = describe(all_latencies, all_errors)
+        return result
+
+
+# --- 준비: 가입 / 로그인 ---
+
+
+async def _register_and_login(client, sem, username, birthdate, rng) -> str:
+    async with sem:
+        payload = {
+            "username": username,
+            "password": PASSWORD,
+            "nickname": username,
+            "birthdate": birthdate,
+            "gender": rng.choice(["M", "F"]),
+        }
+        # bcrypt 작업이 몰려 503이면 잠시 뒤 재시도 (400은 이미 가입된 유저)
+        for _ in range(30):
+            response = await client.post("/api/register", json=payload)
+            if response.status_code != 503:
+                break
+            await asyncio.sleep(0.5)
+        for _ in range(30):
+            response = await client.post(
+                "/api/login", data={"username": username, "password": PASSWORD}
+            )
+            if response.status_code != 503:
+                break
+            await asyncio.sleep(0.5)
+        response.raise_for_status()
+        return response.json()["access_token"]
+
+
+async def prepare_users(client, count: int, concurrency: int, rng) -> list:
+    """loadtest 유저 count명 가입/로그인 후 토큰 목록 반환"""
+    sem = asyncio.Semaphore(concurrency)
+    tasks = [
+        _register_and_login(client, sem, f"load{i:06d}", random_birthdate(rng), rng)
+        for i in range(count)
+    ]
+    return await asyncio.gather(*tasks)
+
+
+# --- 부하 ---
+
+
+async def _send(client, sem, recorder, kind, url, headers, scheduled):
+    async with sem:
+        error = None
+        try:
+            response = await client.get(url, headers=headers)
+            if response.status_code >= 400:
+                error = str(response.status_code)
+        except httpx.HTTPError as e:
+            error = type(e).__name__
+    recorder.add(kind, time.perf_counter() - scheduled, error)
+
+
+async def run_load(client, tokens, mix, rate, duration, concurrency, rng) -> tuple:
+    """rate(초당 요청 수)로 duration초 동안 요청, (Recorder, 실제 소요 시간) 반환"""
+    kinds = list(mix)
+    weights = [mix[k] for k in kinds]
+    headers = [{"Authorization": f"Bearer {token}"} for token in tokens]
+    today = date.today()
+
+    recorder = Recorder()
+    sem = asyncio.Semaphore(concurrency)
+    tasks = []
+    started = time.perf_counter()
+    total = int(rate * duration)
+    for i in range(total):
+        scheduled = started + i / rate
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        kind = rng.choices(kinds, weights)[0]
+        url = REQUESTS[kind](rng, today)
+        tasks.append(
+            asyncio.create_task(
+                _send(client, sem, recorder, kind, url, rng.choice(headers), scheduled)
+            )
+        )
+    await asyncio.gather(*tasks)
+    return recorder, time.perf_counter() - started
+
+
+# --- uvicorn 실행 ---
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def spawn_server(args, tmp_dir: str):
+    """임시 설정으로 uvicorn main:app 실행, (프로세스, base_url) 반환"""
+    port = args.port or _free_port()
+    env = dict(os.environ)
+    env["DATABASE_URL"] = args.database_url or (
+        f"sqlite:///{os.path.join(tmp_dir, 'load.db')}"
+    )
+    env.setdefault("SECRET_KEY", "loadtest")
+    env["TOKEN_BLACKLIST_PATH"] = os.path.join(tmp_dir, "blacklist.db")
+    env["MIGRATION_LOCK_PATH"] = os.path.join(tmp_dir, ".migration.lock")
+    env["METRICS_DIR"] = os.path.join(tmp_dir, "metrics")
+    # 준비 단계의 가입/로그인이 오래 걸리지 않도록 (지정하면 그 값을 사용)
+    env.setdefault("BCRYPT_ROUNDS", "4")
+
+    command = [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "main:app",
+        "--host",
+        "127.0.0.1",
+        "--port",
+        str(port),
+        "--workers",
+        str(args.workers),
+        "--log-level",
+        "warning",
+        "--no-access-log",
+    ]
+    process = subprocess.Popen(command, cwd=BACKEND_DIR, env=env)
+    base_url = f"http://127.0.0.1:{port}"
+
+    deadline = time.time() + 180
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn이 종료되었습니다 (코드 {process.returncode})")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return process, base_url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError("uvicorn이 180초 안에 준비되지 않았습니다")
+
+
+def print_summary(summary: dict, target_rate: float) -> None:
+    print(f"\n📊 결과 (목표 {target_rate:g} req/s)")
+    print(
+        f"  {'종류':<10} {'요청':>7} {'req/s':>8} {'오류율':>7}"
+        f" {'p50':>8} {'p90':>8} {'p95':>8} {'p99':>8} {'max':>8} (ms)"
+    )
+    for kind, s in summary.items():
+        print(
+            f"  {kind:<10} {s['requests']:>7} {s['rps']:>8.1f} {s['error_rate']:>7.2%}"
+            f" {s['p50_ms']:>8.1f} {s['p90_ms']:>8.1f} {s['p95_ms']:>8.1f}"
+            f" {s['p99_ms']:>8.1f} {s['max_ms']:>8.1f}"
+        )
+        if s["error_kinds"]:
+            print(f"  {'':<10} 오류: {s['error_kinds']}")
+
+
+async def run(args, base_url: str) -> dict:
+    rng = random.Random(args.seed)
+    mix = parse_mix(args.mix)
+    limits = httpx.Limits(
+        max_connections=args.concurrency, max_keepalive_connections=args.concurrency
+    )
+    timeout = httpx.Timeout(args.timeout)
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=timeout
+    ) as client:
+        started = time.perf_counter()
+        tokens = await prepare_users(client, args.users, args.setup_concurrency, rng)
+        print(
+            f"👥 유저 {len(tokens)}명 가입/로그인 완료"
+            f" ({time.perf_counter() - started:.1f}s)"
+        )
+
+        if args.warmup:
+            print(f"🔥 워밍업 {args.warmup:g}초")
+            await run_load(
+                client, tokens, mix, args.rate, args.warmup, args.concurrency, rng
+            )
+
+        print(f"🚀 {args.rate:g} req/s x {args.duration:g}초 ({args.mix})")
+        recorder, elapsed = await run_load(
+            client, tokens, mix, args.rate, args.duration, args.concurrency, rng
+        )
+    return recorder.summary(elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 부하 테스트")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument(
+        "--spawn", action="store_true", help="uvicorn main:app을 직접 실행"
+    )
+    parser.add_argument("--workers", type=int, default=1, help="--spawn 워커 수")
+    parser.add_argument("--port", type=int, default=0, help="--spawn 포트 (0=자동)")
+    parser.add_argument(
+        "--database-url", default="", help="--spawn DB (기본: 임시 SQLite)"
+    )
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="요청 종류=비율 목록")
+    parser.add_argument("--rate", type=float, default=50, help="목표 초당 요청 수")
+    parser.add_argument("--duration", type=float, default=30, help="측정 시간(초)")
+    parser.add_argument("--warmup", type=float, default=5, help="워밍업 시간(초)")
+    parser.add_argument("--concurrency", type=int, default=256, help="최대 동시 요청")
+    parser.add_argument("--setup-concurrency", type=int, default=16)
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="", help="결과 JSON 경로")
+    args = parser.parse_args()
+
+    try:
+        parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        process = None
+        base_url = args.base_url
+        if args.spawn:
+            process, base_url = spawn_server(args, tmp_dir)
+            print(f"🔧 uvicorn 워커 {args.workers}개 실행: {base_url}")
+        try:
+            summary = asyncio.run(run(args, base_url))
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait(timeout=30)
+
+    print_summary(summary, args.rate)
+
+    if args.output:
+        report = {
+            "meta": {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "base_url": base_url,
+                "spawn": args.spawn,
+                "workers": args.workers if args.spawn else None,
+                "users": args.users,
+                "mix": parse_mix(args.mix),
+                "rate": args.rate,
+                "duration": args.duration,
+                "concurrency": args.concurrency,
+            },
+            "results": summary,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""
+계정 삭제 공용 처리 (본인 탈퇴 / 관리자 일괄 삭제)
+- DB 삭제는 crud.delete_users(집합 단위 DELETE)에 맡기고,
+  이 프로세스의 캐시와 write-behind 큐에 남은 해당 유저 데이터를 함께 정리합니다.
+"""
+
+from sqlalchemy.orm import Session
+
+from core.cache import analysis_cache
+from core.security import invalidate_user_cache
+from core.write_behind import analysis_write_buffer
+import crud
+
+
+def remove_users(db: Session, usernames: list) -> dict:
+    """
+    유저 삭제 (분석 결과 포함) 후 commit
+    - 삭제된 (유저 수, 분석 결과 수)를 반환
+    """
+    # 아직 저장되지 않은 분석 결과가 삭제 후 다시 쓰이지 않도록 제거
+    for username in usernames:
+        analysis_write_buffer.discard_user(username)
+
+    result = crud.delete_users(db, usernames)
+    db.commit()
+
+    for username in usernames:
+        invalidate_user_cache(username)
+        analysis_cache.pop(username)
+    return result
@@ -0,0 +1,64 @@
+"""
+배치 작업 공용 도구 (precompute / recompute)
+- 샤드: username 해시로 여러 프로세스/서버가 대상을 나눠 맡음
+- run_chunks: 청크 계산은 프로세스 풀에서, 저장은 호출한 프로세스에서 청크 순서대로 실행
+"""
+
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import zlib
+
+
+def in_shard(username: str, shard: int, shards: int) -> bool:
+    """username 해시로 샤드 배정 (프로세스/서버가 달라도 같은 결과)"""
+    return shards == 1 or zlib.crc32(username.encode("utf-8")) % shards == shard
+
+
+def parse_shard(value: str):
+    """argparse 타입: 'i/n' -> (i, n)"""
+    try:
+        shard, shards = (int(x) for x in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError("샤드는 i/n 형식이어야 합니다. (예: 0/4)")
+    if not 0 <= shard < shards:
+        raise argparse.ArgumentTypeError("샤드 번호는 0 이상 n 미만이어야 합니다.")
+    return shard, shards
+
+
+def run_chunks(chunks, compute, save, workers: int = 1, should_stop=None) -> bool:
+    """
+    chunks의 (저장 정보, compute 인자 튜플)마다 compute(*인자)를 계산해 save(저장 정보, 결과)
+    - workers > 1이면 compute를 spawn 프로세스 풀에서 실행 (모듈 최상위 함수여야 함)
+    - 결과는 청크 순서대로 저장하므로 save에서 진행 위치를 기록해도 앞지르지 않습니다.
+    - 미리 계산해 두는 청크는 workers * 2개까지 (메모리 상한)
+    - should_stop()이 True를 반환하면 다음 청크부터 중단하고 True 반환
+    """
+    if workers <= 1:
+        for meta, args in chunks:
+            if should_stop and should_stop():
+                return True
+            save(meta, compute(*args))
+        return False
+
+    stopped = False
+    pool = ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    )
+    try:
+        pending = deque()  # (저장 정보, Future)
+        for meta, args in chunks:
+            if should_stop and should_stop():
+                stopped = True
+                break
+            pending.append((meta, pool.submit(compute, *args)))
+            while len(pending) > workers * 2 or (pending and pending[0][1].done()):
+                meta, future = pending.popleft()
+                save(meta, future.result())
+        while pending:
+            meta, future = pending.popleft()
+            save(meta, future.result())
+    finally:
+        pool.shutdown(cancel_futures=True)
+    return stopped
@@ -0,0 +1,80 @@
+"""
+토큰 블랙리스트 저장소
+- 토큰 원문 대신 SHA-256 해시를 키로, 토큰 만료 시각과 함께 저장합니다.
+- 로컬 SQLite 파일(WAL)에 저장하므로 같은 서버의 모든 uvicorn 워커가 같은 목록을 봅니다.
+- 만료된 항목은 주기적으로 삭제되어 크기가 무한히 커지지 않습니다.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+
+
+class TokenBlacklist:
+    """만료 시각 기반 토큰 블랙리스트 (멀티 워커 공유)"""
+
+    # 만료 항목 정리 주기 (초)
+    PRUNE_INTERVAL = 60.0
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()  # sqlite3 연결은 스레드별로 사용
+        self._last_prune = 0.0
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS token_blacklist ("
+                " token_hash BLOB PRIMARY KEY,"
+                " expires_at INTEGER NOT NULL"
+                ") WITHOUT ROWID"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_token_blacklist_expires_at"
+                " ON token_blacklist (expires_at)"
+            )
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def add(self, token: str, expires_at: float) -> None:
+        """토큰 추가 (expires_at: 토큰 만료 시각, unix timestamp)"""
+        self._conn().execute(
+            "INSERT OR REPLACE INTO token_blacklist (token_hash, expires_at)"
+            " VALUES (?, ?)",
+            (self._key(token), int(expires_at) + 1),
+        )
+        if time.time() - self._last_prune > self.PRUNE_INTERVAL:
+            self.prune()
+
+    def __contains__(self, token: str) -> bool:
+        """블랙리스트 여부 (기본 키 조회, 이미 만료된 항목은 무시)"""
+        row = (
+            self._conn()
+            .execute(
+                "SELECT 1 FROM token_blacklist WHERE token_hash = ? AND expires_at > ?",
+                (self._key(token), int(time.time())),
+            )
+            .fetchone()
+        )
+        return row is not None
+
+    def prune(self) -> int:
+        """만료된 항목 삭제 후 삭제한 개수 반환"""
+        self._last_prune = time.time()
+        cursor = self._conn().execute(
+            "DELETE FROM token_blacklist WHERE expires_at <= ?", (int(time.time()),)
+        )
+        return cursor.rowcount
+
+    def __len__(self) -> int:
+        row = self._conn().execute("SELECT COUNT(*) FROM token_blacklist").fetchone()
+        return row[0]
@@ -0,0 +1,83 @@
+"""
+프로세스 내 캐시
+- TTLCache: 스레드 안전한 LRU + 만료 시간 캐시 (적중률 통계 포함)
+"""
+
+from collections import OrderedDict
+import threading
+import time
+
+from core.config import settings
+
+_MISSING = object()
+
+
+class TTLCache:
+    """크기 제한(LRU)과 만료 시간(TTL)을 갖는 캐시"""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        """값 조회 (없거나 만료되었으면 default)"""
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is not _MISSING:
+                expires_at, value = item
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value, ttl: float = None) -> None:
+        """값 저장 (ttl을 주면 기본 TTL 대신 사용)"""
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key) -> None:
+        """값 삭제 (무효화)"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def pop_matching(self, predicate) -> int:
+        """predicate(key, value)가 참인 항목을 모두 삭제하고 삭제한 수를 반환 (값 기준 무효화)"""
+        with self._lock:
+            keys = [k for k, (_, v) in self._data.items() if predicate(k, v)]
+            for key in keys:
+                del self._data[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0,
+        }
+
+
+# 오늘의 분석 결과 캐시
+# - key: username, value: ((birthdate, 날짜, 알고리즘 버전), 분석 결과)
+# - 유저당 한 항목만 유지되므로 username으로 바로 무효화할 수 있습니다.
+analysis_cache = TTLCache(maxsize=settings.ANALYSIS_CACHE_SIZE, ttl=60 * 60 * 24)
@@ -21,9 +21,93 @@ class Settings:
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24
 
+    # 비밀번호 해싱 (bcrypt 비용, 프로세스 풀 크기, 대기 작업 상한)
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    PASSWORD_HASH_WORKERS: int = int(
+        os.getenv("PASSWORD_HASH_WORKERS", str(min(2, os.cpu_count() or 1)))
+    )
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))
+
+    # 로그아웃 토큰 블랙리스트 (워커 간 공유 SQLite 파일)
+    TOKEN_BLACKLIST_PATH: str = os.getenv(
+        "TOKEN_BLACKLIST_PATH", str(BASE_DIR / "data" / "token_blacklist.db")
+    )
+
+    # 인증 캐시 (검증된 토큰 / 사용자 정보)
+    # - 변경한 워커는 바로 무효화하지만, 다른 워커에는 최대 PRINCIPAL_CACHE_TTL초 동안
+    #   이전 사용자 정보(삭제된 계정 포함)가 남을 수 있음 (0이면 사용자 정보 캐시 끔)
+    TOKEN_CACHE_SIZE: int = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+    PRINCIPAL_CACHE_SIZE: int = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+    PRINCIPAL_CACHE_TTL: int = int(os.getenv("PRINCIPAL_CACHE_TTL", "5"))  # 초
+
     # 데이터베이스
     DATABASE_URL: str = os.getenv("DATABASE_URL", "")
 
+    # 사주 바이너리 파일 (없으면 saju_table에서 조회)
+    SAJU_BIN_PATH: str = os.getenv(
+        "SAJU_BIN_PATH", str(BASE_DIR / "data" / "saju_master_db.bin")
+    )
+
+    # 앱 시작 시 DB 버전이 낮으면 마이그레이션/시딩을 직접 실행할지 여부
+    # (운영에서는 false로 두고 배포 단계에서 python init_db.py 실행)
+    AUTO_MIGRATE: bool = os.getenv("AUTO_MIGRATE", "true").lower() == "true"
+    MIGRATION_LOCK_PATH: str = os.getenv(
+        "MIGRATION_LOCK_PATH", str(BASE_DIR / "data" / ".migration.lock")
+    )
+
+    # 분석 결과 write-behind (요청 중에는 큐에 넣고 백그라운드에서 일괄 저장)
+    ANALYSIS_WRITE_BEHIND: bool = (
+        os.getenv("ANALYSIS_WRITE_BEHIND", "false").lower() == "true"
+    )
+    WRITE_BEHIND_FLUSH_MS: int = int(os.getenv("WRITE_BEHIND_FLUSH_MS", "200"))
+    WRITE_BEHIND_BATCH_SIZE: int = int(os.getenv("WRITE_BEHIND_BATCH_SIZE", "500"))
+
+    # 다음 날 분석 결과 야간 사전 계산 (앱 안에서 실행, 여러 워커 중 하나만 실행)
+    # (별도 스케줄러를 쓰면 false로 두고 python precompute.py 실행)
+    PRECOMPUTE_ENABLED: bool = (
+        os.getenv("PRECOMPUTE_ENABLED", "false").lower() == "true"
+    )
+    PRECOMPUTE_HOUR: int = int(os.getenv("PRECOMPUTE_HOUR", "3"))  # 서버 현지 시각
+    PRECOMPUTE_WORKERS: int = int(os.getenv("PRECOMPUTE_WORKERS", "1"))
+    PRECOMPUTE_CHUNK_SIZE: int = int(os.getenv("PRECOMPUTE_CHUNK_SIZE", "2000"))
+    PRECOMPUTE_LOCK_PATH: str = os.getenv(
+        "PRECOMPUTE_LOCK_PATH", str(BASE_DIR / "data" / ".precompute.lock")
+    )
+
+    # 오늘의 분석 결과 캐시 (유저 수 기준 최대 항목 수)
+    ANALYSIS_CACHE_SIZE: int = int(os.getenv("ANALYSIS_CACHE_SIZE", "10000"))
+
+    # 분석 알고리즘 버전: 운영 버전을 다시 확인하는 주기 (다른 워커의 활성화 반영), 초
+    ALGORITHM_REFRESH_SECONDS: int = int(os.getenv("ALGORITHM_REFRESH_SECONDS", "30"))
+    # 관리자 미리보기에서 비교할 최근 분석 결과 최대 행 수
+    ALGORITHM_PREVIEW_LIMIT: int = int(os.getenv("ALGORITHM_PREVIEW_LIMIT", "200000"))
+    # 파라미터 스윕(what-if): 계산 프로세스 수(0이면 CPU 수), 최대 격자 점 수, 결과 캐시(초)
+    SWEEP_WORKERS: int = int(os.getenv("SWEEP_WORKERS", "0"))
+    SWEEP_MAX_POINTS: int = int(os.getenv("SWEEP_MAX_POINTS", "500"))
+    SWEEP_CACHE_TTL: int = int(os.getenv("SWEEP_CACHE_TTL", "3600"))
+
+    # 요청별 Server-Timing 헤더 / SQL 횟수·시간 측정 (끄면 미들웨어를 등록하지 않음)
+    SERVER_TIMING: bool = os.getenv("SERVER_TIMING", "false").lower() == "true"
+    SERVER_TIMING_LOG: bool = os.getenv("SERVER_TIMING_LOG", "true").lower() == "true"
+
+    # SQL 모니터링: 느린 쿼리 기준(ms), 요청당 같은 SQL 반복 횟수 경고 기준 (0이면 끔)
+    # - 기본은 꺼져 있음 (예: SLOW_QUERY_MS=200, N_PLUS_ONE_THRESHOLD=10)
+    # - 파라미터 값은 SLOW_QUERY_LOG_PARAMS=true일 때만 기록 (유저 정보 컬럼은 가림)
+    SLOW_QUERY_MS: float = float(os.getenv("SLOW_QUERY_MS", "0"))
+    SLOW_QUERY_LOG_PARAMS: bool = (
+        os.getenv("SLOW_QUERY_LOG_PARAMS", "false").lower() == "true"
+    )
+    N_PLUS_ONE_THRESHOLD: int = int(os.getenv("N_PLUS_ONE_THRESHOLD", "0"))
+
+    # /metrics (Prometheus 텍스트 형식), 워커별 스냅샷 파일을 모아 합산
+    # - 라우트별 트래픽/DB 풀/캐시 상태가 드러나므로 기본은 꺼져 있음
+    # - METRICS_TOKEN을 지정하면 Authorization: Bearer <토큰> 요청만 허용
+    # (배포할 때 METRICS_DIR을 비우면 이전 실행의 누적값이 초기화됨)
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "false").lower() == "true"
+    METRICS_TOKEN: str = os.getenv("METRICS_TOKEN", "")
+    METRICS_DIR: str = os.getenv("METRICS_DIR", str(BASE_DIR / "data" / "metrics"))
+    METRICS_FLUSH_SECONDS: float = float(os.getenv("METRICS_FLUSH_SECONDS", "5"))
+
     # 관리자
     ADMIN_USERNAMES: set = {"admin", "administrator"}
 
@@ -0,0 +1,138 @@
+"""
+프로세스 간 잠금 파일 (PostgreSQL advisory lock을 쓸 수 없는 SQLite 등에서 사용)
+- 파일에 "pid 임의값"을 기록하고, 잡고 있는 동안 주기적으로 mtime을 갱신합니다.
+- 기록된 pid의 프로세스가 없거나 mtime이 stale_seconds 이상 갱신되지 않았으면
+  비정상 종료로 남은 잠금으로 보고 정리합니다. (오래 걸리는 작업의 잠금은 빼앗지 않음)
+- 해제할 때는 파일에 아직 자기 값이 있을 때만 삭제합니다.
+  (정리된 뒤 다른 프로세스가 새로 잡은 잠금을 지우지 않도록)
+"""
+
+from contextlib import contextmanager
+import os
+import threading
+import time
+import uuid
+
+# 이 프로세스가 잡고 있는 잠금 값 (pid가 재사용되어 파일의 pid가 자기 pid와 같은 경우 구분)
+_held = set()
+
+
+def pid_alive(pid: int) -> bool:
+    """같은 서버에서 pid 프로세스가 살아 있는지"""
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _read_owner(path: str):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _is_stale(path: str, owner: str, stale_seconds: float) -> bool:
+    try:
+        if time.time() - os.path.getmtime(path) > stale_seconds:
+            return True
+    except FileNotFoundError:
+        return False
+    try:
+        pid = int(owner.split()[0])
+    except (IndexError, ValueError):
+        return False  # 쓰는 중이거나 손상된 파일은 mtime 기준으로만 정리
+    if pid == os.getpid():
+        return owner not in _held
+    return not pid_alive(pid)
+
+
+def _try_create(path: str, token: str) -> bool:
+    try:
+        fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return False
+    try:
+        os.write(fd, token.encode("utf-8"))
+    finally:
+        os.close(fd)
+    return True
+
+
+def try_acquire(path: str, stale_seconds: float):
+    """잠금 시도 -> 얻으면 잠금 값, 다른 프로세스가 잡고 있으면 None"""
+    token = f"{os.getpid()} {uuid.uuid4().hex}"
+    for _ in range(2):
+        if _try_create(path, token):
+            _held.add(token)
+            return token
+        owner = _read_owner(path)
+        if owner is None:
+            continue  # 그 사이 해제됨
+        if not _is_stale(path, owner, stale_seconds):
+            return None
+        # 지우기 직전에 다시 확인 (다른 프로세스가 먼저 정리하고 새로 잡았을 수 있음)
+        if _read_owner(path) == owner:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+    return None
+
+
+def release(path: str, token: str) -> None:
+    """파일에 아직 자기 잠금 값이 있을 때만 삭제"""
+    _held.discard(token)
+    if _read_owner(path) == token:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _refresh(path: str, token: str, interval: float, stop: threading.Event) -> None:
+    while not stop.wait(interval):
+        if _read_owner(path) != token:
+            return
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return
+
+
+@contextmanager
+def file_lock(path: str, stale_seconds: float, wait: float = 0):
+    """
+    잠금 파일 (얻으면 True, 얻지 못하면 False를 yield)
+    - wait: 다른 프로세스가 잡고 있을 때 기다릴 최대 시간 (초, 0이면 바로 False)
+    """
+    deadline = time.monotonic() + wait
+    while True:
+        token = try_acquire(path, stale_seconds)
+        if token is not None or time.monotonic() >= deadline:
+            break
+        time.sleep(0.2)
+    if token is None:
+        yield False
+        return
+
+    stop = threading.Event()
+    refresher = threading.Thread(
+        target=_refresh,
+        args=(path, token, max(stale_seconds / 4, 0.05), stop),
+        name="file-lock-refresh",
+        daemon=True,
+    )
+    refresher.start()
+    try:
+        yield True
+    finally:
+        stop.set()
+        refresher.join()
+        release(path, token)
@@ -0,0 +1,79 @@
+"""
+HTTP 조건부 요청 (ETag / Last-Modified)
+- 검증자는 본문이 아닌 버전 값으로 만들기 때문에, 304 응답 시 조회·직렬화를 하지 않습니다.
+"""
+
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+import hashlib
+
+from fastapi import Request, Response
+
+# 로그인 유저별 데이터: 캐시는 하되 매번 재검증
+PRIVATE_REVALIDATE = "private, no-cache"
+# 공용 데이터: 잠깐 캐시 후 재검증
+PUBLIC_SHORT = "public, max-age=60"
+
+
+def make_etag(*parts) -> str:
+    """버전/키 값들로 약한 ETag 생성"""
+    raw = "|".join(str(p) for p in parts)
+    return 'W/"%s"' % hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match 비교 (약한 비교)"""
+    if if_none_match.strip() == "*":
+        return True
+    target = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == target:
+            return True
+    return False
+
+
+def _not_modified_since(if_modified_since: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) <= since
+
+
+def check_not_modified(
+    request: Request,
+    response: Response,
+    etag: str,
+    last_modified: datetime = None,
+    cache_control: str = PRIVATE_REVALIDATE,
+):
+    """
+    검증자 헤더를 설정하고, 클라이언트 캐시가 최신이면 304 응답을 반환 (아니면 None)
+    - last_modified: UTC 기준 naive datetime (DB 저장 형식)
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if cache_control.startswith("private"):
+        headers["Vary"] = "Authorization"
+    if last_modified is not None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_none_match is not None:
+        fresh = _etag_matches(if_none_match, etag)
+    elif if_modified_since and last_modified is not None:
+        fresh = _not_modified_since(if_modified_since, last_modified)
+    else:
+        fresh = False
+
+    if fresh:
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,435 @@
+"""
+Prometheus 텍스트 형식 메트릭 (/metrics)
+- 외부 라이브러리 없이 카운터/히스토그램/게이지를 프로세스 메모리에 모읍니다.
+- uvicorn 워커가 여러 개여도 한 번의 수집으로 전체를 볼 수 있도록, 워커마다 주기적으로
+  METRICS_DIR/metrics-<pid>-<임의 값>.json 스냅샷을 쓰고 /metrics를 받은 워커가 모두 합칩니다.
+  - 카운터/히스토그램: 종료된 워커 값까지 합산 (누적값이 줄어들지 않도록)
+  - 게이지: 살아 있는 워커 파일만 합산
+  - 종료된(프로세스가 없거나 스냅샷이 오래된) 워커 파일은 dead-workers.json 합계로
+    옮기고 삭제합니다. (워커 시작과 /metrics 수집 때)
+"""
+
+from bisect import bisect_left
+import json
+import os
+import threading
+import time
+import uuid
+
+from sqlalchemy import event
+
+from core.file_lock import file_lock, pid_alive
+
+# 요청 처리 시간 히스토그램 구간 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HELP = {
+    "http_requests_total": ("counter", "처리한 HTTP 요청 수"),
+    "http_request_duration_seconds": ("histogram", "HTTP 요청 처리 시간"),
+    "db_pool_checkouts_total": ("counter", "DB 커넥션 풀에서 꺼낸 횟수"),
+    "db_pool_connections_total": ("counter", "새로 연 DB 커넥션 수"),
+    "db_pool_checked_out": ("gauge", "사용 중인 DB 커넥션 수"),
+    "db_pool_size": ("gauge", "DB 커넥션 풀 크기"),
+    "db_pool_overflow": ("gauge", "풀 크기를 넘어 추가로 연 DB 커넥션 수"),
+    "cache_hits_total": ("counter", "캐시 적중 수"),
+    "cache_misses_total": ("counter", "캐시 미스 수"),
+    "cache_hit_ratio": ("gauge", "캐시 적중률 (전체 워커 합산)"),
+    "password_hash_queue_depth": ("gauge", "처리 중이거나 대기 중인 bcrypt 작업 수"),
+    "analysis_write_queue_depth": ("gauge", "저장 대기 중인 분석 결과 수"),
+}
+
+
+def _key(name: str, labels: dict) -> str:
+    return json.dumps([name, labels], sort_keys=True, ensure_ascii=False)
+
+
+class MetricsRegistry:
+    """프로세스 내 메트릭 저장소 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}  # key -> 값
+        self._histograms = {}  # key -> [구간별 개수..., 합계, 개수]
+        self._buckets = {}  # 히스토그램 이름 -> 구간
+        self._collectors = []  # 스냅샷 시 호출: () -> [(종류, 이름, labels, 값)]
+
+    def inc(self, name: str, labels: dict, value: float = 1) -> None:
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, labels: dict, value: float, buckets) -> None:
+        key = _key(name, labels)
+        index = bisect_left(buckets, value)
+        with self._lock:
+            self._buckets[name] = buckets
+            data = self._histograms.get(key)
+            if data is None:
+                data = self._histograms[key] = [0] * (len(buckets) + 2)
+            if index < len(buckets):
+                data[index] += 1
+            data[-2] += value
+            data[-1] += 1
+
+    def add_collector(self, collector) -> None:
+        """스냅샷 시점에 값을 읽는 함수 등록 (풀/캐시/큐 상태 등)"""
+        self._collectors.append(collector)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {k: list(v) for k, v in self._histograms.items()}
+            buckets = {k: list(v) for k, v in self._buckets.items()}
+        gauges = {}
+        for collector in self._collectors:
+            for kind, name, labels, value in collector():
+                target = counters if kind == "counter" else gauges
+                target[_key(name, labels)] = value
+        return {
+            "pid": os.getpid(),
+            "worker": worker_id(),
+            "time": time.time(),
+            "counters": counters,
+            "histograms": histograms,
+            "buckets": buckets,
+            "gauges": gauges,
+        }
+
+
+registry = MetricsRegistry()
+
+
+# --- 워커 간 공유 (스냅샷 파일) ---
+
+# 종료된 워커들의 누적 카운터/히스토그램 합계 파일 (스냅샷 파일은 합친 뒤 삭제)
+DEAD_WORKERS_FILE = "dead-workers.json"
+# 합친 워커 ID 기록 개수 (삭제 전에 중단되었거나 멈췄다 다시 쓰는 워커를 두 번 세지 않도록)
+MAX_FOLDED_WORKERS = 1000
+# 합치기 잠금 파일 (잡은 워커가 종료되었거나 이 시간 동안 갱신이 없으면 정리)
+FOLD_LOCK_FILE = ".fold.lock"
+FOLD_LOCK_TIMEOUT = 60
+
+_worker = {"pid": None, "id": None}
+
+
+def worker_id() -> str:
+    """
+    이 프로세스의 워커 ID (pid + 임의 값)
+    - pid가 재사용되어도 이전 워커의 스냅샷 파일을 덮어쓰지 않도록
+    - fork된 자식 프로세스는 pid가 바뀌므로 새로 만듦
+    """
+    pid = os.getpid()
+    if _worker["pid"] != pid:
+        _worker.update(pid=pid, id=f"{pid}-{uuid.uuid4().hex[:12]}")
+    return _worker["id"]
+
+
+def stale_after(interval: float) -> float:
+    """스냅샷이 이 시간(초) 이상 갱신되지 않은 워커는 종료된 것으로 봄"""
+    return max(60.0, interval * 10)
+
+
+def _is_live(snap: dict, stale_seconds: float) -> bool:
+    # pid가 재사용된 경우에도 스냅샷이 갱신되지 않으면 종료된 워커로 봄
+    return pid_alive(snap["pid"]) and time.time() - snap["time"] < stale_seconds
+
+
+def write_snapshot(directory: str) -> None:
+    """이 워커의 스냅샷 파일 쓰기 (임시 파일에 쓴 뒤 교체)"""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"metrics-{worker_id()}.json")
+    _write_json(path, registry.snapshot())
+
+
+def _write_json(path: str, data: dict) -> None:
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def _read_json(path: str):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None  # 없거나 다른 워커가 쓰는 중이거나 손상된 파일
+
+
+def _read_snapshots(directory: str) -> list:
+    """워커 스냅샷 목록 -> [(파일 경로, 스냅샷)]"""
+    snapshots = []
+    for filename in os.listdir(directory):
+        if not (filename.startswith("metrics-") and filename.endswith(".json")):
+            continue
+        path = os.path.join(directory, filename)
+        snap = _read_json(path)
+        if snap is not None:
+            snapshots.append((path, snap))
+    return snapshots
+
+
+def _empty_totals() -> dict:
+    return {"counters": {}, "histograms": {}, "buckets": {}, "folded": []}
+
+
+def _add_totals(totals: dict, snap: dict) -> None:
+    """스냅샷의 카운터/히스토그램을 totals에 더함"""
+    counters = totals["counters"]
+    for key, value in snap["counters"].items():
+        counters[key] = counters.get(key, 0) + value
+    for key, data in snap["histograms"].items():
+        total = totals["histograms"].setdefault(key, [0] * len(data))
+        for i, v in enumerate(data):
+            total[i] += v
+    totals["buckets"].update(snap["buckets"])
+
+
+def fold_dead_workers(directory: str, stale_seconds: float) -> int:
+    """
+    종료된 워커의 스냅샷을 dead-workers.json 합계에 더하고 파일 삭제
+    - 워커가 재시작·교체되어도 파일이 쌓이지 않고 누적 카운터도 줄어들지 않습니다.
+    - 합친 워커 수를 반환 (다른 워커가 합치는 중이면 0)
+    """
+    os.makedirs(directory, exist_ok=True)
+    # 다른 워커가 합치는 중이면 이번에는 건너뜀
+    lock_path = os.path.join(directory, FOLD_LOCK_FILE)
+    with file_lock(lock_path, stale_seconds=FOLD_LOCK_TIMEOUT) as locked:
+        if not locked:
+            return 0
+        dead_path = os.path.join(directory, DEAD_WORKERS_FILE)
+        totals = _read_json(dead_path) or _empty_totals()
+        folded = set(totals["folded"])
+
+        stale = [
+            (path, snap)
+            for path, snap in _read_snapshots(directory)
+            if not _is_live(snap, stale_seconds)
+        ]
+        if not stale:
+            return 0
+
+        added = 0
+        for _, snap in stale:
+            worker = snap.get("worker")
+            if worker in folded:
+                continue  # 이미 합친 워커 (파일 삭제 전에 중단된 경우 등)
+            _add_totals(totals, snap)
+            if worker is not None:
+                totals["folded"].append(worker)
+                folded.add(worker)
+            added += 1
+
+        totals["folded"] = totals["folded"][-MAX_FOLDED_WORKERS:]
+        _write_json(dead_path, totals)
+        for path, _ in stale:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        return added
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{k}="{_escape(v)}"' for k, v in sorted(labels.items()))
+    return "{" + pairs + "}"
+
+
+def _format_value(value) -> str:
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+def render(directory: str, interval: float) -> str:
+    """
+    모든 워커 스냅샷을 합쳐 텍스트 형식으로 출력
+    - interval: 스냅샷 주기(초), 종료된 워커 판단 기준 (stale_after)
+    """
+    write_snapshot(directory)
+    stale_seconds = stale_after(interval)
+    fold_dead_workers(directory, stale_seconds)
+
+    totals = _read_json(os.path.join(directory, DEAD_WORKERS_FILE))
+    totals = totals or _empty_totals()
+    folded = set(totals["folded"])
+    gauges = {}
+    for _, snap in _read_snapshots(directory):
+        if snap.get("worker") in folded:
+            continue
+        _add_totals(totals, snap)
+        if _is_live(snap, stale_seconds):
+            for key, value in snap["gauges"].items():
+                gauges[key] = gauges.get(key, 0) + value
+    counters, histograms, buckets = (
+        totals["counters"],
+        totals["histograms"],
+        totals["buckets"],
+    )
+
+    # 캐시 적중률은 워커 합산 카운터로 계산
+    hits = {}
+    for key, value in counters.items():
+        name, labels = json.loads(key)
+        if name in ("cache_hits_total", "cache_misses_total"):
+            entry = hits.setdefault(labels["cache"], [0, 0])
+            entry[name == "cache_misses_total"] += value
+    for cache, (hit, miss) in hits.items():
+        ratio = hit / (hit + miss) if hit + miss else 0.0
+        gauges[_key("cache_hit_ratio", {"cache": cache})] = round(ratio, 4)
+
+    series = {}  # 이름 -> [(labels, 값 또는 히스토그램)]
+    for store in (counters, gauges, histograms):
+        for key, value in store.items():
+            name, labels = json.loads(key)
+            series.setdefault(name, []).append((labels, value))
+
+    lines = []
+    for name in sorted(series):
+        kind, description = HELP.get(name, ("untyped", name))
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in sorted(series[name], key=lambda s: _format_labels(s[0])):
+            if kind != "histogram":
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip(buckets[name], value):
+                cumulative += count
+                le = {**labels, "le": repr(float(bound))}
+                lines.append(f"{name}_bucket{_format_labels(le)} {cumulative}")
+            le = {**labels, "le": "+Inf"}
+            lines.append(f"{name}_bucket{_format_labels(le)} {value[-1]}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {value[-2]!r}")
+            lines.append(f"{name}_count{_format_labels(labels)} {value[-1]}")
+    return "\n".join(lines) + "\n"
+
+
+class SnapshotWriter:
+    """주기적으로 이 워커의 스냅샷 파일을 쓰는 백그라운드 스레드"""
+
+    def __init__(self, directory: str, interval: float):
+        self.directory = directory
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        """이전 실행에서 종료된 워커 파일을 정리한 뒤 시작"""
+        try:
+            fold_dead_workers(self.directory, stale_after(self.interval))
+        except OSError as e:
+            print(f"⚠️ 종료된 워커 메트릭 정리 실패: {e}")
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="metrics-snapshot", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """종료 전 마지막 스냅샷을 남김 (누적 카운터 보존)"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        write_snapshot(self.directory)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                write_snapshot(self.directory)
+            except OSError as e:
+                print(f"⚠️ 메트릭 스냅샷 저장 실패: {e}")
+
+
+# --- 수집 지점 ---
+
+
+class MetricsMiddleware:
+    """라우트(경로 템플릿)별 요청 수와 처리 시간을 기록하는 ASGI 미들웨어"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # 실제 경로 대신 라우트 템플릿을 라벨로 사용 (라벨 수 제한)
+            route = scope.get("route")
+            path = getattr(route, "path_format", None) or getattr(
+                route, "path", "unmatched"
+            )
+            labels = {"method": scope["method"], "route": path}
+            registry.inc("http_requests_total", {**labels, "status": str(status)})
+            registry.observe(
+                "http_request_duration_seconds",
+                labels,
+                time.perf_counter() - started,
+                LATENCY_BUCKETS,
+            )
+
+
+def instrument_pool(engine) -> None:
+    """
+    커넥션 풀 이벤트 카운터 + 풀 상태 게이지 등록
+    - 엔진에 등록한 풀 이벤트는 engine.dispose()로 풀이 새로 만들어져도 유지됩니다.
+    - 풀이 가득 찼는지는 사용 중인 커넥션 수를 풀 크기(+overflow)와 비교해 봅니다.
+    """
+
+    @event.listens_for(engine, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        registry.inc("db_pool_checkouts_total", {})
+
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_connection, connection_record):
+        registry.inc("db_pool_connections_total", {})
+
+    def collect():
+        pool = engine.pool  # dispose 후에는 새 풀
+        values = []
+        # SQLite 메모리 DB 등 일부 풀은 크기/사용 수를 제공하지 않음
+        if hasattr(pool, "checkedout"):
+            values.append(("gauge", "db_pool_checked_out", {}, pool.checkedout()))
+        if hasattr(pool, "size"):
+            values.append(("gauge", "db_pool_size", {}, pool.size()))
+        if hasattr(pool, "overflow"):
+            values.append(("gauge", "db_pool_overflow", {}, max(pool.overflow(), 0)))
+        return values
+
+    registry.add_collector(collect)
+
+
+def register_cache(name: str, cache) -> None:
+    """TTLCache 적중/미스 카운터 등록"""
+    registry.add_collector(
+        lambda: [
+            ("counter", "cache_hits_total", {"cache": name}, cache.hits),
+            ("counter", "cache_misses_total", {"cache": name}, cache.misses),
+        ]
+    )
+
+
+def register_gauge(name: str, fn) -> None:
+    """스냅샷 시점에 fn()으로 값을 읽는 게이지 등록"""
+    registry.add_collector(lambda: [("gauge", name, {}, fn())])
@@ -0,0 +1,144 @@
+"""
+비밀번호 해싱 프로세스 풀
+- bcrypt는 한 번에 수십 ms의 CPU를 쓰므로, 요청 스레드 대신 별도 프로세스에서 계산합니다.
+- 대기 중인 작업이 상한을 넘으면 즉시 PasswordHasherBusy를 발생시켜 부하를 덜어냅니다.
+- 이 모듈은 자식 프로세스에서도 import되므로 설정/DB 모듈을 import하지 않습니다.
+"""
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import multiprocessing
+import threading
+
+
+@lru_cache(maxsize=4)
+def _context(rounds: int):
+    # passlib은 실제로 해싱하는 프로세스(풀 자식 또는 workers=0)에서만 import
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+
+
+# --- 자식 프로세스에서 실행되는 함수 (pickle 가능하도록 모듈 최상위에 정의) ---
+
+
+def _hash(password: str, rounds: int) -> str:
+    return _context(rounds).hash(password)
+
+
+def _verify_and_update(password: str, hashed: str, rounds: int):
+    return _context(rounds).verify_and_update(password, hashed)
+
+
+def _hash_chunk(passwords: list, rounds: int) -> list:
+    context = _context(rounds)
+    return [context.hash(p) for p in passwords]
+
+
+class PasswordHasherBusy(Exception):
+    """대기 중인 해싱 작업이 너무 많음"""
+
+
+class PasswordHasher:
+    """
+    bcrypt 해싱/검증 프로세스 풀
+    - workers=0이면 호출한 스레드에서 바로 계산합니다.
+    """
+
+    def __init__(self, workers: int, max_pending: int, rounds: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.rounds = rounds
+        self._executor = None
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # 스레드가 있는 프로세스에서 fork하지 않도록 spawn 사용
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _reserve(self, wait: bool = False) -> None:
+        """
+        대기 작업 한도에서 한 자리 차지
+        - wait=False: 한도가 차 있으면 PasswordHasherBusy, True: 자리가 날 때까지 기다림
+        """
+        with self._released:
+            while self._pending >= self.max_pending:
+                if not wait:
+                    raise PasswordHasherBusy()
+                self._released.wait()
+            self._pending += 1
+
+    def _release(self, *_) -> None:
+        with self._released:
+            self._pending -= 1
+            self._released.notify_all()
+
+    def _run(self, fn, *args):
+        self._reserve()
+        try:
+            if self.workers <= 0:
+                return fn(*args)
+            return self._get_executor().submit(fn, *args).result()
+        finally:
+            self._release()
+
+    def hash(self, password: str) -> str:
+        return self._run(_hash, password, self.rounds)
+
+    def verify_and_update(self, password: str, hashed: str):
+        """
+        비밀번호 검증 -> (일치 여부, 새 해시 또는 None)
+        - 해시 비용(rounds) 설정이 바뀌었으면 새 비용으로 다시 만든 해시를 함께 반환합니다.
+        """
+        return self._run(_verify_and_update, password, hashed, self.rounds)
+
+    def hash_many(self, passwords: list, chunk_size: int = 8) -> list:
+        """
+        여러 비밀번호를 묶음으로 나눠 풀에서 해싱 (대량 가입용)
+        - 묶음 하나가 대기 작업 하나로 한도(max_pending)와 queue_depth에 포함되고,
+          한도가 차 있으면 거절하지 않고 자리가 날 때까지 기다립니다.
+        - 풀에 동시에 넣는 묶음은 workers개까지라서, 로그인/가입 요청은 묶음 몇 개만
+          기다리면 됩니다. (묶음을 작게 나누는 이유)
+        """
+        chunks = [
+            passwords[i : i + chunk_size] for i in range(0, len(passwords), chunk_size)
+        ]
+        if self.workers <= 0:
+            return [h for chunk in chunks for h in _hash_chunk(chunk, self.rounds)]
+
+        executor = self._get_executor()
+        in_flight = deque()
+        hashes = []
+        for chunk in chunks:
+            if len(in_flight) >= self.workers:
+                hashes.extend(in_flight.popleft().result())
+            self._reserve(wait=True)
+            try:
+                future = executor.submit(_hash_chunk, chunk, self.rounds)
+            except Exception:
+                self._release()
+                raise
+            future.add_done_callback(self._release)
+            in_flight.append(future)
+        for future in in_flight:
+            hashes.extend(future.result())
+        return hashes
+
+    def queue_depth(self) -> int:
+        """처리 중이거나 대기 중인 작업 수"""
+        return self._pending
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
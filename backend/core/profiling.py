@@ -0,0 +1,129 @@
+"""
+요청 단위 프로파일링 (Server-Timing 헤더 + 구조화 로그)
+- 요청마다 전체 시간, SQL 실행 횟수/시간, 이름 붙인 구간(span) 시간을 모읍니다.
+- 설정(SERVER_TIMING)이 꺼져 있으면 미들웨어와 엔진 이벤트를 등록하지 않으며,
+  span()은 contextvar 조회 한 번으로 끝납니다.
+- 동기 엔드포인트는 스레드풀에서 실행되지만 contextvar가 복사되어 같은 기록 객체를 씁니다.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+import json
+import time
+
+from sqlalchemy import event
+
+_current = ContextVar("request_profile", default=None)
+
+
+class RequestProfile:
+    """요청 하나의 측정값"""
+
+    __slots__ = ("started", "db_count", "db_time", "spans")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_count = 0
+        self.db_time = 0.0
+        self.spans = {}  # 이름 -> 누적 시간(초)
+
+    def add_span(self, name: str, elapsed: float) -> None:
+        self.spans[name] = self.spans.get(name, 0.0) + elapsed
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def server_timing(self) -> str:
+        """Server-Timing 헤더 값 (ms)"""
+        parts = [f'db;dur={self.db_time * 1000:.1f};desc="{self.db_count} queries"']
+        parts += [f"{name};dur={sec * 1000:.1f}" for name, sec in self.spans.items()]
+        parts.append(f"total;dur={self.elapsed() * 1000:.1f}")
+        return ", ".join(parts)
+
+
+def current_profile():
+    """현재 요청의 RequestProfile (프로파일링 중이 아니면 None)"""
+    return _current.get()
+
+
+@contextmanager
+def span(name: str):
+    """이름 붙인 구간 시간 측정 (프로파일링 중이 아니면 아무것도 하지 않음)"""
+    profile = _current.get()
+    if profile is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add_span(name, time.perf_counter() - started)
+
+
+def install_query_hooks(engine) -> None:
+    """엔진에 SQL 실행 횟수/시간 측정 이벤트 등록"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if _current.get() is not None:
+            conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        profile = _current.get()
+        if profile is None:
+            return
+        started = conn.info.get("query_started")
+        if started:
+            profile.db_time += time.perf_counter() - started.pop()
+        profile.db_count += 1
+
+
+class ServerTimingMiddleware:
+    """
+    요청마다 RequestProfile을 만들고, 응답 헤더에 Server-Timing을 붙인 뒤
+    요청이 끝나면 JSON 한 줄로 기록하는 ASGI 미들웨어
+    """
+
+    def __init__(self, app, log: bool = True):
+        self.app = app
+        self.log = log
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        token = _current.set(profile)
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append(
+                    (b"server-timing", profile.server_timing().encode("latin-1"))
+                )
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            if self.log:
+                record = {
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": status,
+                    "total_ms": round(profile.elapsed() * 1000, 2),
+                    "db_ms": round(profile.db_time * 1000, 2),
+                    "db_queries": profile.db_count,
+                    "spans_ms": {
+                        name: round(sec * 1000, 2)
+                        for name, sec in profile.spans.items()
+                    },
+                }
+                print(json.dumps(record, ensure_ascii=False))
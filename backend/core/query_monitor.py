@@ -0,0 +1,179 @@
+"""
+SQL 모니터링 (느린 쿼리 로그 + N+1 감지 + 쿼리 수 제한 검사)
+- 느린 쿼리: SLOW_QUERY_MS보다 오래 걸린 SQL을 요청 경로(설정하면 파라미터도)와 함께 기록
+  (파라미터의 비밀번호 해시/개인 정보 컬럼 값은 가림)
+- N+1 감지: 한 요청에서 같은 SQL이 N_PLUS_ONE_THRESHOLD번 이상 실행되면 경고 기록
+- assert_max_queries: 테스트/벤치마크에서 블록 안의 쿼리 수 상한을 검사
+"""
+
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+import json
+import time
+
+from sqlalchemy import event
+
+# 로그에 남길 SQL/파라미터 최대 길이
+MAX_LOG_LENGTH = 500
+
+# 로그에 값을 남기지 않는 컬럼 (users 테이블의 비밀번호 해시/개인 정보)
+# - 바인드 파라미터 이름(hashed_password, hashed_password_1, ...)으로 찾습니다.
+REDACTED_COLUMNS = ("hashed_password", "nickname", "birthdate", "gender")
+REDACTED = "***"
+
+_current = ContextVar("request_queries", default=None)
+
+
+class RequestQueries:
+    """요청 하나에서 실행된 SQL 집계"""
+
+    __slots__ = ("scope", "statements")
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.statements = Counter()
+
+    def route(self) -> str:
+        # 라우팅 전(미들웨어 단계)에는 실제 경로를 사용
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or self.scope.get("path", "")
+
+
+def _truncate(value) -> str:
+    text = value if isinstance(value, str) else repr(value)
+    text = " ".join(text.split())
+    if len(text) > MAX_LOG_LENGTH:
+        return text[:MAX_LOG_LENGTH] + "..."
+    return text
+
+
+def _is_redacted(name: str) -> bool:
+    return name.startswith(REDACTED_COLUMNS)
+
+
+def _redact(statement: str, parameters, context, executemany: bool):
+    """
+    로그용 파라미터 (REDACTED_COLUMNS 값은 ***로 바꿈)
+    - 위치 파라미터(SQLite ?)는 컴파일된 구문의 파라미터 이름 순서로 찾습니다.
+    - SQL에 가릴 컬럼이 있는데 어느 파라미터인지 알 수 없으면(text() 등) 전체를 가림
+    """
+    if not any(column in statement for column in REDACTED_COLUMNS):
+        return parameters
+    rows = parameters if executemany else [parameters]
+    names = getattr(getattr(context, "compiled", None), "positiontup", None)
+    if rows and isinstance(rows[0], dict):
+        names = list(rows[0])
+    if not names or not any(_is_redacted(name) for name in names):
+        return REDACTED
+
+    redacted = []
+    for row in rows:
+        values = row.values() if isinstance(row, dict) else row
+        masked = [REDACTED if _is_redacted(n) else v for n, v in zip(names, values)]
+        redacted.append(dict(zip(names, masked)) if isinstance(row, dict) else masked)
+    return redacted if executemany else redacted[0]
+
+
+def install(engine, slow_ms: float, log_params: bool = False) -> None:
+    """엔진에 느린 쿼리 기록 / 요청별 SQL 집계 이벤트 등록"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("monitor_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get("monitor_started")
+        elapsed_ms = (time.perf_counter() - started.pop()) * 1000 if started else 0.0
+
+        request = _current.get()
+        if request is not None:
+            request.statements[statement] += 1
+
+        if slow_ms and elapsed_ms >= slow_ms:
+            record = {
+                "event": "slow_query",
+                "ms": round(elapsed_ms, 2),
+                "route": request.route() if request else None,
+                "statement": _truncate(statement),
+            }
+            if log_params:
+                record["parameters"] = _truncate(
+                    _redact(statement, parameters, context, executemany)
+                )
+            print(f"🐢 {json.dumps(record, ensure_ascii=False)}")
+
+
+class QueryMonitorMiddleware:
+    """요청별 SQL을 집계해 같은 SQL이 반복 실행되면(N+1 의심) 경고를 남기는 ASGI 미들웨어"""
+
+    def __init__(self, app, n_plus_one_threshold: int):
+        self.app = app
+        self.threshold = n_plus_one_threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = RequestQueries(scope)
+        token = _current.set(request)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current.reset(token)
+            repeated = [
+                (statement, count)
+                for statement, count in request.statements.most_common(3)
+                if count >= self.threshold
+            ]
+            if repeated:
+                record = {
+                    "event": "n_plus_one",
+                    "method": scope["method"],
+                    "route": request.route(),
+                    "total_queries": sum(request.statements.values()),
+                    "repeated": [
+                        {"count": count, "statement": _truncate(statement)}
+                        for statement, count in repeated
+                    ],
+                }
+                print(f"⚠️ {json.dumps(record, ensure_ascii=False)}")
+
+
+class QueryCountExceeded(AssertionError):
+    """assert_max_queries 상한 초과"""
+
+
+@contextmanager
+def assert_max_queries(engine, limit: int):
+    """
+    블록 안에서 실행된 SQL 수가 limit를 넘으면 QueryCountExceeded
+    - 테스트 클라이언트처럼 다른 스레드에서 실행된 쿼리도 함께 셉니다.
+    - 집계 결과(Counter: SQL -> 횟수)를 yield합니다.
+
+    사용 예:
+        with assert_max_queries(engine, 5):
+            client.get("/api/analyze/today", headers=headers)
+    """
+    statements = Counter()
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements[statement] += 1
+
+    event.listen(engine, "after_cursor_execute", _count)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "after_cursor_execute", _count)
+
+    total = sum(statements.values())
+    if total > limit:
+        lines = [
+            f"  {count}x {_truncate(statement)}"
+            for statement, count in statements.most_common(5)
+        ]
+        raise QueryCountExceeded(
+            f"쿼리 {total}개 실행 (상한 {limit}개)\n" + "\n".join(lines)
+        )
@@ -0,0 +1,164 @@
+"""
+사주 바이너리 파일 (saju_master_db.bin)
+- 날짜 하나당 3바이트: 연주/월주/일주의 60갑자 인덱스 (0=갑자 ... 59=계해, 255=없음)
+- 첫 날짜부터 하루 간격으로 연속 저장하므로 날짜 -> 위치 계산만으로 O(1) 조회합니다.
+- 읽기 전용 mmap으로 열어, 같은 서버의 모든 워커가 같은 페이지 캐시를 공유합니다.
+- 원본 CSV의 SHA-256을 헤더에 기록해 CSV가 바뀌었는지 확인할 수 있습니다.
+- 파일 생성은 saju_loader.build_saju_file을 사용하세요.
+"""
+
+from datetime import date
+import mmap
+import os
+import struct
+import threading
+
+from core.config import settings
+
+MAGIC = b"SAJU"
+FORMAT_VERSION = 1
+RECORD_SIZE = 3
+MISSING = 255
+
+# magic, 형식 버전, 레코드 크기, 첫 날짜(ordinal), 날짜 수, 원본 CSV SHA-256
+HEADER = struct.Struct("<4sHHII32s")
+
+STEMS_KO = "갑을병정무기경신임계"
+STEMS_HANJA = "甲乙丙丁戊己庚辛壬癸"
+BRANCHES_KO = "자축인묘진사오미신유술해"
+BRANCHES_HANJA = "子丑寅卯辰巳午未申酉戌亥"
+
+# 60갑자 인덱스 -> "갑자(甲子)"
+PILLAR_NAMES = [
+    f"{STEMS_KO[i % 10]}{BRANCHES_KO[i % 12]}"
+    f"({STEMS_HANJA[i % 10]}{BRANCHES_HANJA[i % 12]})"
+    for i in range(60)
+]
+
+
+def pillar_to_indices(pillar: int) -> list:
+    """60갑자 인덱스 -> [천간, 지지] (logic.parse_ganji_to_index와 같은 형식)"""
+    if pillar == MISSING:
+        return [0, 0]
+    return [pillar % 10 + 1, pillar % 12 + 1]
+
+
+class SajuFile:
+    """mmap 기반 사주 조회 (스레드 간 공유 가능, 읽기 전용)"""
+
+    def __init__(self, path):
+        self.path = str(path)
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mm) < HEADER.size:
+            self.close()
+            raise ValueError(f"사주 바이너리 파일이 손상되었습니다: {self.path}")
+        magic, version, record_size, start, count, checksum = HEADER.unpack_from(
+            self._mm
+        )
+        if magic != MAGIC or version != FORMAT_VERSION or record_size != RECORD_SIZE:
+            self.close()
+            raise ValueError(f"지원하지 않는 사주 바이너리 형식입니다: {self.path}")
+        if len(self._mm) != HEADER.size + count * RECORD_SIZE:
+            self.close()
+            raise ValueError(f"사주 바이너리 파일 크기가 맞지 않습니다: {self.path}")
+        self.start_ordinal = start
+        self.count = count
+        self.source_checksum = checksum.hex()
+
+    def _offset(self, date_str: str):
+        try:
+            day = date.fromisoformat(date_str).toordinal() - self.start_ordinal
+        except (TypeError, ValueError):
+            return None
+        if not 0 <= day < self.count:
+            return None
+        return HEADER.size + day * RECORD_SIZE
+
+    def get_pillars(self, date_str: str):
+        """날짜 -> (연주, 월주, 일주) 60갑자 인덱스, 없는 날짜면 None"""
+        offset = self._offset(date_str)
+        if offset is None:
+            return None
+        pillars = tuple(self._mm[offset : offset + RECORD_SIZE])
+        # 원본 CSV에 없던 날짜 (연주는 항상 있음)
+        if pillars[0] == MISSING:
+            return None
+        return pillars
+
+    def get_saju(self, date_str: str):
+        """날짜 -> [연간, 연지, 월간, 월지, 일간, 일지], 없는 날짜면 None"""
+        pillars = self.get_pillars(date_str)
+        if pillars is None:
+            return None
+        return [i for p in pillars for i in pillar_to_indices(p)]
+
+    def date_range(self):
+        """(첫 날짜, 마지막 날짜) 문자열"""
+        first = date.fromordinal(self.start_ordinal)
+        last = date.fromordinal(self.start_ordinal + self.count - 1)
+        return first.isoformat(), last.isoformat()
+
+    def iter_rows(self):
+        """(solar_date, year_ganji, month_ganji, day_ganji) 문자열 행 (없는 값은 None)"""
+        names = PILLAR_NAMES + [None] * (256 - 60)
+        data = self._mm[HEADER.size :]
+        for day in range(self.count):
+            y, m, d = data[day * RECORD_SIZE : (day + 1) * RECORD_SIZE]
+            solar_date = date.fromordinal(self.start_ordinal + day).isoformat()
+            yield solar_date, names[y], names[m], names[d]
+
+    def close(self) -> None:
+        self._mm.close()
+
+
+def write_saju_file(path, start: date, records: bytes, source_checksum: str) -> None:
+    """
+    바이너리 파일 쓰기 (임시 파일에 쓴 뒤 교체하므로 읽고 있는 워커에 안전)
+    - records: 날짜 순서대로 이어 붙인 3바이트 레코드
+    """
+    if len(records) % RECORD_SIZE:
+        raise ValueError("레코드 길이가 3의 배수가 아닙니다.")
+    header = HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        RECORD_SIZE,
+        start.toordinal(),
+        len(records) // RECORD_SIZE,
+        bytes.fromhex(source_checksum),
+    )
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(records)
+    os.replace(tmp_path, path)
+
+
+_saju_file = None
+_saju_file_lock = threading.Lock()
+
+
+def get_saju_file():
+    """
+    설정된 경로의 사주 파일 (프로세스당 한 번 열어 재사용)
+    - 파일이 없거나 읽을 수 없으면 None (호출한 쪽에서 DB 조회로 대체)
+    """
+    global _saju_file
+    if _saju_file is None:
+        with _saju_file_lock:
+            if _saju_file is None:
+                if not os.path.exists(settings.SAJU_BIN_PATH):
+                    return None
+                try:
+                    _saju_file = SajuFile(settings.SAJU_BIN_PATH)
+                except (OSError, ValueError) as e:
+                    print(f"⚠️ 사주 바이너리 파일을 열 수 없습니다: {e}")
+                    return None
+    return _saju_file
+
+
+def reset_saju_file() -> None:
+    """파일을 새로 만든 뒤 호출: 다음 조회 때 다시 엶"""
+    global _saju_file
+    with _saju_file_lock:
+        _saju_file = None
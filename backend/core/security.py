@@ -1,34 +1,90 @@
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Set
+import time
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from sqlalchemy.orm import Session
 
 from core.config import settings
+from core.cache import TTLCache
+from core.blacklist import TokenBlacklist
+from core.password_pool import PasswordHasher, PasswordHasherBusy
 from database import get_db
 import models
 
-# 비밀번호 해싱
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# 비밀번호 해싱 (별도 프로세스 풀, 대기 작업이 많으면 503으로 거절)
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    rounds=settings.BCRYPT_ROUNDS,
+)
 
 # OAuth2 설정
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/login")
 
-# 토큰 블랙리스트 (프로덕션에서는 Redis 사용 권장)
-token_blacklist: Set[str] = set()
+# 토큰 블랙리스트 (로컬 SQLite 파일, 모든 워커가 공유하고 만료된 토큰은 자동 정리)
+token_blacklist = TokenBlacklist(settings.TOKEN_BLACKLIST_PATH)
+
+# 검증된 토큰 -> username (토큰 만료 시각까지만 유지)
+token_cache = TTLCache(maxsize=settings.TOKEN_CACHE_SIZE)
+# username -> UserPrincipal
+# - 짧은 TTL: 다른 워커에서의 프로필 변경/계정 삭제는 TTL(기본 5초) 이내에 반영
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE, ttl=settings.PRINCIPAL_CACHE_TTL
+)
+
+
+@dataclass(frozen=True)
+class UserPrincipal:
+    """인증된 사용자 정보 (세션과 분리된 가벼운 객체, 비밀번호 해시 제외)"""
+
+    username: str
+    nickname: str
+    birthdate: str
+    gender: str
+
+    @classmethod
+    def from_user(cls, user: models.User) -> "UserPrincipal":
+        return cls(
+            username=user.username,
+            nickname=user.nickname,
+            birthdate=user.birthdate,
+            gender=user.gender,
+        )
+
+
+def _hasher_busy_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.",
+        headers={"Retry-After": "1"},
+    )
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """비밀번호 검증"""
-    return pwd_context.verify(plain_password, hashed_password)
+    return verify_and_update_password(plain_password, hashed_password)[0]
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str):
+    """
+    비밀번호 검증 -> (일치 여부, 새 해시 또는 None)
+    - BCRYPT_ROUNDS 설정이 바뀌어 재해싱이 필요하면 새 해시를 반환합니다.
+    """
+    try:
+        return password_hasher.verify_and_update(plain_password, hashed_password)
+    except PasswordHasherBusy:
+        raise _hasher_busy_exception()
 
 
 def get_password_hash(password: str) -> str:
     """비밀번호 해싱"""
-    return pwd_context.hash(password)
+    try:
+        return password_hasher.hash(password)
+    except PasswordHasherBusy:
+        raise _hasher_busy_exception()
 
 
 def create_access_token(data: dict) -> str:
@@ -39,11 +95,16 @@ def create_access_token(data: dict) -> str:
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
-async def get_current_user(
+def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db),
-) -> models.User:
-    """현재 로그인한 사용자 조회"""
+) -> UserPrincipal:
+    """
+    현재 로그인한 사용자 조회
+    - 동기 DB 조회/JWT 검증을 하므로 일반 함수로 선언해 FastAPI가 스레드풀에서 실행하게 합니다.
+      (async로 선언하면 이벤트 루프를 막아 같은 워커의 다른 요청이 모두 대기)
+    - 검증된 토큰과 사용자 정보는 캐시하므로, 수정이 필요하면 DB에서 User를 다시 조회하세요.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="인증 정보를 확인할 수 없습니다.",
@@ -57,26 +118,37 @@ async def get_current_user(
             detail="로그아웃된 토큰입니다.",
         )
 
-    try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
-        username: str = payload.get("sub")
-        if username is None:
+    username = token_cache.get(token)
+    if username is None:
+        try:
+            payload = jwt.decode(
+                token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+            )
+            username: str = payload.get("sub")
+            if username is None:
+                raise credentials_exception
+        except JWTError:
             raise credentials_exception
-    except JWTError:
-        raise credentials_exception
 
-    user = db.query(models.User).filter(models.User.username == username).first()
-    if user is None:
-        raise credentials_exception
+        # 만료 시각이 지나면 캐시에서도 빠지도록 남은 시간만큼만 저장
+        remaining = payload["exp"] - time.time() if "exp" in payload else None
+        if remaining is None or remaining > 0:
+            token_cache.set(token, username, ttl=remaining)
 
-    return user
+    principal = principal_cache.get(username)
+    if principal is None:
+        user = db.query(models.User).filter(models.User.username == username).first()
+        if user is None:
+            raise credentials_exception
+        principal = UserPrincipal.from_user(user)
+        principal_cache.set(username, principal)
+
+    return principal
 
 
-async def get_admin_user(
-    current_user: models.User = Depends(get_current_user),
-) -> models.User:
+def get_admin_user(
+    current_user: UserPrincipal = Depends(get_current_user),
+) -> UserPrincipal:
     """관리자 권한 확인"""
     if current_user.username not in settings.ADMIN_USERNAMES:
         raise HTTPException(
@@ -87,5 +159,21 @@ async def get_admin_user(
 
 
 def add_token_to_blacklist(token: str) -> None:
-    """토큰을 블랙리스트에 추가"""
-    token_blacklist.add(token)
+    """토큰을 블랙리스트에 추가 (토큰 만료 시각까지만 보관)"""
+    try:
+        expires_at = jwt.get_unverified_claims(token)["exp"]
+    except (JWTError, KeyError):
+        expires_at = time.time() + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    token_blacklist.add(token, expires_at)
+    token_cache.pop(token)
+
+
+def invalidate_user_cache(username: str) -> None:
+    """
+    사용자 정보 캐시 무효화 (프로필/비밀번호 변경, 계정 삭제 시)
+    - 이 워커의 사용자 정보와 그 유저의 검증된 토큰을 모두 버림
+      (다음 요청에서 토큰 검증과 DB 조회를 다시 하므로 삭제된 계정은 바로 401)
+    - 다른 워커는 PRINCIPAL_CACHE_TTL 이내에 반영됩니다.
+    """
+    principal_cache.pop(username)
+    token_cache.pop_matching(lambda _, cached_username: cached_username == username)
@@ -0,0 +1,165 @@
+"""
+분석 결과 write-behind 버퍼
+- 요청 처리 중에는 큐에만 넣고, 백그라운드 스레드가 N ms 또는 M 행마다 다중 행 upsert로 저장합니다.
+- 같은 (username, analysis_date)는 큐 안에서 마지막 값으로 합쳐집니다.
+- 큐에서 꺼내 저장 중인 결과의 유저를 따로 기록해, discard_user가 저장이 끝날 때까지
+  기다립니다. (그 뒤에 실행되는 호출한 쪽의 DELETE가 방금 저장된 행까지 지우도록)
+"""
+
+import threading
+import time
+
+from core.config import settings
+from database import SessionLocal
+import crud
+
+
+class AnalysisWriteBuffer:
+    """분석 결과 일괄 저장 버퍼"""
+
+    def __init__(self, flush_ms: int, batch_size: int):
+        self.flush_interval = flush_ms / 1000.0
+        self.batch_size = batch_size
+
+        self._pending = {}  # (username, analysis_date) -> row
+        self._inflight_users = set()  # 큐에서 꺼내 저장 중인 결과의 유저
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()  # 플러시는 한 번에 하나씩
+        self._thread = None
+        self._running = False
+
+        # 지표
+        self.flush_count = 0
+        self.flushed_rows = 0
+        self.failed_flushes = 0
+        self.dropped_rows = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def start(self) -> None:
+        """백그라운드 플러시 스레드 시작"""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run, name="analysis-write-behind", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """스레드 종료 후 남은 결과를 모두 저장"""
+        if not self._running:
+            return
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        self._thread.join()
+        self._thread = None
+        self.flush()
+
+    def add(self, row: dict) -> None:
+        """저장할 분석 결과를 큐에 추가"""
+        with self._cond:
+            self._pending[(row["username"], row["analysis_date"])] = row
+            if len(self._pending) >= self.batch_size:
+                self._cond.notify_all()
+
+    def discard_user(self, username: str) -> None:
+        """
+        아직 저장되지 않은 특정 유저의 결과 제거 (계정 삭제 등)
+        - 이미 저장 중인 결과가 있으면 커밋될 때까지 기다린 뒤 반환합니다.
+        """
+        with self._cond:
+            for key in [k for k in self._pending if k[0] == username]:
+                del self._pending[key]
+            while username in self._inflight_users:
+                self._cond.wait()
+
+    def queue_depth(self) -> int:
+        return len(self._pending)
+
+    def flush(self) -> int:
+        """큐에 쌓인 결과를 즉시 저장하고 저장한 행 수를 반환"""
+        with self._flush_lock:
+            with self._cond:
+                rows = list(self._pending.values())
+                self._pending = {}
+                self._inflight_users = {row["username"] for row in rows}
+            if not rows:
+                return 0
+            try:
+                return self._write(rows)
+            finally:
+                with self._cond:
+                    self._inflight_users = set()
+                    self._cond.notify_all()
+
+    def _write(self, rows: list) -> int:
+        """결과 일괄 저장 (실패하면 행 단위로 다시 저장)"""
+        started = time.perf_counter()
+        db = SessionLocal()
+        try:
+            for i in range(0, len(rows), self.batch_size):
+                crud.upsert_analysis_results(db, rows[i : i + self.batch_size])
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            self.failed_flushes += 1
+            print(f"⚠️ 분석 결과 일괄 저장 실패 ({len(rows)}건), 행 단위 재시도: {e}")
+            rows = self._save_one_by_one(db, rows)
+        finally:
+            db.close()
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.flush_count += 1
+        self.flushed_rows += len(rows)
+        self.last_flush_ms = elapsed_ms
+        self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+        return len(rows)
+
+    def _save_one_by_one(self, db, rows: list) -> list:
+        """
+        일괄 저장 실패 시 행 단위 저장 (삭제된 유저 등 문제 행만 버림)
+        - 분석 결과는 다시 계산할 수 있으므로 실패한 행은 재시도하지 않습니다.
+        """
+        saved = []
+        for row in rows:
+            try:
+                crud.upsert_analysis_results(db, [row])
+                db.commit()
+                saved.append(row)
+            except Exception:
+                db.rollback()
+                self.dropped_rows += 1
+        return saved
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self._running,
+            "queue_depth": self.queue_depth(),
+            "flush_count": self.flush_count,
+            "flushed_rows": self.flushed_rows,
+            "failed_flushes": self.failed_flushes,
+            "dropped_rows": self.dropped_rows,
+            "last_flush_ms": round(self.last_flush_ms, 2),
+            "max_flush_ms": round(self.max_flush_ms, 2),
+        }
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if self._running and len(self._pending) < self.batch_size:
+                    self._cond.wait(self.flush_interval)
+                if not self._running:
+                    return
+            self.flush()
+
+
+analysis_write_buffer = AnalysisWriteBuffer(
+    flush_ms=settings.WRITE_BEHIND_FLUSH_MS,
+    batch_size=settings.WRITE_BEHIND_BATCH_SIZE,
+)
@@ -0,0 +1,270 @@
+"""
+여러 라우터/배치 작업이 공유하는 DB 헬퍼
+"""
+
+from datetime import datetime
+import json
+
+from sqlalchemy import bindparam, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from core.saju_file import get_saju_file
+import models
+import logic
+import saju_calendar
+
+# upsert 시 갱신할 분석 결과 컬럼 (created_at은 최초 생성 시각 유지)
+ANALYSIS_UPDATE_COLUMNS = (
+    "my_persona",
+    "my_destiny",
+    "lucky_element",
+    "persona_description",
+    "destiny_description",
+    "axes_data",
+    "algorithm_version",
+)
+
+# 리소스 버전 키
+CELEBRITIES_VERSION_KEY = "celebrities"
+
+
+def analysis_version_key(username: str) -> str:
+    """유저별 분석 결과 버전 키"""
+    return f"analysis:{username}"
+
+
+def _dialect_insert(db):
+    """DB 종류에 맞는 INSERT 구문 생성자 (ON CONFLICT 지원)"""
+    bind = db.get_bind() if isinstance(db, Session) else db
+    dialect = bind.dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert
+    if dialect == "sqlite":
+        return sqlite.insert
+    raise NotImplementedError(f"upsert를 지원하지 않는 DB입니다: {dialect}")
+
+
+def get_saju_map(db, dates) -> dict:
+    """
+    여러 날짜의 사주를 한 번에 조회 -> {날짜: [연간, 연지, 월간, 월지, 일간, 일지]}
+    - 사주 바이너리 파일이 있으면 DB 대신 파일에서 바로 읽습니다.
+    - 데이터에 없는 날짜는 saju_calendar로 계산합니다. (지원 범위 밖이면 결과에서 빠짐)
+    """
+    saju_map = {}
+    dates = sorted(set(dates))
+    saju_file = get_saju_file()
+    if saju_file is not None:
+        for d in dates:
+            saju = saju_file.get_saju(d)
+            if saju is not None:
+                saju_map[d] = saju
+    else:
+        for i in range(0, len(dates), 500):
+            rows = (
+                db.query(models.Saju)
+                .filter(models.Saju.solar_date.in_(dates[i : i + 500]))
+                .all()
+            )
+            for row in rows:
+                saju_map[row.solar_date] = logic.ganji_to_saju(
+                    row.year_ganji, row.month_ganji, row.day_ganji
+                )
+
+    for d in dates:
+        if d not in saju_map:
+            saju = saju_calendar.get_saju(d)
+            if saju is not None:
+                saju_map[d] = saju
+    return saju_map
+
+
+def analysis_row(username: str, analysis_date: str, result: dict) -> dict:
+    """logic.analyze_daily 결과 -> analysis_results 행"""
+    return {
+        "username": username,
+        "analysis_date": analysis_date,
+        "my_persona": result["my_persona"],
+        "my_destiny": result["my_destiny"],
+        "lucky_element": result["lucky_element"],
+        "persona_description": result["persona_description"],
+        "destiny_description": result["destiny_description"],
+        "axes_data": json.dumps(result["axes"]),
+        "algorithm_version": result["algorithm_version"],
+    }
+
+
+def analysis_from_row(row: models.AnalysisResult) -> dict:
+    """analysis_results 행 -> logic.analyze_daily와 같은 형태의 결과 (analysis_row의 역)"""
+    axes = json.loads(row.axes_data)
+    return {
+        "my_persona": row.my_persona,
+        "my_destiny": row.my_destiny,
+        "lucky_element": row.lucky_element,
+        "persona_description": row.persona_description,
+        "destiny_description": row.destiny_description,
+        "axes": axes,
+        "partner_axes": logic.get_compatibility_details(axes),
+        "algorithm_version": row.algorithm_version,
+    }
+
+
+def get_analysis_result(db: Session, username: str, analysis_date: str):
+    """(username, analysis_date) 분석 결과 행 조회 (없으면 None)"""
+    return (
+        db.query(models.AnalysisResult)
+        .filter(
+            models.AnalysisResult.username == username,
+            models.AnalysisResult.analysis_date == analysis_date,
+        )
+        .first()
+    )
+
+
+def delete_analyses_from(db: Session, username: str, from_date: str) -> int:
+    """
+    from_date 이후(포함) 분석 결과 삭제 (생년월일 변경 시 미리 계산된 결과 정리)
+    - 같은 트랜잭션에서 분석 결과 버전도 올립니다. commit은 호출한 쪽에서
+    """
+    deleted = (
+        db.query(models.AnalysisResult)
+        .filter(
+            models.AnalysisResult.username == username,
+            models.AnalysisResult.analysis_date >= from_date,
+        )
+        .delete(synchronize_session=False)
+    )
+    bump_resource_versions(db, [analysis_version_key(username)])
+    return deleted
+
+
+def insert_users(db, rows: list) -> list:
+    """
+    유저 다중 행 INSERT (이미 있는 username은 건너뜀)
+    - rows: User 컬럼명을 키로 갖는 dict 목록, commit은 호출한 쪽에서
+    - 실제로 추가된 username 목록을 반환 (RETURNING, 건너뛴 행은 빠짐)
+    """
+    if not rows:
+        return []
+
+    insert = _dialect_insert(db)
+    table = models.User.__table__
+    stmt = (
+        insert(table)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=[table.c.username])
+        .returning(table.c.username)
+    )
+    return db.execute(stmt).scalars().all()
+
+
+def upsert_analysis_results(db, rows: list) -> None:
+    """
+    분석 결과 INSERT ... ON CONFLICT (username, analysis_date) DO UPDATE
+    - rows: AnalysisResult 컬럼명을 키로 갖는 dict 목록
+    - db: Session 또는 Connection (commit은 호출한 쪽에서)
+    - 같은 트랜잭션에서 해당 유저들의 분석 결과 버전도 올립니다.
+    - 행을 구문에 직접 넣지 않고 executemany로 실행해 컴파일된 구문을 재사용합니다.
+      (드라이버가 여러 행을 묶어 보냄, 다중 행 VALUES는 매번 다시 컴파일됨)
+    """
+    if not rows:
+        return
+
+    insert = _dialect_insert(db)
+    table = models.AnalysisResult.__table__
+    stmt = insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.username, table.c.analysis_date],
+        set_={col: stmt.excluded[col] for col in ANALYSIS_UPDATE_COLUMNS},
+    )
+    db.execute(stmt, rows)
+
+    bump_resource_versions(db, [analysis_version_key(r["username"]) for r in rows])
+
+
+def update_analysis_results(db, rows: list) -> None:
+    """
+    분석 결과 id 기준 일괄 UPDATE (재계산, executemany)
+    - rows: id와 ANALYSIS_UPDATE_COLUMNS를 키로 갖는 dict 목록 (commit은 호출한 쪽에서)
+    - 같은 트랜잭션에서 해당 유저들의 분석 결과 버전도 올립니다.
+    """
+    if not rows:
+        return
+
+    table = models.AnalysisResult.__table__
+    # 컬럼과 같은 이름의 바인드 변수는 UPDATE에서 쓸 수 없어 new_ 접두사 사용
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("result_id"))
+        .values({col: bindparam(f"new_{col}") for col in ANALYSIS_UPDATE_COLUMNS})
+    )
+    params = [
+        {"result_id": r["id"], **{f"new_{c}": r[c] for c in ANALYSIS_UPDATE_COLUMNS}}
+        for r in rows
+    ]
+    db.execute(stmt, params)
+
+    bump_resource_versions(db, [analysis_version_key(r["username"]) for r in rows])
+
+
+def bump_resource_versions(db, keys: list) -> None:
+    """리소스 버전 +1 (없으면 1로 생성), commit은 호출한 쪽에서"""
+    keys = sorted(set(keys))  # 정렬된 순서로 잠가 교착 상태 방지
+    if not keys:
+        return
+
+    insert = _dialect_insert(db)
+    table = models.ResourceVersion.__table__
+    now = datetime.utcnow()
+    stmt = insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.key],
+        set_={"version": table.c.version + 1, "updated_at": stmt.excluded.updated_at},
+    )
+    db.execute(stmt, [{"key": key, "version": 1, "updated_at": now} for key in keys])
+
+
+def get_resource_version(db: Session, key: str):
+    """리소스 버전 조회 -> (version, updated_at), 기록이 없으면 (0, None)"""
+    row = (
+        db.query(models.ResourceVersion.version, models.ResourceVersion.updated_at)
+        .filter(models.ResourceVersion.key == key)
+        .first()
+    )
+    return (row.version, row.updated_at) if row else (0, None)
+
+
+def get_resource_versions(db: Session, keys: list) -> dict:
+    """여러 리소스 버전을 한 번에 조회 -> {key: version}, 기록이 없으면 0"""
+    rows = (
+        db.query(models.ResourceVersion.key, models.ResourceVersion.version)
+        .filter(models.ResourceVersion.key.in_(keys))
+        .all()
+    )
+    versions = dict(rows)
+    return {key: versions.get(key, 0) for key in keys}
+
+
+def delete_users(db: Session, usernames: list) -> dict:
+    """
+    유저와 분석 결과를 집합 단위 DELETE로 삭제 (ORM으로 자식 행을 로드하지 않음)
+    - 같은 트랜잭션에서 분석 결과 버전도 올립니다. commit은 호출한 쪽에서
+    - 삭제된 (유저 수, 분석 결과 수)를 반환
+    """
+    usernames = sorted(set(usernames))
+    deleted_users = 0
+    deleted_results = 0
+    for i in range(0, len(usernames), 500):
+        chunk = usernames[i : i + 500]
+        deleted_results += (
+            db.query(models.AnalysisResult)
+            .filter(models.AnalysisResult.username.in_(chunk))
+            .delete(synchronize_session=False)
+        )
+        deleted_users += (
+            db.query(models.User)
+            .filter(models.User.username.in_(chunk))
+            .delete(synchronize_session=False)
+        )
+    bump_resource_versions(db, [analysis_version_key(u) for u in usernames])
+    return {"deleted_users": deleted_users, "deleted_results": deleted_results}
@@ -0,0 +1,215 @@
+"""
+유저 대량 등록 (CSV)
+- CSV 컬럼: username, password, nickname, birthdate, gender
+- 파일을 한 번에 읽지 않고 배치 단위로 검증 → 비밀번호 병렬 해싱 → 다중 행 INSERT 합니다.
+- 이미 있는 username은 건너뜁니다. (--precompute도 새로 등록된 유저만 계산)
+- 생년월일은 회원가입(/api/register)과 같은 검사(saju_calendar.is_supported_date)를 씁니다.
+
+사용법:
+    python import_users.py users.csv [--precompute] [--batch-size 1000] [--workers 8]
+"""
+
+import argparse
+import csv
+from datetime import date
+import os
+import time
+
+# config가 먼저 로드되도록
+from core.config import settings
+from core.password_pool import PasswordHasher
+from algorithm import active_algorithm
+from database import SessionLocal
+import crud
+import logic
+import models
+import saju_calendar
+
+REQUIRED_COLUMNS = ("username", "password", "nickname", "birthdate", "gender")
+
+# 응답/출력에 포함할 최대 오류 수
+MAX_REPORTED_ERRORS = 100
+
+
+def _validate_row(row: dict) -> str:
+    """행 검증 -> 오류 메시지 (정상이면 None)"""
+    for col in REQUIRED_COLUMNS:
+        if not (row.get(col) or "").strip():
+            return f"{col} 값이 없습니다."
+    if not saju_calendar.is_supported_date(row["birthdate"].strip()):
+        return (
+            f"생년월일은 {saju_calendar.MIN_DATE.year}~"
+            f"{saju_calendar.MAX_DATE.year}년 사이의 YYYY-MM-DD 형식이어야 합니다."
+        )
+    return None
+
+
+def _precompute_analyses(db, users: list, today_str: str) -> int:
+    """새로 등록한 유저들의 오늘 분석 결과를 미리 계산해 저장"""
+    saju_map = crud.get_saju_map(db, [u["birthdate"] for u in users] + [today_str])
+    today_saju = saju_map.get(today_str)
+    if today_saju is None:
+        return 0
+
+    algorithm = active_algorithm(db)
+    rows = []
+    for user in users:
+        birth_saju = saju_map.get(user["birthdate"])
+        if birth_saju is None:
+            continue
+        result = logic.analyze_daily(birth_saju, today_saju, algorithm)
+        rows.append(crud.analysis_row(user["username"], today_str, result))
+
+    crud.upsert_analysis_results(db, rows)
+    return len(rows)
+
+
+def import_users(
+    stream,
+    hasher: PasswordHasher,
+    precompute: bool = False,
+    batch_size: int = 1000,
+    progress=None,
+) -> dict:
+    """
+    CSV 스트림(텍스트)에서 유저를 대량 등록하고 처리 결과를 반환
+    - hasher: 비밀번호를 병렬로 해싱할 프로세스 풀
+    - precompute: 등록한 유저의 오늘 분석 결과도 함께 저장
+    - progress: 배치마다 호출되는 콜백 (처리 결과 dict를 인자로 받음)
+    """
+    reader = csv.DictReader(stream)
+    missing = [c for c in REQUIRED_COLUMNS if c not in (reader.fieldnames or [])]
+    if missing:
+        raise ValueError(f"CSV에 필요한 컬럼이 없습니다: {', '.join(missing)}")
+
+    report = {
+        "total": 0,
+        "created": 0,
+        "skipped": 0,
+        "failed": 0,
+        "precomputed": 0,
+        "errors": [],
+    }
+
+    def add_error(line_no, username, message):
+        report["failed"] += 1
+        if len(report["errors"]) < MAX_REPORTED_ERRORS:
+            report["errors"].append(f"{line_no}행 {username or ''}: {message}")
+
+    db = SessionLocal()
+    try:
+        today_str = date.today().isoformat()
+        seen = set()
+
+        def flush(batch):
+            # 이미 가입된 username은 해싱 전에 걸러냄 (해싱이 가장 비싼 작업)
+            usernames = [row["username"] for row in batch]
+            existing = {
+                u
+                for (u,) in db.query(models.User.username).filter(
+                    models.User.username.in_(usernames)
+                )
+            }
+            batch = [row for row in batch if row["username"] not in existing]
+            report["skipped"] += len(usernames) - len(batch)
+            if not batch:
+                return
+
+            hashes = hasher.hash_many([row.pop("password") for row in batch])
+            for row, hashed in zip(batch, hashes):
+                row["hashed_password"] = hashed
+
+            # 확인 후 다른 요청/프로세스가 먼저 가입시킨 username은 INSERT에서 건너뜀
+            created = set(crud.insert_users(db, batch))
+            report["skipped"] += len(batch) - len(created)
+            report["created"] += len(created)
+            if precompute and created:
+                # 건너뛴 행의 CSV 생년월일로 기존 유저의 결과를 덮어쓰지 않도록
+                batch = [row for row in batch if row["username"] in created]
+                report["precomputed"] += _precompute_analyses(db, batch, today_str)
+            db.commit()
+
+        batch = []
+        for line_no, row in enumerate(reader, start=2):
+            report["total"] += 1
+            error = _validate_row(row)
+            username = (row.get("username") or "").strip()
+            if error:
+                add_error(line_no, username, error)
+                continue
+            if username in seen:
+                add_error(line_no, username, "파일 안에서 중복된 username입니다.")
+                continue
+            seen.add(username)
+
+            batch.append(
+                {
+                    "username": username,
+                    "password": row["password"],
+                    "nickname": row["nickname"].strip(),
+                    "birthdate": row["birthdate"].strip(),
+                    "gender": row["gender"].strip(),
+                }
+            )
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = []
+                if progress:
+                    progress(report)
+
+        flush(batch)
+        if progress:
+            progress(report)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CSV 유저 대량 등록")
+    parser.add_argument("csv_path")
+    parser.add_argument(
+        "--precompute", action="store_true", help="오늘 분석 결과도 함께 저장"
+    )
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument(
+        "--workers", type=int, default=None, help="해싱 프로세스 수 (기본: CPU 수)"
+    )
+    args = parser.parse_args()
+
+    hasher = PasswordHasher(
+        workers=args.workers if args.workers is not None else os.cpu_count() or 1,
+        max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+        rounds=settings.BCRYPT_ROUNDS,
+    )
+    started = time.perf_counter()
+
+    def print_progress(report):
+        elapsed = time.perf_counter() - started
+        print(
+            f"📥 {report['total']}행 처리 (등록 {report['created']}, "
+            f"건너뜀 {report['skipped']}, 실패 {report['failed']}) "
+            f"- {report['total'] / max(elapsed, 1e-9):.0f}행/초"
+        )
+
+    try:
+        with open(args.csv_path, encoding="utf-8-sig", newline="") as f:
+            result = import_users(
+                f,
+                hasher,
+                precompute=args.precompute,
+                batch_size=args.batch_size,
+                progress=print_progress,
+            )
+    finally:
+        hasher.shutdown()
+
+    for error in result["errors"]:
+        print(f"❌ {error}")
+    print(
+        f"✅ 완료: {result['created']}명 등록, 분석 미리 계산 {result['precomputed']}건"
+    )
@@ -17,6 +17,7 @@ from sqlalchemy import inspect
 from core.config import settings
 from database import engine, SessionLocal
 from models import Base, MbtiCelebrity
+import crud
 
 
 # MBTI별 유명인 데이터 (태그 기반)
@@ -742,6 +743,7 @@ def init_mbti_celebrities():
                     db.add(celebrity)
                     total_inserted += 1
 
+            crud.bump_resource_versions(db, [crud.CELEBRITIES_VERSION_KEY])
             db.commit()
             print(f"✅ {total_inserted}개의 유명인 데이터 삽입 완료!")
         else:
@@ -1,48 +1,99 @@
-import pandas as pd
-from sqlalchemy import text
 import os
 
 # config가 먼저 로드되도록
 from core.config import settings
 from database import engine, Base
+from migrations import (
+    DATA_VERSION_KEY,
+    SEED_DATA_VERSION,
+    get_data_version,
+    is_db_up_to_date,
+    migration_lock,
+    run_migrations,
+    set_meta,
+)
 
 
-def init_db():
-    print("🔄 DB 테이블 검사 중...")
+def init_db(only_if_stale: bool = False):
+    """
+    테이블 생성 → 마이그레이션 → 시드 데이터 적재
+    - 여러 프로세스가 동시에 실행해도 잠금으로 한 번만 실행됩니다.
+    - only_if_stale: 잠금을 얻은 뒤 버전이 이미 최신이면(다른 워커가 끝냄) 건너뜀
+    """
+    with migration_lock():
+        if only_if_stale and is_db_up_to_date():
+            print("✅ 다른 프로세스가 DB 초기화를 완료했습니다.")
+            return
 
-    # 테이블 생성 (없을 때만 생성됨)
-    Base.metadata.create_all(bind=engine)
+        print("🔄 DB 테이블 검사 중...")
 
-    # 사주 데이터 로딩
-    _init_saju_data()
+        # 테이블 생성 (없을 때만 생성됨)
+        Base.metadata.create_all(bind=engine)
 
-    # 유명인 데이터 로딩
-    _init_celebrity_data()
+        # 스키마 마이그레이션 (인덱스 등)
+        run_migrations()
+
+        # 사주 데이터 로딩 (체크섬으로 변경 여부를 따로 확인)
+        _init_saju_data()
+
+        with engine.connect() as conn:
+            data_version = get_data_version(conn)
+        if data_version < SEED_DATA_VERSION:
+            # 유명인 데이터 로딩
+            _init_celebrity_data()
+
+            with engine.begin() as conn:
+                set_meta(conn, DATA_VERSION_KEY, SEED_DATA_VERSION)
+        print(f"✅ 데이터 버전: {SEED_DATA_VERSION}")
+
+
+def ensure_db_ready():
+    """
+    앱 시작 시 호출: schema_meta의 버전 값만 확인
+    - 최신이 아니면 AUTO_MIGRATE 설정에 따라 init_db를 실행하거나 시작을 중단합니다.
+    """
+    if is_db_up_to_date():
+        return
+    if not settings.AUTO_MIGRATE:
+        raise RuntimeError(
+            "DB 스키마/데이터 버전이 최신이 아닙니다. "
+            "배포 전에 `python init_db.py`를 실행하세요."
+        )
+    init_db(only_if_stale=True)
 
 
 def _init_saju_data():
-    """사주 데이터 초기화"""
-    csv_path = "./data/saju_master_db.csv"
+    """사주 데이터 초기화 (파일 체크섬이 바뀌었을 때만 다시 적재)"""
+    # pandas는 시딩할 때만 필요하므로 여기서 import (앱 시작 시간 단축)
+    from saju_loader import (
+        DEFAULT_CSV_PATH,
+        build_saju_file,
+        load_saju,
+        open_current_saju_file,
+    )
+
+    if not os.path.exists(DEFAULT_CSV_PATH):
+        print("⚠️ CSV 파일이 없습니다. 데이터 시딩을 건너뜁니다.")
+        return
 
+    print(f"📥 사주 CSV 확인 중... ({DEFAULT_CSV_PATH})")
     try:
-        with engine.connect() as conn:
-            result = conn.execute(text("SELECT 1 FROM saju_table LIMIT 1"))
-            if result.fetchone() is not None:
-                print("✅ 사주 데이터가 이미 존재합니다.")
-                return
+        # 조회/시딩에 쓰는 바이너리 파일을 먼저 최신으로 맞춤
+        current = open_current_saju_file(DEFAULT_CSV_PATH)
+        if current is None:
+            days = build_saju_file(DEFAULT_CSV_PATH)
+            print(f"✅ 사주 바이너리 파일 생성 완료 ({days}일)")
+        else:
+            current.close()
+        loaded = load_saju(engine, DEFAULT_CSV_PATH)
     except Exception as e:
-        print(f"⚠️ 테이블 검사 중 경고: {e}")
-
-    if os.path.exists(csv_path):
-        print(f"📥 CSV 데이터 로딩 중... ({csv_path})")
-        try:
-            df = pd.read_csv(csv_path)
-            df.to_sql("saju_table", engine, if_exists="append", index=False)
-            print("✅ 사주 데이터 입력 완료!")
-        except Exception as e:
-            print(f"❌ 데이터 입력 실패: {e}")
+        # 실패한 채로 데이터 버전이 기록되지 않도록 다시 발생
+        print(f"❌ 데이터 입력 실패: {e}")
+        raise
+    if loaded:
+        print(f"✅ 사주 데이터 {loaded}행 입력 완료!")
     else:
-        print("⚠️ CSV 파일이 없습니다. 데이터 시딩을 건너뜁니다.")
+        print("✅ 사주 데이터가 이미 최신입니다.")
 
 
 def _init_celebrity_data():
@@ -1,5 +1,11 @@
 # backend/logic.py
 
+import math
+
+# 기본 파라미터(DEFAULT_PARAMS)의 알고리즘 버전
+# (운영 중 사용할 버전은 algorithm.active_params로 조회, 캐시·저장 결과를 구분하는 데 사용)
+DEFAULT_ALGORITHM_VERSION = "1"
+
 # 천간/지지 인덱스
 SKY_MAP = {
     "갑": 1,
@@ -91,6 +97,104 @@ ELEMENT_KO = {
     "water": ("수(水)", "감정, 직관, 흐름, 공감"),
 }
 
+# MBTI 축 (축 이름, 앞 글자, 뒤 글자)
+AXES = [("EI", "E", "I"), ("SN", "S", "N"), ("TF", "T", "F"), ("PJ", "P", "J")]
+# 축 점수 계산에 쓰는 프로필 항목
+PROFILE_KEYS = ELEMENT_LIST + ["yin", "yang"]
+
+# 기본 알고리즘 파라미터 (버전 DEFAULT_ALGORITHM_VERSION)
+DEFAULT_PARAMS = {
+    "sky_weight": 1.2,  # 천간 오행 가중치
+    "earth_weight": 1.0,  # 지지 오행 가중치
+    "birth_weight": 0.4,  # 생일 사주 비중 (나머지는 오늘 사주)
+    "strength": 0.7,  # 일진 회전 강도
+    # 축 글자별 점수 = 프로필 항목 x 계수의 합 (적힌 순서대로 더함)
+    "axes": {
+        "E": {"yang": 1.0, "fire": 1.0, "metal": 0.5},
+        "I": {"yin": 1.0, "water": 1.0, "wood": 0.5},
+        "S": {"earth": 1.0, "metal": 0.7, "yin": 0.3},
+        "N": {"wood": 1.0, "fire": 0.7, "yang": 0.3},
+        "T": {"metal": 1.0, "yang": 0.5},
+        "F": {"water": 1.0, "wood": 0.5, "yin": 0.3},
+        "P": {"fire": 1.0, "water": 0.5, "wood": 0.3},
+        "J": {"earth": 1.0, "metal": 0.5},
+    },
+}
+
+# 상한이 있는 파라미터 (나머지는 0 이상이면 됨)
+PARAM_MAX = {"birth_weight": 1.0}
+
+
+def _check_number(name: str, value, low=0.0, high=None) -> float:
+    """숫자 파라미터 검증 (low 이상, high 이하)"""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"{name} 값은 숫자여야 합니다.")
+    value = float(value)
+    if not math.isfinite(value) or value < low or (high is not None and value > high):
+        upper = f" {high} 이하" if high is not None else ""
+        raise ValueError(f"{name} 값은 {low} 이상{upper}이어야 합니다.")
+    return value
+
+
+def normalize_params(params: dict) -> dict:
+    """
+    파라미터 검증 후 기본값과 합친 전체 파라미터 반환 (잘못되면 ValueError)
+    - axes는 축 글자 단위로 교체 (예: {"axes": {"E": {...}}}는 E 계수만 바꿈)
+    """
+    if not isinstance(params, dict):
+        raise ValueError("파라미터는 객체여야 합니다.")
+    unknown = set(params) - set(DEFAULT_PARAMS)
+    if unknown:
+        raise ValueError(f"알 수 없는 파라미터: {', '.join(sorted(unknown))}")
+
+    result = {
+        key: _check_number(key, params.get(key, default), high=PARAM_MAX.get(key))
+        for key, default in DEFAULT_PARAMS.items()
+        if key != "axes"
+    }
+
+    axes = params.get("axes", {})
+    if not isinstance(axes, dict):
+        raise ValueError("axes는 축 글자 -> {항목: 계수} 객체여야 합니다.")
+    unknown = set(axes) - set(DEFAULT_PARAMS["axes"])
+    if unknown:
+        raise ValueError(f"알 수 없는 축 글자: {', '.join(sorted(unknown))}")
+    result["axes"] = {}
+    for letter, default in DEFAULT_PARAMS["axes"].items():
+        coefficients = axes.get(letter, default)
+        if not isinstance(coefficients, dict) or not coefficients:
+            raise ValueError(f"axes.{letter}는 비어 있지 않은 객체여야 합니다.")
+        unknown = set(coefficients) - set(PROFILE_KEYS)
+        if unknown:
+            raise ValueError(
+                f"axes.{letter}의 알 수 없는 항목: {', '.join(sorted(unknown))}"
+            )
+        result["axes"][letter] = {
+            key: _check_number(f"axes.{letter}.{key}", value)
+            for key, value in coefficients.items()
+        }
+    return result
+
+
+class AlgorithmParams:
+    """버전이 붙은 분석 파라미터 (만든 뒤에는 바꾸지 않음)"""
+
+    def __init__(self, version: str, params: dict = None):
+        self.version = version
+        self.params = normalize_params(params or {})
+        self._compiled = None
+
+    def compiled(self):
+        """numpy 계수 행렬 (logic_batch.compile_params, 처음 쓸 때 한 번만 만듦)"""
+        if self._compiled is None:
+            import logic_batch
+
+            self._compiled = logic_batch.compile_params(self)
+        return self._compiled
+
+
+DEFAULT_ALGORITHM = AlgorithmParams(DEFAULT_ALGORITHM_VERSION, DEFAULT_PARAMS)
+
 
 def parse_ganji_to_index(ganji_str: str):
     if not ganji_str:
@@ -103,6 +207,14 @@ def parse_ganji_to_index(ganji_str: str):
     return [gan, ji]
 
 
+def ganji_to_saju(year_ganji: str, month_ganji: str, day_ganji: str):
+    """연/월/일 간지 문자열 -> [연간, 연지, 월간, 월지, 일간, 일지] 인덱스"""
+    y = parse_ganji_to_index(year_ganji)
+    m = parse_ganji_to_index(month_ganji)
+    d = parse_ganji_to_index(day_ganji)
+    return [y[0], y[1], m[0], m[1], d[0], d[1]]
+
+
 def saju_to_profile(saju, sky_weight=1.2, earth_weight=1.0):
     elem_scores = {e: 0.0 for e in ELEMENT_LIST}
     yin = 0.0
@@ -149,28 +261,16 @@ def combine_profiles(birth_profile, today_profile, birth_weight=0.4):
     return {"elements": elements, "yin": yin, "yang": yang}
 
 
-def profile_to_axes(profile):
-    e = profile["elements"]
-    yin = profile["yin"]
-    yang = profile["yang"]
-
+def profile_to_axes(profile, coefficients=None):
+    """프로필 -> MBTI 축 점수 (coefficients: 축 글자 -> {항목: 계수}, 기본 DEFAULT_PARAMS)"""
+    coefficients = coefficients or DEFAULT_PARAMS["axes"]
+    values = dict(profile["elements"], yin=profile["yin"], yang=profile["yang"])
     return {
-        "EI": {
-            "E": yang + e["fire"] + e["metal"] * 0.5,
-            "I": yin + e["water"] + e["wood"] * 0.5,
-        },
-        "SN": {
-            "S": e["earth"] + e["metal"] * 0.7 + yin * 0.3,
-            "N": e["wood"] + e["fire"] * 0.7 + yang * 0.3,
-        },
-        "TF": {
-            "T": e["metal"] + yang * 0.5,
-            "F": e["water"] + e["wood"] * 0.5 + yin * 0.3,
-        },
-        "PJ": {
-            "P": e["fire"] + e["water"] * 0.5 + e["wood"] * 0.3,
-            "J": e["earth"] + e["metal"] * 0.5,
-        },
+        axis: {
+            letter: sum(values[key] * c for key, c in coefficients[letter].items())
+            for letter in (k1, k2)
+        }
+        for axis, k1, k2 in AXES
     }
 
 
@@ -309,9 +409,7 @@ def get_compatibility_details(my_axes):
     """
     partner_axes = {}
 
-    axis_info = [("EI", "E", "I"), ("SN", "S", "N"), ("TF", "T", "F"), ("PJ", "P", "J")]
-
-    for axis_key, k1, k2 in axis_info:
+    for axis_key, k1, k2 in AXES:
         v1 = my_axes[axis_key][k1]
         v2 = my_axes[axis_key][k2]
         ratio = max(v1, v2) / max(min(v1, v2), 0.001)
@@ -324,3 +422,43 @@ def get_compatibility_details(my_axes):
             partner_axes[axis_key] = {k1: v1, k2: v2}
 
     return partner_axes
+
+
+def analyze_daily(birth_saju, today_saju, algorithm: AlgorithmParams = None):
+    """
+    생일 사주 + 오늘 사주로 오늘의 분석 결과 계산 (유명인 매칭 제외)
+    - algorithm: 사용할 파라미터 (기본 DEFAULT_ALGORITHM)
+    - 같은 입력이면 항상 같은 결과를 반환합니다.
+    """
+    algorithm = algorithm or DEFAULT_ALGORITHM
+    params = algorithm.params
+    birth_prof = saju_to_profile(
+        birth_saju, params["sky_weight"], params["earth_weight"]
+    )
+    today_prof = saju_to_profile(
+        today_saju, params["sky_weight"], params["earth_weight"]
+    )
+    combined = combine_profiles(birth_prof, today_prof, params["birth_weight"])
+
+    axes_base = profile_to_axes(combined, params["axes"])
+    axes = apply_daily_rotation(axes_base, today_saju, params["strength"])
+
+    my_mbti = axes_to_mbti(axes)
+    partner_mbti = get_destiny_partner(axes)
+
+    p_text, d_text = generate_explanation(
+        combined, axes, my_mbti, partner_mbti, today_saju
+    )
+
+    lucky_element_key = max(combined["elements"], key=combined["elements"].get)
+
+    return {
+        "my_persona": my_mbti,
+        "my_destiny": partner_mbti,
+        "lucky_element": ELEMENT_KO[lucky_element_key][0],
+        "persona_description": p_text,
+        "destiny_description": d_text,
+        "axes": axes,
+        "partner_axes": get_compatibility_details(axes),
+        "algorithm_version": algorithm.version,
+    }
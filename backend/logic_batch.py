@@ -0,0 +1,143 @@
+"""
+배치(numpy) 분석 엔진
+- logic.analyze_daily의 MBTI/운명 MBTI/행운의 원소를 여러 (생일 사주, 날짜 사주) 쌍에 대해
+  한 번에 계산합니다. (설명 문장은 만들지 않음, 관리자 미리보기/시뮬레이션용)
+- 파라미터는 compile_params로 한 번 계수 행렬로 바꿔 두고(AlgorithmParams.compiled) 재사용합니다.
+- 덧셈 순서를 logic과 같게 맞춰 결과가 logic.analyze_daily와 비트 단위로 같습니다.
+  (동점 비교 E >= I 등이 부동소수점 오차로 바뀌지 않도록)
+- numpy는 계산할 때만 import합니다. (앱 시작 시간)
+"""
+
+import logic
+
+# MBTI 코드(0~15) -> 문자열 (축마다 앞 글자 0, 뒤 글자 1, EI가 최상위 비트)
+MBTI_TYPES = [
+    "".join(pair[(code >> (3 - i)) & 1] for i, (_, *pair) in enumerate(logic.AXES))
+    for code in range(16)
+]
+# 축 글자 순서 (점수 행렬의 열)
+AXIS_LETTERS = [letter for _, k1, k2 in logic.AXES for letter in (k1, k2)]
+
+# 사주 인덱스 표 크기 (알 수 없는 인덱스는 0점, core.saju_file.MISSING 포함)
+_INDEX_SIZE = 256
+
+
+def compile_params(algorithm: logic.AlgorithmParams) -> dict:
+    """
+    파라미터 -> 계수 행렬
+    - sky/earth: 천간/지지 인덱스 -> 프로필 기여 (PROFILE_KEYS 순서, 오행은 가중치, 음양은 1)
+    - axes: 프로필 항목 x 축 글자 계수 행렬 (AXIS_LETTERS 순서)
+    - terms: 축 글자별 (항목 번호, 계수) 목록 (logic.profile_to_axes와 같은 덧셈 순서)
+    """
+    import numpy as np
+
+    params = algorithm.params
+    column = {key: i for i, key in enumerate(logic.PROFILE_KEYS)}
+
+    def profile_table(elements, yinyang, weight):
+        table = np.zeros((_INDEX_SIZE, len(logic.PROFILE_KEYS)))
+        for idx, element in elements.items():
+            table[idx, column[element]] = weight
+        for idx, yy in yinyang.items():
+            table[idx, column[yy]] = 1.0
+        return table
+
+    axes = np.zeros((len(logic.PROFILE_KEYS), len(AXIS_LETTERS)))
+    terms = []
+    for j, letter in enumerate(AXIS_LETTERS):
+        coefficients = params["axes"][letter]
+        for key, c in coefficients.items():
+            axes[column[key], j] = c
+        terms.append([(column[key], c) for key, c in coefficients.items()])
+
+    return {
+        "sky": profile_table(
+            logic.SKY_ELEMENT, logic.SKY_YINYANG, params["sky_weight"]
+        ),
+        "earth": profile_table(
+            logic.EARTH_ELEMENT, logic.EARTH_YINYANG, params["earth_weight"]
+        ),
+        "birth_weight": params["birth_weight"],
+        "strength": params["strength"],
+        "axes": axes,
+        "terms": terms,
+    }
+
+
+def saju_array(sajus):
+    """사주 목록 [[연간, 연지, 월간, 월지, 일간, 일지], ...] -> (N, 6) 정수 배열"""
+    import numpy as np
+
+    return np.asarray(sajus, dtype=np.int64).reshape(-1, 6)
+
+
+def profiles(compiled: dict, saju):
+    """(N, 6) 사주 -> (N, 7) 프로필 (logic.saju_to_profile)"""
+    sky, earth = compiled["sky"], compiled["earth"]
+    return (
+        sky[saju[:, 0]]
+        + sky[saju[:, 2]]
+        + sky[saju[:, 4]]
+        + earth[saju[:, 1]]
+        + earth[saju[:, 3]]
+        + earth[saju[:, 5]]
+    )
+
+
+def score(compiled: dict, birth, today, birth_idx=None, today_idx=None) -> dict:
+    """
+    (N, 6) 생일 사주, (N, 6) 날짜 사주 -> 배열 dict
+    - birth_idx/today_idx를 주면 birth/today는 고유 사주 배열로 보고 인덱스로 펼침
+      (프로필을 고유 사주마다 한 번만 계산)
+    - persona / destiny: MBTI 코드 (MBTI_TYPES 인덱스)
+    - lucky: 행운의 원소 (ELEMENT_LIST 인덱스)
+    - axes: (N, 8) 일진 회전 후 축 점수 (AXIS_LETTERS 순서)
+    - 항목별 연산이 연속 메모리가 되도록 내부에서는 (항목 수, N) 배열로 계산합니다.
+    """
+    import numpy as np
+
+    birth_profiles = np.ascontiguousarray(profiles(compiled, birth).T)
+    today_profiles = np.ascontiguousarray(profiles(compiled, today).T)
+    if birth_idx is not None:
+        birth_profiles = np.take(birth_profiles, birth_idx, axis=1)
+    if today_idx is not None:
+        today_profiles = np.take(today_profiles, today_idx, axis=1)
+        today = today[today_idx]
+
+    w_birth = compiled["birth_weight"]
+    combined = birth_profiles * w_birth + today_profiles * (1.0 - w_birth)
+
+    axes = np.empty((len(AXIS_LETTERS), combined.shape[1]))
+    for j, terms in enumerate(compiled["terms"]):
+        col = 0
+        for key, c in terms:
+            col = col + combined[key] * c
+        axes[j] = col
+
+    # 일진 회전 (logic.apply_daily_rotation)
+    day_sky = today[:, 4]
+    day_earth = today[:, 5]
+    flags = [
+        (day_sky + day_earth) % 2,
+        (day_sky * day_earth) % 2,
+        (day_sky + 2 * day_earth) % 2,
+        (2 * day_sky + day_earth) % 2,
+    ]
+    persona = np.zeros(combined.shape[1], dtype=np.uint8)
+    destiny = np.zeros(combined.shape[1], dtype=np.uint8)
+    for i, flag in enumerate(flags):
+        v1, v2 = axes[2 * i], axes[2 * i + 1]
+        boost = (v1 + v2) / 2.0 * compiled["strength"]
+        first = flag == 0
+        np.add(v1, boost, out=v1, where=first)
+        np.add(v2, boost, out=v2, where=~first)
+
+        bit = 3 - i
+        persona |= (v1 < v2).astype(np.uint8) << bit
+        # 치우친 축은 반대 글자(보완), 비슷한 축은 같은 글자(동질) (logic.get_destiny_partner)
+        ratio = np.maximum(v1, v2) / np.maximum(np.minimum(v1, v2), 0.001)
+        second = np.where(ratio > 1.1, v1 > v2, v1 <= v2)
+        destiny |= second.astype(np.uint8) << bit
+
+    lucky = np.argmax(combined[: len(logic.ELEMENT_LIST)], axis=0)
+    return {"persona": persona, "destiny": destiny, "lucky": lucky, "axes": axes.T}
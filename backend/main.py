@@ -4,9 +4,11 @@ FastAPI 앱 엔트리포인트
 """
 
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Header, HTTPException
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+import hmac
 import os
 from dotenv import load_dotenv
 
@@ -17,16 +19,48 @@ ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "http://localhost:3000").split(",
 from routers import auth, users, analysis, calendar, stats, celebrities, admin
 
 # DB 초기화
-from init_db import init_db
+from init_db import ensure_db_ready
+from core.config import settings
+from core.write_behind import analysis_write_buffer
+from core.security import password_hasher, principal_cache, token_cache
+from core.cache import analysis_cache
+from core.profiling import ServerTimingMiddleware, install_query_hooks
+from core import metrics
+from core import query_monitor
+from database import engine
+from precompute import PrecomputeScheduler
+
+# 워커별 메트릭 스냅샷 파일 기록
+metrics_writer = metrics.SnapshotWriter(
+    settings.METRICS_DIR, settings.METRICS_FLUSH_SECONDS
+)
+
+# 다음 날 분석 결과 야간 사전 계산
+precompute_scheduler = PrecomputeScheduler(
+    settings.PRECOMPUTE_HOUR,
+    settings.PRECOMPUTE_WORKERS,
+    settings.PRECOMPUTE_CHUNK_SIZE,
+)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """앱 시작/종료 시 실행되는 이벤트"""
-    print("🚀 서버 시작 - 데이터베이스 초기화 중...")
-    init_db()
-    print("✅ 데이터베이스 초기화 완료!")
+    print("🚀 서버 시작 - 데이터베이스 버전 확인 중...")
+    ensure_db_ready()
+    print("✅ 데이터베이스 준비 완료!")
+    if settings.ANALYSIS_WRITE_BEHIND:
+        analysis_write_buffer.start()
+    if settings.METRICS_ENABLED:
+        metrics_writer.start()
+    if settings.PRECOMPUTE_ENABLED:
+        precompute_scheduler.start()
     yield
+    precompute_scheduler.stop()
+    metrics_writer.stop()
+    # 큐에 남은 분석 결과 저장
+    analysis_write_buffer.stop()
+    password_hasher.shutdown()
     print("👋 서버 종료")
 
 
@@ -47,6 +81,35 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 느린 쿼리 로그 / N+1 감지
+if settings.SLOW_QUERY_MS or settings.N_PLUS_ONE_THRESHOLD:
+    query_monitor.install(
+        engine, settings.SLOW_QUERY_MS, log_params=settings.SLOW_QUERY_LOG_PARAMS
+    )
+if settings.N_PLUS_ONE_THRESHOLD:
+    app.add_middleware(
+        query_monitor.QueryMonitorMiddleware,
+        n_plus_one_threshold=settings.N_PLUS_ONE_THRESHOLD,
+    )
+
+# 라우트별 요청 수/처리 시간, 커넥션 풀, 캐시, 작업 큐 메트릭
+if settings.METRICS_ENABLED:
+    metrics.instrument_pool(engine)
+    metrics.register_cache("analysis", analysis_cache)
+    metrics.register_cache("token", token_cache)
+    metrics.register_cache("principal", principal_cache)
+    metrics.register_gauge("password_hash_queue_depth", password_hasher.queue_depth)
+    metrics.register_gauge(
+        "analysis_write_queue_depth", analysis_write_buffer.queue_depth
+    )
+    app.add_middleware(metrics.MetricsMiddleware)
+
+# 요청별 프로파일링 (가장 바깥 미들웨어여야 다른 미들웨어까지 포함한 전체 처리 시간을
+# 측정하므로 마지막에 등록, Starlette는 나중에 등록한 미들웨어가 바깥쪽)
+if settings.SERVER_TIMING:
+    install_query_hooks(engine)
+    app.add_middleware(ServerTimingMiddleware, log=settings.SERVER_TIMING_LOG)
+
 # 정적 파일 서빙 설정
 static_dir = os.path.join(os.path.dirname(__file__), "static")
 if not os.path.exists(static_dir):
@@ -68,3 +131,19 @@ app.include_router(admin.router)
 @app.get("/health")
 def health_check():
     return {"status": "ok"}
+
+
+# 메트릭 (Prometheus 텍스트 형식, 모든 워커 합산)
+if settings.METRICS_ENABLED:
+
+    @app.get("/metrics", include_in_schema=False)
+    def metrics_endpoint(authorization: str = Header(default="")):
+        expected = f"Bearer {settings.METRICS_TOKEN}"
+        if settings.METRICS_TOKEN and not hmac.compare_digest(
+            authorization.encode(), expected.encode()
+        ):
+            raise HTTPException(status_code=401, detail="메트릭 토큰이 필요합니다.")
+        return PlainTextResponse(
+            metrics.render(settings.METRICS_DIR, settings.METRICS_FLUSH_SECONDS),
+            media_type="text/plain; version=0.0.4",
+        )
@@ -0,0 +1,268 @@
+"""
+DB 마이그레이션
+- schema_meta 테이블의 schema_version 값으로 적용 여부를 관리합니다.
+- 각 마이그레이션은 여러 번 실행되어도 안전하도록(idempotent) 작성합니다.
+"""
+
+from contextlib import contextmanager
+from datetime import datetime
+import json
+import zlib
+
+from sqlalchemy import inspect, text
+
+# config가 먼저 로드되도록
+from core.config import settings
+from core.file_lock import file_lock
+from database import engine
+import logic
+import models
+
+SCHEMA_VERSION_KEY = "schema_version"
+DATA_VERSION_KEY = "data_version"
+
+# 시드 데이터(유명인) 버전: 시딩 내용이 바뀌면 올려서 init_db가 다시 실행되게 함
+# (사주 데이터는 CSV 체크섬으로 따로 관리, saju_loader 참고)
+SEED_DATA_VERSION = 1
+
+# PostgreSQL advisory lock 키 (이름에서 만든 고정값)
+MIGRATION_LOCK_KEY = zlib.crc32(b"saju:migrations")
+
+
+def get_meta(conn, key: str):
+    """schema_meta 값 조회 (없으면 None)"""
+    row = conn.execute(
+        text("SELECT value FROM schema_meta WHERE key = :key"), {"key": key}
+    ).fetchone()
+    return row[0] if row else None
+
+
+def set_meta(conn, key: str, value) -> None:
+    """schema_meta 값 저장"""
+    updated = conn.execute(
+        text("UPDATE schema_meta SET value = :value WHERE key = :key"),
+        {"key": key, "value": str(value)},
+    )
+    if updated.rowcount == 0:
+        conn.execute(
+            text("INSERT INTO schema_meta (key, value) VALUES (:key, :value)"),
+            {"key": key, "value": str(value)},
+        )
+
+
+def get_schema_version(conn) -> int:
+    """현재 DB에 적용된 스키마 버전"""
+    value = get_meta(conn, SCHEMA_VERSION_KEY)
+    return int(value) if value else 0
+
+
+def get_data_version(conn) -> int:
+    """현재 DB에 적재된 시드 데이터 버전"""
+    value = get_meta(conn, DATA_VERSION_KEY)
+    return int(value) if value else 0
+
+
+@contextmanager
+def migration_lock(timeout: float = 600):
+    """
+    마이그레이션/시딩 동시 실행 방지 잠금 (여러 워커/프로세스 간)
+    - PostgreSQL: advisory lock
+    - 그 외(SQLite 등): 잠금 파일 (core.file_lock, 잡은 프로세스가 종료되었으면 정리)
+    """
+    if engine.dialect.name == "postgresql":
+        with engine.connect() as conn:
+            params = {"key": MIGRATION_LOCK_KEY}
+            conn.execute(text("SELECT pg_advisory_lock(:key)"), params)
+            try:
+                yield
+            finally:
+                conn.execute(text("SELECT pg_advisory_unlock(:key)"), params)
+                conn.commit()
+        return
+
+    lock_path = settings.MIGRATION_LOCK_PATH
+    with file_lock(lock_path, stale_seconds=timeout, wait=timeout) as locked:
+        if not locked:
+            raise TimeoutError(f"마이그레이션 잠금을 얻지 못했습니다: {lock_path}")
+        yield
+
+
+# --- 마이그레이션 ---
+
+
+def _001_analysis_result_indexes(conn):
+    """
+    analysis_results 인덱스 재구성
+    - (username, analysis_date) 중복 행 제거 후 복합 UNIQUE 인덱스 생성
+    - username 단일 인덱스는 복합 인덱스가 대신하므로 삭제
+    - created_at 인덱스 (관리자 최신순 조회)
+    - PostgreSQL: username 부분 문자열 검색(ILIKE '%x%')용 pg_trgm GIN 인덱스
+    """
+    # 같은 날짜의 중복 결과는 가장 최근(id가 큰) 것만 남김
+    conn.execute(
+        text(
+            """
+            DELETE FROM analysis_results
+            WHERE id NOT IN (
+                SELECT max_id FROM (
+                    SELECT MAX(id) AS max_id
+                    FROM analysis_results
+                    GROUP BY username, analysis_date
+                ) AS latest
+            )
+            """
+        )
+    )
+
+    conn.execute(text("DROP INDEX IF EXISTS ix_analysis_results_username"))
+
+    for index in models.AnalysisResult.__table__.indexes:
+        index.create(bind=conn, checkfirst=True)
+
+    if conn.dialect.name == "postgresql":
+        # 확장 설치 권한이 없을 수 있으므로 실패해도 나머지 마이그레이션은 진행
+        savepoint = conn.begin_nested()
+        try:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            conn.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS ix_analysis_results_username_trgm "
+                    "ON analysis_results USING gin (username gin_trgm_ops)"
+                )
+            )
+            savepoint.commit()
+        except Exception as e:
+            savepoint.rollback()
+            print(f"⚠️ pg_trgm 인덱스 생성 건너뜀: {e}")
+    # SQLite: '%x%' 검색은 인덱스를 탈 수 없지만, username이 선두인 복합 인덱스를
+    # 커버링 인덱스로 스캔하므로 테이블 전체 스캔보다 가볍습니다.
+
+
+def _002_resource_versions(conn):
+    """
+    resource_versions 테이블 생성 (ETag/Last-Modified용 변경 버전)
+    """
+    models.ResourceVersion.__table__.create(bind=conn, checkfirst=True)
+
+
+def _003_analysis_result_fk_cascade(conn):
+    """
+    analysis_results.username 외래 키에 ON DELETE CASCADE 적용 (PostgreSQL)
+    - SQLite는 외래 키 변경에 테이블 재생성이 필요하므로 건너뜁니다.
+      (계정 삭제는 어느 DB든 crud.delete_users의 일괄 DELETE로 처리)
+    """
+    if conn.dialect.name != "postgresql":
+        return
+
+    for fk in inspect(conn).get_foreign_keys("analysis_results"):
+        if fk["referred_table"] == "users":
+            conn.execute(
+                text(f'ALTER TABLE analysis_results DROP CONSTRAINT "{fk["name"]}"')
+            )
+    conn.execute(
+        text(
+            "ALTER TABLE analysis_results "
+            "ADD CONSTRAINT analysis_results_username_fkey "
+            "FOREIGN KEY (username) REFERENCES users (username) ON DELETE CASCADE"
+        )
+    )
+
+
+def _004_analysis_result_algorithm_version(conn):
+    """
+    analysis_results.algorithm_version 컬럼 추가 (재계산 대상 구분)
+    - 기존 행은 모두 알고리즘 버전 "1"로 계산된 결과이므로 "1"로 채움
+    """
+    columns = {c["name"] for c in inspect(conn).get_columns("analysis_results")}
+    if "algorithm_version" not in columns:
+        conn.execute(
+            text(
+                "ALTER TABLE analysis_results "
+                "ADD COLUMN algorithm_version VARCHAR(20)"
+            )
+        )
+    conn.execute(
+        text(
+            "UPDATE analysis_results SET algorithm_version = '1' "
+            "WHERE algorithm_version IS NULL"
+        )
+    )
+
+
+def _005_algorithm_versions(conn):
+    """
+    algorithm_versions 테이블 생성 (버전별 분석 파라미터)
+    - 기존 logic.py의 고정 가중치/계수를 기본 버전으로 등록
+    """
+    models.AlgorithmVersion.__table__.create(bind=conn, checkfirst=True)
+    exists = conn.execute(
+        text("SELECT 1 FROM algorithm_versions WHERE version = :version"),
+        {"version": logic.DEFAULT_ALGORITHM_VERSION},
+    ).fetchone()
+    if not exists:
+        conn.execute(
+            models.AlgorithmVersion.__table__.insert(),
+            {
+                "version": logic.DEFAULT_ALGORITHM_VERSION,
+                "params": json.dumps(logic.DEFAULT_PARAMS),
+                "description": "기본 파라미터",
+                "created_at": datetime.utcnow(),
+            },
+        )
+
+
+MIGRATIONS = [
+    (1, _001_analysis_result_indexes),
+    (2, _002_resource_versions),
+    (3, _003_analysis_result_fk_cascade),
+    (4, _004_analysis_result_algorithm_version),
+    (5, _005_algorithm_versions),
+]
+
+LATEST_SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def is_db_up_to_date() -> bool:
+    """
+    스키마/시드 데이터 버전이 최신인지 확인 (schema_meta 한 번 조회)
+    - schema_meta 테이블이 없으면(새 DB) False
+    """
+    try:
+        with engine.connect() as conn:
+            rows = dict(
+                conn.execute(
+                    text("SELECT key, value FROM schema_meta WHERE key IN (:s, :d)"),
+                    {"s": SCHEMA_VERSION_KEY, "d": DATA_VERSION_KEY},
+                ).fetchall()
+            )
+    except Exception:
+        return False
+    return (
+        int(rows.get(SCHEMA_VERSION_KEY) or 0) >= LATEST_SCHEMA_VERSION
+        and int(rows.get(DATA_VERSION_KEY) or 0) >= SEED_DATA_VERSION
+    )
+
+
+def run_migrations() -> int:
+    """미적용 마이그레이션을 순서대로 실행하고 최종 스키마 버전을 반환"""
+    models.SchemaMeta.__table__.create(bind=engine, checkfirst=True)
+
+    with engine.begin() as conn:
+        current = get_schema_version(conn)
+
+    for version, migration in MIGRATIONS:
+        if version <= current:
+            continue
+        summary = migration.__doc__.strip().splitlines()[0]
+        print(f"🔧 마이그레이션 {version:03d} 적용 중... ({summary})")
+        with engine.begin() as conn:
+            migration(conn)
+            set_meta(conn, SCHEMA_VERSION_KEY, version)
+        current = version
+
+    return current
+
+
+if __name__ == "__main__":
+    models.Base.metadata.create_all(bind=engine)
+    print(f"✅ 스키마 버전: {run_migrations()}")
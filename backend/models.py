@@ -1,4 +1,13 @@
-from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Text
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Date,
+    DateTime,
+    ForeignKey,
+    Text,
+    Index,
+)
 from sqlalchemy.orm import relationship
 from database import Base
 from datetime import datetime
@@ -14,8 +23,12 @@ class User(Base):
     gender = Column(String)
 
     # 분석 결과와의 관계 설정
+    # 삭제는 DB의 ON DELETE CASCADE / 일괄 DELETE로 처리 (자식 행을 세션에 로드하지 않음)
     analysis_results = relationship(
-        "AnalysisResult", back_populates="user", cascade="all, delete-orphan"
+        "AnalysisResult",
+        back_populates="user",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
 
 
@@ -34,7 +47,9 @@ class AnalysisResult(Base):
     __tablename__ = "analysis_results"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    username = Column(String, ForeignKey("users.username"), nullable=False, index=True)
+    username = Column(
+        String, ForeignKey("users.username", ondelete="CASCADE"), nullable=False
+    )
     analysis_date = Column(String, nullable=False, index=True)  # YYYY-MM-DD
     my_persona = Column(String)  # MBTI 결과
     my_destiny = Column(String)  # 운명의 파트너 MBTI
@@ -42,11 +57,54 @@ class AnalysisResult(Base):
     persona_description = Column(Text)  # 페르소나 설명
     destiny_description = Column(Text)  # 운명 설명
     axes_data = Column(Text)  # JSON 형태의 axes 데이터
+    algorithm_version = Column(String(20))  # 계산에 쓴 알고리즘 버전 (AlgorithmVersion)
     created_at = Column(DateTime, default=datetime.utcnow)
 
     # User와의 관계
     user = relationship("User", back_populates="analysis_results")
 
+    __table_args__ = (
+        # 캘린더/히스토리/상세/저장 쿼리는 모두 (username, analysis_date)로 조회
+        Index(
+            "ix_analysis_results_username_date",
+            "username",
+            "analysis_date",
+            unique=True,
+        ),
+        # 관리자 최신순 목록
+        Index("ix_analysis_results_created_at", "created_at"),
+    )
+
+
+class SchemaMeta(Base):
+    """스키마/데이터 버전 등 메타 정보 (key-value)"""
+
+    __tablename__ = "schema_meta"
+
+    key = Column(String(100), primary_key=True)
+    value = Column(String(500))
+
+
+class AlgorithmVersion(Base):
+    """분석 알고리즘 파라미터 버전 (만든 뒤에는 수정하지 않음)"""
+
+    __tablename__ = "algorithm_versions"
+
+    version = Column(String(20), primary_key=True)
+    params = Column(Text, nullable=False)  # JSON (logic.normalize_params 결과)
+    description = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class ResourceVersion(Base):
+    """리소스별 변경 버전 (HTTP ETag/Last-Modified 검증자용)"""
+
+    __tablename__ = "resource_versions"
+
+    key = Column(String(200), primary_key=True)  # 예: celebrities, analysis:{username}
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
 
 class MbtiCelebrity(Base):
     """MBTI별 유명인 매핑 테이블 (태그 기반)"""
@@ -0,0 +1,311 @@
+"""
+다음 날 분석 결과 일괄 사전 계산 (야간 배치)
+- 모든 유저를 username 순서의 keyset 페이지(청크)로 읽어 운영 중인 알고리즘 버전의
+  logic.analyze_daily로 계산하고
+  analysis_results에 일괄 upsert로 저장합니다.
+  (/api/analyze/today는 저장된 행을 읽기만 하면 됨)
+- 같은 생일이면 결과가 같으므로 청크 안에서는 생일별로 한 번만 계산합니다.
+- 이어서 실행: 청크를 저장하는 트랜잭션에 마지막 username을 schema_meta에 함께 기록하고,
+  다시 실행하면 그 다음 유저부터 계산합니다. (--restart로 처음부터)
+- 병렬 실행: --workers로 계산을 프로세스 풀에 나누고, --shard i/n으로 여러 프로세스/서버가
+  username 해시 기준으로 유저를 나눠 맡습니다.
+
+사용법:
+    python precompute.py [--date YYYY-MM-DD] [--workers 4] [--shard 0/2] [--restart]
+"""
+
+import argparse
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+import threading
+import time
+import zlib
+
+from sqlalchemy import func, text
+
+# config가 먼저 로드되도록
+from core.config import settings
+from core.batch import in_shard, parse_shard, run_chunks
+from core.file_lock import file_lock
+from algorithm import active_algorithm
+from database import SessionLocal, engine
+from migrations import get_meta, set_meta
+import crud
+import logic
+import models
+
+# 진행 위치 키: precompute:<날짜>:<샤드>/<샤드 수>
+CHECKPOINT_PREFIX = "precompute:"
+# 앱 안에서 실행할 때 워커 간 잠금 (PostgreSQL advisory lock 키, 이름에서 만든 고정값)
+PRECOMPUTE_LOCK_KEY = zlib.crc32(b"saju:precompute")
+# 잠금 파일이 이 시간 동안 갱신되지 않으면 비정상 종료로 보고 정리 (초)
+# (잡고 있는 동안에는 주기적으로 갱신하므로 오래 걸리는 배치의 잠금은 빼앗지 않음)
+STALE_LOCK_SECONDS = 10 * 60
+# upsert 한 번에 넣을 최대 행 수
+UPSERT_BATCH_SIZE = 500
+
+
+def checkpoint_key(target_date: str, shard: int, shards: int) -> str:
+    return f"{CHECKPOINT_PREFIX}{target_date}:{shard}/{shards}"
+
+
+def compute_chunk(
+    users: list,
+    birth_saju: dict,
+    day_saju: list,
+    target_date: str,
+    algorithm: logic.AlgorithmParams,
+):
+    """
+    청크 하나의 분석 결과 행 계산 (프로세스 풀에서 실행)
+    - users: [(username, 생년월일)], birth_saju: 생년월일 -> 사주
+    """
+    by_birthdate = {}
+    rows = []
+    for username, birthdate in users:
+        result = by_birthdate.get(birthdate)
+        if result is None:
+            result = logic.analyze_daily(birth_saju[birthdate], day_saju, algorithm)
+            by_birthdate[birthdate] = result
+        rows.append(crud.analysis_row(username, target_date, result))
+    return rows
+
+
+def _iter_chunks(db, after, chunk_size: int, shard: int, shards: int):
+    """username > after인 유저를 chunk_size씩 읽어 (마지막 username, 읽은 수, 유저 목록)"""
+    while True:
+        query = db.query(models.User.username, models.User.birthdate)
+        if after is not None:
+            query = query.filter(models.User.username > after)
+        page = query.order_by(models.User.username).limit(chunk_size).all()
+        if not page:
+            return
+        after = page[-1][0]
+        users = [(u, b) for u, b in page if b and in_shard(u, shard, shards)]
+        yield after, len(page), users
+
+
+def precompute(
+    target_date: str = None,
+    chunk_size: int = 2000,
+    workers: int = 1,
+    shard: int = 0,
+    shards: int = 1,
+    restart: bool = False,
+    progress=None,
+    should_stop=None,
+) -> dict:
+    """
+    target_date(기본: 내일) 분석 결과를 모든 유저에 대해 계산/저장하고 처리 결과를 반환
+    - progress: 청크를 저장할 때마다 호출되는 콜백 (처리 결과 dict를 인자로 받음)
+    - should_stop: True를 반환하면 다음 청크부터 중단 (진행 위치는 남으므로 이어서 실행 가능)
+    """
+    target_date = target_date or (date.today() + timedelta(days=1)).isoformat()
+    key = checkpoint_key(target_date, shard, shards)
+    report = {
+        "date": target_date,
+        "algorithm_version": None,
+        "shard": f"{shard}/{shards}",
+        "resumed_after": None,
+        "total_users": 0,
+        "scanned": 0,
+        "rows": 0,
+        "chunks": 0,
+        "seconds": 0.0,
+        "stopped": False,
+    }
+    started = time.perf_counter()
+
+    db = SessionLocal()
+    try:
+        day_saju = crud.get_saju_map(db, [target_date]).get(target_date)
+        if day_saju is None:
+            raise ValueError(f"{target_date}의 사주 데이터가 없습니다.")
+        algorithm = active_algorithm(db)
+        report["algorithm_version"] = algorithm.version
+
+        after = None if restart else get_meta(db, key)
+        report["resumed_after"] = after
+        report["total_users"] = db.query(func.count(models.User.username)).scalar()
+
+        def chunks():
+            for last_username, scanned, users in _iter_chunks(
+                db, after, chunk_size, shard, shards
+            ):
+                birth_saju = crud.get_saju_map(db, [b for _, b in users])
+                # 사주를 계산할 수 없는 생년월일은 건너뜀
+                users = [(u, b) for u, b in users if b in birth_saju]
+                args = (users, birth_saju, day_saju, target_date, algorithm)
+                yield (last_username, scanned), args
+
+        def save(meta, rows):
+            last_username, scanned = meta
+            for i in range(0, len(rows), UPSERT_BATCH_SIZE):
+                crud.upsert_analysis_results(db, rows[i : i + UPSERT_BATCH_SIZE])
+            # 결과와 진행 위치를 같은 트랜잭션으로 기록 (중간에 끊겨도 누락 없이 이어서 실행)
+            set_meta(db, key, last_username)
+            db.commit()
+            report["scanned"] += scanned
+            report["rows"] += len(rows)
+            report["chunks"] += 1
+            report["seconds"] = round(time.perf_counter() - started, 2)
+            if progress:
+                progress(report)
+
+        report["stopped"] = run_chunks(
+            chunks(), compute_chunk, save, workers, should_stop
+        )
+
+        # 지난 날짜의 진행 위치 정리
+        db.execute(
+            text("DELETE FROM schema_meta WHERE key LIKE :prefix AND key < :before"),
+            {
+                "prefix": f"{CHECKPOINT_PREFIX}%",
+                "before": f"{CHECKPOINT_PREFIX}{date.today().isoformat()}",
+            },
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    report["seconds"] = round(time.perf_counter() - started, 2)
+    return report
+
+
+@contextmanager
+def job_lock():
+    """
+    여러 워커 중 하나만 배치를 실행하도록 잠금 시도 (얻으면 True, 실행 중이면 False)
+    - PostgreSQL: advisory lock
+    - 그 외(SQLite 등): 잠금 파일 (core.file_lock, 잡은 프로세스가 종료되었으면 정리)
+    """
+    if engine.dialect.name == "postgresql":
+        with engine.connect() as conn:
+            params = {"key": PRECOMPUTE_LOCK_KEY}
+            acquired = conn.execute(
+                text("SELECT pg_try_advisory_lock(:key)"), params
+            ).scalar()
+            try:
+                yield acquired
+            finally:
+                if acquired:
+                    conn.execute(text("SELECT pg_advisory_unlock(:key)"), params)
+                conn.commit()
+        return
+
+    with file_lock(
+        settings.PRECOMPUTE_LOCK_PATH, stale_seconds=STALE_LOCK_SECONDS
+    ) as acquired:
+        yield acquired
+
+
+class PrecomputeScheduler:
+    """매일 hour시에 다음 날 분석 결과를 계산하는 백그라운드 스레드"""
+
+    def __init__(self, hour: int, workers: int, chunk_size: int):
+        self.hour = hour
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="analysis-precompute", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """진행 중인 배치는 현재 청크까지 저장하고 중단 (다음 실행 때 이어서 계산)"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _seconds_until_next_run(self) -> float:
+        now = datetime.now()
+        run_at = now.replace(hour=self.hour, minute=0, second=0, microsecond=0)
+        if run_at <= now:
+            run_at += timedelta(days=1)
+        return (run_at - now).total_seconds()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._seconds_until_next_run()):
+            try:
+                with job_lock() as acquired:
+                    if not acquired:
+                        print("⏭️ 다른 워커가 분석 결과를 사전 계산 중입니다.")
+                        continue
+                    report = precompute(
+                        chunk_size=self.chunk_size,
+                        workers=self.workers,
+                        should_stop=self._stop.is_set,
+                    )
+                print(
+                    f"🌙 {report['date']} 분석 결과 사전 계산: {report['rows']}건 "
+                    f"({report['seconds']}s{', 중단됨' if report['stopped'] else ''})"
+                )
+            except Exception as e:
+                print(f"⚠️ 분석 결과 사전 계산 실패: {e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="다음 날 분석 결과 일괄 사전 계산")
+    parser.add_argument("--date", default=None, help="계산할 날짜 (기본: 내일)")
+    parser.add_argument(
+        "--chunk-size", type=int, default=settings.PRECOMPUTE_CHUNK_SIZE
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="계산 프로세스 수 (DB 쓰기가 병목이면 1이 가장 빠름)",
+    )
+    parser.add_argument(
+        "--shard", type=parse_shard, default=(0, 1), help="맡을 샤드 i/n (기본: 0/1)"
+    )
+    parser.add_argument(
+        "--restart", action="store_true", help="진행 위치를 무시하고 처음부터 계산"
+    )
+    args = parser.parse_args()
+
+    if args.date:
+        try:
+            datetime.strptime(args.date, "%Y-%m-%d")
+        except ValueError:
+            parser.error("날짜는 YYYY-MM-DD 형식이어야 합니다.")
+
+    def print_progress(report):
+        total = report["total_users"] or 1
+        print(
+            f"🌙 {report['date']} [{report['shard']}] {report['scanned']}/"
+            f"{report['total_users']}명 ({report['scanned'] / total:.0%}), "
+            f"저장 {report['rows']}건 - "
+            f"{report['scanned'] / max(report['seconds'], 1e-9):.0f}명/초"
+        )
+
+    try:
+        result = precompute(
+            target_date=args.date,
+            chunk_size=args.chunk_size,
+            workers=args.workers,
+            shard=args.shard[0],
+            shards=args.shard[1],
+            restart=args.restart,
+            progress=print_progress,
+        )
+    except ValueError as e:
+        print(f"❌ {e}")
+        raise SystemExit(1)
+
+    if result["resumed_after"]:
+        print(f"↪️ {result['resumed_after']} 다음 유저부터 이어서 계산했습니다.")
+    print(
+        f"✅ {result['date']} 사전 계산 완료: {result['rows']}건, "
+        f"{result['seconds']}s"
+    )
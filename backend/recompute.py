@@ -0,0 +1,220 @@
+"""
+저장된 분석 결과 재계산 (알고리즘 파라미터/버전 변경 후)
+- analysis_results 중 algorithm_version이 운영 중인 알고리즘 버전과 다른 행을
+  id 순서의 keyset 청크로 읽어, 유저의 현재 생년월일로 다시 계산하고 id 기준 일괄 UPDATE 합니다.
+- 날짜 범위(--from/--to)나 유저(--user)로 대상을 나누고, --workers 프로세스 풀로 계산하며
+  --shard i/n으로 여러 프로세스/서버가 username 해시 기준으로 나눠 맡습니다.
+- 이어서 실행: 재계산한 행은 버전이 바뀌어 다시 대상이 되지 않으므로, 중단된 뒤 같은 명령을
+  다시 실행하면 남은 행만 계산합니다.
+  (--force는 버전과 무관하게 범위 전체를 다시 계산, 이어서 하려면 출력된 --after-id 사용)
+- 같은 (생년월일, 날짜) 조합은 청크 안에서 한 번만 계산합니다.
+
+사용법:
+    python recompute.py [--from 2024-01-01] [--to 2024-12-31] [--user alice]
+                        [--workers 8] [--shard 0/2] [--force] [--after-id N]
+"""
+
+import argparse
+from datetime import datetime
+import os
+import time
+
+from sqlalchemy import func, or_
+
+from core.batch import in_shard, parse_shard, run_chunks
+from algorithm import active_algorithm
+from database import SessionLocal
+import crud
+import logic
+import models
+
+# UPDATE 한 번에 넣을 최대 행 수
+UPDATE_BATCH_SIZE = 1000
+
+
+def compute_rows(items: list, saju_map: dict, algorithm: logic.AlgorithmParams) -> list:
+    """
+    청크 하나의 재계산 결과 (프로세스 풀에서 실행)
+    - items: [(id, username, 분석 날짜, 생년월일)], saju_map: 날짜 -> 사주
+    """
+    results = {}
+    rows = []
+    for result_id, username, analysis_date, birthdate in items:
+        key = (birthdate, analysis_date)
+        result = results.get(key)
+        if result is None:
+            result = logic.analyze_daily(
+                saju_map[birthdate], saju_map[analysis_date], algorithm
+            )
+            results[key] = result
+        row = crud.analysis_row(username, analysis_date, result)
+        row["id"] = result_id
+        rows.append(row)
+    return rows
+
+
+def _target_query(db, version: str, date_from, date_to, usernames, force: bool):
+    """재계산 대상 analysis_results 행 (유저의 현재 생년월일과 함께)"""
+    result = models.AnalysisResult
+    query = db.query(
+        result.id, result.username, result.analysis_date, models.User.birthdate
+    ).join(models.User, models.User.username == result.username)
+    if not force:
+        query = query.filter(
+            or_(
+                result.algorithm_version.is_(None),
+                result.algorithm_version != version,
+            )
+        )
+    if date_from:
+        query = query.filter(result.analysis_date >= date_from)
+    if date_to:
+        query = query.filter(result.analysis_date <= date_to)
+    if usernames:
+        query = query.filter(result.username.in_(usernames))
+    return query
+
+
+def recompute(
+    date_from: str = None,
+    date_to: str = None,
+    usernames: list = None,
+    chunk_size: int = 5000,
+    workers: int = 1,
+    shard: int = 0,
+    shards: int = 1,
+    force: bool = False,
+    after_id: int = 0,
+    progress=None,
+) -> dict:
+    """
+    대상 분석 결과를 운영 중인 알고리즘 버전으로 다시 계산해 저장하고 처리 결과를 반환
+    - progress: 청크를 저장할 때마다 호출되는 콜백 (처리 결과 dict를 인자로 받음)
+    """
+    report = {
+        "algorithm_version": None,
+        "shard": f"{shard}/{shards}",
+        "total": 0,
+        "scanned": 0,
+        "updated": 0,
+        "skipped": 0,
+        "last_id": after_id,
+        "seconds": 0.0,
+    }
+    started = time.perf_counter()
+
+    db = SessionLocal()
+    try:
+        algorithm = active_algorithm(db)
+        report["algorithm_version"] = algorithm.version
+        query = _target_query(
+            db, algorithm.version, date_from, date_to, usernames, force
+        )
+        report["total"] = (
+            query.filter(models.AnalysisResult.id > after_id)
+            .with_entities(func.count(models.AnalysisResult.id))
+            .scalar()
+        )
+
+        def chunks():
+            last_id = after_id
+            while True:
+                page = (
+                    query.filter(models.AnalysisResult.id > last_id)
+                    .order_by(models.AnalysisResult.id)
+                    .limit(chunk_size)
+                    .all()
+                )
+                if not page:
+                    return
+                last_id = page[-1][0]
+                items = [row for row in page if in_shard(row[1], shard, shards)]
+                saju_map = crud.get_saju_map(
+                    db, {d for row in items for d in (row[2], row[3]) if d}
+                )
+                # 사주를 계산할 수 없는 생년월일/날짜는 건너뜀
+                valid = [
+                    tuple(row)
+                    for row in items
+                    if row[2] in saju_map and row[3] in saju_map
+                ]
+                report["skipped"] += len(items) - len(valid)
+                yield (last_id, len(page)), (valid, saju_map, algorithm)
+
+        def save(meta, rows):
+            last_id, scanned = meta
+            for i in range(0, len(rows), UPDATE_BATCH_SIZE):
+                crud.update_analysis_results(db, rows[i : i + UPDATE_BATCH_SIZE])
+            db.commit()
+            report["scanned"] += scanned
+            report["updated"] += len(rows)
+            report["last_id"] = last_id
+            report["seconds"] = round(time.perf_counter() - started, 2)
+            if progress:
+                progress(report)
+
+        run_chunks(chunks(), compute_rows, save, workers)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    report["seconds"] = round(time.perf_counter() - started, 2)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="저장된 분석 결과 재계산")
+    parser.add_argument("--from", dest="date_from", default=None, help="YYYY-MM-DD")
+    parser.add_argument("--to", dest="date_to", default=None, help="YYYY-MM-DD")
+    parser.add_argument(
+        "--user", action="append", default=None, help="대상 유저 (여러 번 지정 가능)"
+    )
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument(
+        "--workers", type=int, default=None, help="계산 프로세스 수 (기본: CPU 수)"
+    )
+    parser.add_argument(
+        "--shard", type=parse_shard, default=(0, 1), help="맡을 샤드 i/n (기본: 0/1)"
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="알고리즘 버전이 같은 행도 다시 계산"
+    )
+    parser.add_argument(
+        "--after-id", type=int, default=0, help="이 id 다음 행부터 (--force 이어서)"
+    )
+    args = parser.parse_args()
+
+    for value in (args.date_from, args.date_to):
+        if value:
+            try:
+                datetime.strptime(value, "%Y-%m-%d")
+            except ValueError:
+                parser.error("날짜는 YYYY-MM-DD 형식이어야 합니다.")
+
+    def print_progress(report):
+        total = report["total"] or 1
+        print(
+            f"🔁 [{report['shard']}] {report['scanned']}/{report['total']}행 "
+            f"({report['scanned'] / total:.0%}), 재계산 {report['updated']}건 - "
+            f"{report['scanned'] / max(report['seconds'], 1e-9):.0f}행/초 "
+            f"(--after-id {report['last_id']})"
+        )
+
+    result = recompute(
+        date_from=args.date_from,
+        date_to=args.date_to,
+        usernames=args.user,
+        chunk_size=args.chunk_size,
+        workers=args.workers if args.workers is not None else os.cpu_count() or 1,
+        shard=args.shard[0],
+        shards=args.shard[1],
+        force=args.force,
+        after_id=args.after_id,
+        progress=print_progress,
+    )
+    print(
+        f"✅ 알고리즘 버전 {result['algorithm_version']}으로 {result['updated']}건 "
+        f"재계산 (건너뜀 {result['skipped']}건), {result['seconds']}s"
+    )
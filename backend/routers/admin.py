@@ -10,9 +10,17 @@ import csv
 import shutil
 
 from database import get_db
-from core.security import get_admin_user
+from core.config import settings
+from core.security import get_admin_user, UserPrincipal, password_hasher
+from core.accounts import remove_users
+from core.cache import analysis_cache
+from core.write_behind import analysis_write_buffer
+import algorithm
+import simulate
 import models
 import schemas
+import crud
+import import_users
 
 router = APIRouter(prefix="/api/admin", tags=["관리자"])
 
@@ -30,7 +38,7 @@ ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".svg"}
 
 @router.get("/images")
 def admin_get_images(
-    admin_user: models.User = Depends(get_admin_user),
+    admin_user: UserPrincipal = Depends(get_admin_user),
 ):
     """이미지 목록 조회"""
     if not os.path.exists(IMAGES_DIR):
@@ -61,7 +69,7 @@ def admin_get_images(
 @router.post("/images")
 async def admin_upload_image(
     file: UploadFile = File(...),
-    admin_user: models.User = Depends(get_admin_user),
+    admin_user: UserPrincipal = Depends(get_admin_user),
 ):
     """이미지 업로드 (원본 파일명 유지)"""
     if not os.path.exists(IMAGES_DIR):
@@ -108,7 +116,7 @@ async def admin_upload_image(
 @router.delete("/images/{filename}")
 def admin_delete_image(
     filename: str,
-    admin_user: models.User = Depends(get_admin_user),
+    admin_user: UserPrincipal = Depends(get_admin_user),
 ):
     """이미지 삭제"""
     # 보안: 경로 조작 방지
@@ -133,7 +141,7 @@ def admin_delete_image(
 
 @router.get("/dashboard")
 def admin_dashboard(
-    admin_user: models.User = Depends(get_admin_user),
+    admin_user: UserPrincipal = Depends(get_admin_user),
     db: Session = Depends(get_db),
 ):
     """관리자 대시보드 통계"""
@@ -166,9 +174,57 @@ def admin_dashboard(
             }
             for r in recent_analyses
         ],
+        "write_behind": analysis_write_buffer.stats(),
+        "analysis_cache": analysis_cache.stats(),
     }
 
 
+# --- 유저 관리 ---
+
+
+@router.post("/users/import")
+def admin_import_users(
+    file: UploadFile = File(...),
+    precompute: bool = Query(default=False, description="오늘 분석 결과도 함께 저장"),
+    admin_user: UserPrincipal = Depends(get_admin_user),
+):
+    """
+    유저 CSV 대량 등록 (username, password, nickname, birthdate, gender)
+    - 수십만 건 단위 이관은 CLI(python import_users.py)를 사용하세요.
+    """
+    if not file.filename.lower().endswith(".csv"):
+        raise HTTPException(status_code=400, detail="CSV 파일만 업로드 가능합니다.")
+
+    # 업로드 파일을 통째로 읽지 않고 스트리밍으로 처리
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        report = import_users.import_users(
+            stream, password_hasher, precompute=precompute
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        stream.detach()
+
+    return {"message": f"{report['created']}명 등록 완료", **report}
+
+
+@router.post("/users/delete")
+def admin_delete_users(
+    request_data: schemas.UserBulkDelete,
+    admin_user: UserPrincipal = Depends(get_admin_user),
+    db: Session = Depends(get_db),
+):
+    """유저 일괄 삭제 (분석 결과 포함)"""
+    if admin_user.username in request_data.usernames:
+        raise HTTPException(
+            status_code=400, detail="자기 자신은 일괄 삭제할 수 없습니다."
+        )
+
+    result = remove_users(db, request_data.usernames)
+    return {"message": f"{result['deleted_users']}명 삭제 완료", **result}
+
+
 # --- 분석 결과 관리 ---
 
 
@@ -180,7 +236,7 @@ def admin_get_analysis_results(
     mbti: str = Query(default=None),
     date_from: str = Query(default=None),
     date_to: str = Query(default=None),
-    admin_user: models.User = Depends(get_admin_user),
+    admin_user: UserPrincipal = Depends(get_admin_user),
     db: Session = Depends(get_db),
 ):
     """분석 결과 목록 조회"""
@@ -232,7 +288,7 @@ def admin_get_analysis_results(
 @router.get("/analysis-results/{result_id}")
 def admin_get_analysis_result(
     result_id: int,
-    admin_user: models.User = Depends(get_admin_user),
+    admin_user: UserPrincipal = Depends(get_admin_user),
     db: Session = Depends(get_db),
 ):
     """분석 결과 상세 조회"""
@@ -255,6 +311,7 @@ def admin_get_analysis_result(
         "persona_description": result.persona_description,
         "destiny_description": result.destiny_description,
         "axes_data": json.loads(result.axes_data) if result.axes_data else None,
+        "algorithm_version": result.algorithm_version,
         "created_at": result.created_at.isoformat(),
     }
 
@@ -263,7 +320,7 @@ def admin_get_analysis_result(
 def admin_update_analysis_result(
     result_id: int,
     update_data: schemas.AnalysisResultUpdate,
-    admin_user: models.User = Depends(get_admin_user),
+    admin_user: UserPrincipal = Depends(get_admin_user),
     db: Session = Depends(get_db),
 ):
     """분석 결과 수정"""
@@ -287,8 +344,10 @@ def admin_update_analysis_result(
     if update_data.destiny_description is not None:
         result.destiny_description = update_data.destiny_description
 
+    crud.bump_resource_versions(db, [crud.analysis_version_key(result.username)])
     db.commit()
     db.refresh(result)
+    analysis_cache.pop(result.username)
 
     return {"message": "분석 결과가 수정되었습니다.", "id": result.id}
 
@@ -296,7 +355,7 @@ def admin_update_analysis_result(
 @router.delete("/analysis-results/{result_id}")
 def admin_delete_analysis_result(
     result_id: int,
-    admin_user: models.User = Depends(get_admin_user),
+    admin_user: UserPrincipal = Depends(get_admin_user),
     db: Session = Depends(get_db),
 ):
     """분석 결과 삭제"""
@@ -309,18 +368,115 @@ def admin_delete_analysis_result(
     if not result:
         raise HTTPException(status_code=404, detail="분석 결과를 찾을 수 없습니다.")
 
+    username = result.username
     db.delete(result)
+    crud.bump_resource_versions(db, [crud.analysis_version_key(username)])
     db.commit()
+    analysis_cache.pop(username)
 
     return {"message": "분석 결과가 삭제되었습니다."}
 
 
+# --- 분석 알고리즘 버전 ---
+
+
+@router.get("/algorithm/versions")
+def admin_get_algorithm_versions(
+    admin_user: UserPrincipal = Depends(get_admin_user),
+    db: Session = Depends(get_db),
+):
+    """알고리즘 파라미터 버전 목록 (운영 버전 포함)"""
+    return algorithm.list_versions(db)
+
+
+@router.post("/algorithm/versions", status_code=201)
+def admin_create_algorithm_version(
+    data: schemas.AlgorithmVersionCreate,
+    admin_user: UserPrincipal = Depends(get_admin_user),
+    db: Session = Depends(get_db),
+):
+    """알고리즘 파라미터 버전 생성 (만든 버전은 수정할 수 없음)"""
+    if algorithm.get_algorithm(db, data.version) is not None:
+        raise HTTPException(status_code=409, detail="이미 있는 버전입니다.")
+    try:
+        created = algorithm.create_version(
+            db, data.version, data.params, data.description
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"version": created.version, "params": created.params}
+
+
+def _get_algorithm_or_404(db: Session, version: str):
+    found = algorithm.get_algorithm(db, version)
+    if found is None:
+        raise HTTPException(status_code=404, detail="알고리즘 버전을 찾을 수 없습니다.")
+    return found
+
+
+@router.get("/algorithm/versions/{version}/preview")
+def admin_preview_algorithm_version(
+    version: str,
+    date_from: str = Query(default=None),
+    date_to: str = Query(default=None),
+    limit: int = Query(default=None, ge=1),
+    admin_user: UserPrincipal = Depends(get_admin_user),
+    db: Session = Depends(get_db),
+):
+    """저장된 최근 분석 결과에 버전을 적용했을 때 바뀌는 비율/분포 (저장하지 않음)"""
+    found = _get_algorithm_or_404(db, version)
+    return algorithm.preview(db, found, date_from, date_to, limit)
+
+
+@router.post("/algorithm/versions/{version}/activate")
+def admin_activate_algorithm_version(
+    version: str,
+    admin_user: UserPrincipal = Depends(get_admin_user),
+    db: Session = Depends(get_db),
+):
+    """운영 알고리즘 버전 변경 (다른 워커는 ALGORITHM_REFRESH_SECONDS 안에 반영)"""
+    _get_algorithm_or_404(db, version)
+    stale = algorithm.activate(db, version)
+    return {
+        "message": f"알고리즘 버전을 {version}(으)로 변경했습니다.",
+        "active": version,
+        "stale_results": stale,
+    }
+
+
+@router.post("/algorithm/sweep")
+def admin_sweep_algorithm(
+    data: schemas.AlgorithmSweepRequest,
+    admin_user: UserPrincipal = Depends(get_admin_user),
+    db: Session = Depends(get_db),
+):
+    """파라미터 격자별 MBTI/운명 MBTI/행운의 원소 분포 (what-if, 격자 점별 결과 캐시)"""
+    try:
+        return simulate.sweep(
+            db,
+            data.grid,
+            version=data.version,
+            workers=settings.SWEEP_WORKERS or os.cpu_count() or 1,
+            mode=data.mode,
+            sample=data.sample,
+            date_from=data.date_from,
+            date_to=data.date_to,
+            birth_from=data.birth_from,
+            birth_to=data.birth_to,
+            seed=data.seed,
+        )
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 # --- 유명인 관리 ---
 
 
 @router.get("/celebrities/export")
 def admin_export_celebrities(
-    admin_user: models.User = Depends(get_admin_user),
+    admin_user: UserPrincipal = Depends(get_admin_user),
     db: Session = Depends(get_db),
 ):
     """유명인 목록 CSV 내보내기"""
@@ -358,25 +514,51 @@ def admin_export_celebrities(
 
 
 @router.post("/celebrities/import")
-async def admin_import_celebrities(
+def admin_import_celebrities(
     file: UploadFile = File(...),
-    admin_user: models.User = Depends(get_admin_user),
+    admin_user: UserPrincipal = Depends(get_admin_user),
     db: Session = Depends(get_db),
 ):
-    """유명인 목록 CSV 가져오기 (대량 등록/수정)"""
+    """
+    유명인 목록 CSV 가져오기 (대량 등록/수정)
+    - DB 조회/저장을 하므로 일반 함수로 선언해 스레드풀에서 실행 (이벤트 루프를 막지 않음)
+    """
     if not file.filename.lower().endswith(".csv"):
         raise HTTPException(status_code=400, detail="CSV 파일만 업로드 가능합니다.")
 
-    content = await file.read()
     # utf-8-sig로 디코딩하여 BOM 처리
-    decoded = content.decode("utf-8-sig")
-
-    reader = csv.DictReader(io.StringIO(decoded))
-
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        rows = list(csv.DictReader(stream))
+    finally:
+        stream.detach()
+
+    # 기존 유명인을 행마다 조회하지 않고 ID / (MBTI, 이름) 기준으로 한 번에 미리 조회
+    ids = set()
+    names = set()
+    for row in rows:
+        if (row.get("id") or "").strip().isdigit():
+            ids.add(int(row["id"]))
+        if row.get("name"):
+            names.add(row["name"])
+    by_id = {}
+    by_name = {}
+    for column, values in (
+        (models.MbtiCelebrity.id, sorted(ids)),
+        (models.MbtiCelebrity.name, sorted(names)),
+    ):
+        for i in range(0, len(values), 500):
+            for celeb in db.query(models.MbtiCelebrity).filter(
+                column.in_(values[i : i + 500])
+            ):
+                by_id[celeb.id] = celeb
+                by_name[(celeb.mbti, celeb.name)] = celeb
+
+    new_rows = []
     success_count = 0
     errors = []
 
-    for row in reader:
+    for row in rows:
         try:
             # 필수 필드 확인
             if not row.get("mbti") or not row.get("name"):
@@ -398,51 +580,41 @@ async def admin_import_celebrities(
                 tags_list = [t.strip() for t in tags_str.split(",") if t.strip()]
                 tags = json.dumps(tags_list, ensure_ascii=False)
 
-            # ID가 있으면 수정 시도, 없으면 추가
-            celeb_id = row.get("id")
-            existing = None
-
-            if celeb_id:
-                existing = (
-                    db.query(models.MbtiCelebrity)
-                    .filter(models.MbtiCelebrity.id == celeb_id)
-                    .first()
-                )
-
-            # 이름과 MBTI로 중복 체크 (ID가 없을 경우)
+            # ID가 있으면 수정 시도, 없으면 이름과 MBTI로 중복 체크
+            celeb_id = (row.get("id") or "").strip()
+            existing = by_id.get(int(celeb_id)) if celeb_id.isdigit() else None
             if not existing:
-                existing = (
-                    db.query(models.MbtiCelebrity)
-                    .filter(
-                        models.MbtiCelebrity.mbti == mbti,
-                        models.MbtiCelebrity.name == row["name"],
-                    )
-                    .first()
-                )
-
-            if existing:
+                existing = by_name.get((mbti, row["name"]))
+
+            values = {
+                "mbti": mbti,
+                "name": row["name"],
+                "tags": tags,
+                "description": row.get("description", ""),
+                "image_url": row.get("image_url", ""),
+            }
+            if isinstance(existing, models.MbtiCelebrity):
                 # 업데이트
-                existing.mbti = mbti
-                existing.name = row["name"]
-                existing.tags = tags
-                existing.description = row.get("description", "")
-                existing.image_url = row.get("image_url", "")
+                by_name.pop((existing.mbti, existing.name), None)
+                for key, value in values.items():
+                    setattr(existing, key, value)
+                by_name[(mbti, row["name"])] = existing
+            elif existing is not None:
+                # 같은 파일 안에서 앞서 신규로 추가한 행
+                existing.update(values)
             else:
-                # 신규 생성
-                new_celeb = models.MbtiCelebrity(
-                    mbti=mbti,
-                    name=row["name"],
-                    tags=tags,
-                    description=row.get("description", ""),
-                    image_url=row.get("image_url", ""),
-                )
-                db.add(new_celeb)
+                # 신규 생성 (마지막에 한 번의 다중 행 INSERT로 저장)
+                new_rows.append(values)
+                by_name[(mbti, row["name"])] = values
 
             success_count += 1
 
         except Exception as e:
             errors.append(f"{row.get('name', 'Unknown')}: {str(e)}")
 
+    if new_rows:
+        db.execute(models.MbtiCelebrity.__table__.insert(), new_rows)
+    crud.bump_resource_versions(db, [crud.CELEBRITIES_VERSION_KEY])
     db.commit()
 
     return {"message": f"{success_count}건 처리 완료", "errors": errors}
@@ -455,7 +627,7 @@ def admin_get_celebrities(
     mbti: str = Query(default=None),
     name: str = Query(default=None),
     tag: str = Query(default=None),
-    admin_user: models.User = Depends(get_admin_user),
+    admin_user: UserPrincipal = Depends(get_admin_user),
     db: Session = Depends(get_db),
 ):
     """유명인 목록 조회"""
@@ -500,7 +672,7 @@ def admin_get_celebrities(
 @router.get("/celebrities/{celebrity_id}")
 def admin_get_celebrity(
     celebrity_id: int,
-    admin_user: models.User = Depends(get_admin_user),
+    admin_user: UserPrincipal = Depends(get_admin_user),
     db: Session = Depends(get_db),
 ):
     """유명인 상세 조회"""
@@ -527,7 +699,7 @@ def admin_get_celebrity(
 @router.post("/celebrities")
 def admin_create_celebrity(
     celebrity_data: schemas.CelebrityCreate,
-    admin_user: models.User = Depends(get_admin_user),
+    admin_user: UserPrincipal = Depends(get_admin_user),
     db: Session = Depends(get_db),
 ):
     """유명인 추가"""
@@ -544,6 +716,7 @@ def admin_create_celebrity(
     )
 
     db.add(new_celebrity)
+    crud.bump_resource_versions(db, [crud.CELEBRITIES_VERSION_KEY])
     db.commit()
     db.refresh(new_celebrity)
 
@@ -554,7 +727,7 @@ def admin_create_celebrity(
 def admin_update_celebrity(
     celebrity_id: int,
     update_data: schemas.CelebrityUpdate,
-    admin_user: models.User = Depends(get_admin_user),
+    admin_user: UserPrincipal = Depends(get_admin_user),
     db: Session = Depends(get_db),
 ):
     """유명인 수정"""
@@ -583,6 +756,7 @@ def admin_update_celebrity(
     if update_data.image_url is not None:
         celebrity.image_url = update_data.image_url
 
+    crud.bump_resource_versions(db, [crud.CELEBRITIES_VERSION_KEY])
     db.commit()
     db.refresh(celebrity)
 
@@ -592,7 +766,7 @@ def admin_update_celebrity(
 @router.delete("/celebrities/{celebrity_id}")
 def admin_delete_celebrity(
     celebrity_id: int,
-    admin_user: models.User = Depends(get_admin_user),
+    admin_user: UserPrincipal = Depends(get_admin_user),
     db: Session = Depends(get_db),
 ):
     """유명인 삭제"""
@@ -606,6 +780,7 @@ def admin_delete_celebrity(
         raise HTTPException(status_code=404, detail="유명인을 찾을 수 없습니다.")
 
     db.delete(celebrity)
+    crud.bump_resource_versions(db, [crud.CELEBRITIES_VERSION_KEY])
     db.commit()
 
     return {"message": "유명인이 삭제되었습니다."}
@@ -1,13 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from datetime import date
 import json
 import random
 
 from database import get_db
-from core.security import get_current_user
+from core.security import get_current_user, UserPrincipal
+from core.cache import analysis_cache
+from core.http_cache import make_etag, check_not_modified
+from core.write_behind import analysis_write_buffer
+from core.profiling import span
+from algorithm import active_algorithm
 import models
 import logic
+import crud
 import schemas
 
 router = APIRouter(prefix="/api/analyze", tags=["분석"])
@@ -96,53 +102,37 @@ def celebrity_to_dict(celebrity) -> dict:
     },
 )
 def analyze_today(
+    request: Request,
+    response: Response,
     include_tags: str = Query(default=None, description="포함할 태그 (콤마 구분)"),
-    current_user: models.User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """오늘의 분석"""
-    # 내 생일 사주 조회
-    birth_row = (
-        db.query(models.Saju)
-        .filter(models.Saju.solar_date == current_user.birthdate)
-        .first()
-    )
-
-    # 오늘 날짜 사주 조회
     today_str = date.today().isoformat()
-    today_row = (
-        db.query(models.Saju).filter(models.Saju.solar_date == today_str).first()
-    )
-
-    if not birth_row or not today_row:
-        raise HTTPException(status_code=404, detail="사주 데이터 없음")
-
-    # 사주 변환
-    def row_to_saju(row):
-        y = logic.parse_ganji_to_index(row.year_ganji)
-        m = logic.parse_ganji_to_index(row.month_ganji)
-        d = logic.parse_ganji_to_index(row.day_ganji)
-        return [y[0], y[1], m[0], m[1], d[0], d[1]]
-
-    birth_saju = row_to_saju(birth_row)
-    today_saju = row_to_saju(today_row)
-
-    birth_prof = logic.saju_to_profile(birth_saju)
-    today_prof = logic.saju_to_profile(today_saju)
-    combined = logic.combine_profiles(birth_prof, today_prof, birth_weight=0.4)
-
-    axes_base = logic.profile_to_axes(combined)
-    axes = logic.apply_daily_rotation(axes_base, today_saju)
-
-    my_mbti = logic.axes_to_mbti(axes)
-    partner_mbti = logic.get_destiny_partner(axes)
-
-    p_text, d_text = logic.generate_explanation(
-        combined, axes, my_mbti, partner_mbti, today_saju
-    )
+    algorithm = active_algorithm(db)
+
+    # 생일/날짜/알고리즘/필터와 분석 결과·유명인 버전이 같으면 클라이언트 캐시 재사용 (304)
+    etag = _today_etag(db, current_user, today_str, algorithm, include_tags)
+    not_modified = check_not_modified(request, response, etag)
+    if not_modified:
+        return not_modified
+
+    # 같은 생일/날짜/알고리즘이면 결과가 같으므로 캐시된 결과 재사용 (재계산·DB 저장 생략)
+    cache_key = (current_user.birthdate, today_str, algorithm.version)
+    cached = analysis_cache.get(current_user.username)
+    if cached and cached[0] == cache_key:
+        result = cached[1]
+    else:
+        result = _load_or_compute(db, current_user, today_str, algorithm)
+        analysis_cache.set(current_user.username, (cache_key, result))
+        # 방금 저장했다면 분석 결과 버전이 올라갔으므로 저장 후 버전으로 ETag 갱신
+        response.headers["ETag"] = _today_etag(
+            db, current_user, today_str, algorithm, include_tags
+        )
 
-    lucky_element_key = max(combined["elements"], key=combined["elements"].get)
-    partner_axes = logic.get_compatibility_details(axes)
+    my_mbti = result["my_persona"]
+    partner_mbti = result["my_destiny"]
 
     # ✅ 태그 파싱
     tag_list = None
@@ -150,55 +140,101 @@ def analyze_today(
         tag_list = [t.strip() for t in include_tags.split(",") if t.strip()]
 
     # ✅ 유명인 매칭 (태그 필터 적용)
-    my_celebrity = get_random_celebrity(db, my_mbti, include_tags=tag_list)
-    partner_celebrity = get_random_celebrity(db, partner_mbti, include_tags=tag_list)
-
-    # DB에 저장
-    existing_result = (
-        db.query(models.AnalysisResult)
-        .filter(
-            models.AnalysisResult.username == current_user.username,
-            models.AnalysisResult.analysis_date == today_str,
-        )
-        .first()
-    )
-
-    if existing_result:
-        existing_result.my_persona = my_mbti
-        existing_result.my_destiny = partner_mbti
-        existing_result.lucky_element = logic.ELEMENT_KO[lucky_element_key][0]
-        existing_result.persona_description = p_text
-        existing_result.destiny_description = d_text
-        existing_result.axes_data = json.dumps(axes)
-    else:
-        new_result = models.AnalysisResult(
-            username=current_user.username,
-            analysis_date=today_str,
-            my_persona=my_mbti,
-            my_destiny=partner_mbti,
-            lucky_element=logic.ELEMENT_KO[lucky_element_key][0],
-            persona_description=p_text,
-            destiny_description=d_text,
-            axes_data=json.dumps(axes),
+    with span("celebrity"):
+        my_celebrity = get_random_celebrity(db, my_mbti, include_tags=tag_list)
+        partner_celebrity = get_random_celebrity(
+            db, partner_mbti, include_tags=tag_list
         )
-        db.add(new_result)
-
-    db.commit()
 
     return {
         "my_persona": my_mbti,
         "my_destiny": partner_mbti,
-        "lucky_element": logic.ELEMENT_KO[lucky_element_key][0],
+        "lucky_element": result["lucky_element"],
         "persona_data": {
             "mbti": my_mbti,
-            "description": p_text,
-            "axes": axes,
+            "description": result["persona_description"],
+            "axes": result["axes"],
             "celebrity": celebrity_to_dict(my_celebrity),
         },
         "destiny_data": {
             "mbti": partner_mbti,
-            "description": d_text,
-            "axes": partner_axes,
+            "description": result["destiny_description"],
+            "axes": result["partner_axes"],
             "celebrity": celebrity_to_dict(partner_celebrity),
         },
     }
+
+
+def _today_etag(
+    db: Session,
+    current_user: UserPrincipal,
+    today_str: str,
+    algorithm: logic.AlgorithmParams,
+    include_tags: str,
+) -> str:
+    """오늘의 분석 ETag (관리자 수정·유명인 변경 시 버전이 바뀌어 재검증에 실패)"""
+    analysis_key = crud.analysis_version_key(current_user.username)
+    versions = crud.get_resource_versions(
+        db, [analysis_key, crud.CELEBRITIES_VERSION_KEY]
+    )
+    return make_etag(
+        "today",
+        current_user.username,
+        current_user.birthdate,
+        today_str,
+        algorithm.version,
+        versions[analysis_key],
+        versions[crud.CELEBRITIES_VERSION_KEY],
+        include_tags or "",
+    )
+
+
+def _load_or_compute(
+    db: Session,
+    current_user: UserPrincipal,
+    today_str: str,
+    algorithm: logic.AlgorithmParams,
+):
+    """저장된(야간 배치로 미리 계산된) 오늘 결과가 있으면 그대로 사용, 없으면 계산"""
+    with span("saved"):
+        saved = crud.get_analysis_result(db, current_user.username, today_str)
+    # 다른 알고리즘 버전으로 계산됐거나 axes가 없는 행은 다시 계산
+    if (
+        saved is not None
+        and saved.axes_data
+        and saved.algorithm_version == algorithm.version
+    ):
+        return crud.analysis_from_row(saved)
+    return _compute_and_save(db, current_user, today_str, algorithm)
+
+
+def _compute_and_save(
+    db: Session,
+    current_user: UserPrincipal,
+    today_str: str,
+    algorithm: logic.AlgorithmParams,
+):
+    """오늘의 분석 결과를 계산하고 DB에 저장"""
+    # 내 생일 / 오늘 날짜 사주 조회 (바이너리 파일이 있으면 DB를 거치지 않음)
+    with span("saju"):
+        saju_map = crud.get_saju_map(db, [current_user.birthdate, today_str])
+    birth_saju = saju_map.get(current_user.birthdate)
+    today_saju = saju_map.get(today_str)
+
+    if birth_saju is None or today_saju is None:
+        raise HTTPException(status_code=404, detail="사주 데이터 없음")
+
+    with span("pipeline"):
+        result = logic.analyze_daily(birth_saju, today_saju, algorithm)
+
+    # DB에 저장 (username, analysis_date 기준 단일 upsert)
+    result_row = crud.analysis_row(current_user.username, today_str, result)
+    with span("commit"):
+        if analysis_write_buffer.running:
+            # write-behind: 백그라운드 스레드가 일괄 저장
+            analysis_write_buffer.add(result_row)
+        else:
+            crud.upsert_analysis_results(db, [result_row])
+            db.commit()
+
+    return result
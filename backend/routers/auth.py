@@ -4,7 +4,7 @@ from sqlalchemy.orm import Session
 
 # config가 먼저 로드되도록 (database보다 앞에)
 from core.security import (
-    verify_password,
+    verify_and_update_password,
     get_password_hash,
     create_access_token,
     add_token_to_blacklist,
@@ -12,21 +12,21 @@ from core.security import (
 )
 from database import get_db
 import models
+import saju_calendar
 import schemas
 
 router = APIRouter(prefix="/api", tags=["인증"])
 
 
 def validate_birthdate(date_str: str):
-    """생년월일 유효성 검사"""
-    try:
-        year = int(date_str.split("-")[0])
-        if not (1950 <= year <= 2050):
-            raise ValueError
-    except:
+    """생년월일 유효성 검사 (사주를 계산할 수 있는 날짜인지)"""
+    if not saju_calendar.is_supported_date(date_str):
         raise HTTPException(
             status_code=400,
-            detail="생년월일은 1950~2050년 사이여야 합니다.",
+            detail=(
+                f"생년월일은 {saju_calendar.MIN_DATE.year}~"
+                f"{saju_calendar.MAX_DATE.year}년 사이의 YYYY-MM-DD 형식이어야 합니다."
+            ),
         )
 
 
@@ -85,9 +85,20 @@ def login(
         db.query(models.User).filter(models.User.username == form_data.username).first()
     )
 
-    if not db_user or not verify_password(form_data.password, db_user.hashed_password):
+    if not db_user:
         raise HTTPException(status_code=401, detail="아이디 또는 비밀번호 오류")
 
+    verified, new_hash = verify_and_update_password(
+        form_data.password, db_user.hashed_password
+    )
+    if not verified:
+        raise HTTPException(status_code=401, detail="아이디 또는 비밀번호 오류")
+
+    # 해시 비용이 바뀌었으면 로그인 시점에 새 비용으로 재저장
+    if new_hash:
+        db_user.hashed_password = new_hash
+        db.commit()
+
     access_token = create_access_token(data={"sub": db_user.username})
     return {"access_token": access_token, "token_type": "bearer"}
 
@@ -1,25 +1,56 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Path
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Request, Response
 from sqlalchemy.orm import Session
-from datetime import datetime
+from datetime import date, datetime
 import json
 
 from database import get_db
-from core.security import get_current_user
+from core.security import get_current_user, UserPrincipal
+from core.http_cache import make_etag, check_not_modified
 import models
+import crud
 
 router = APIRouter(prefix="/api/calendar", tags=["캘린더"])
 
 
+def _check_not_modified(request: Request, response: Response, db: Session, username):
+    """
+    유저의 분석 결과 버전으로 조건부 요청 처리 (변경 없으면 304 응답 반환)
+    - 미리 계산된 다음 날 결과는 날짜가 바뀌어야 보이므로 오늘 날짜도 ETag에 포함
+    """
+    version, updated_at = crud.get_resource_version(
+        db, crud.analysis_version_key(username)
+    )
+    etag = make_etag(
+        "calendar",
+        username,
+        version,
+        date.today().isoformat(),
+        request.url.path,
+        request.url.query,
+    )
+    return check_not_modified(request, response, etag, updated_at)
+
+
 @router.get("/history")
 def get_analysis_history(
+    request: Request,
+    response: Response,
     limit: int = Query(default=30, ge=1, le=100),
-    current_user: models.User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """분석 결과 히스토리 조회"""
+    not_modified = _check_not_modified(request, response, db, current_user.username)
+    if not_modified:
+        return not_modified
+
     results = (
         db.query(models.AnalysisResult)
-        .filter(models.AnalysisResult.username == current_user.username)
+        .filter(
+            models.AnalysisResult.username == current_user.username,
+            # 야간 배치로 미리 계산된 미래 날짜 결과는 제외
+            models.AnalysisResult.analysis_date <= date.today().isoformat(),
+        )
         .order_by(models.AnalysisResult.analysis_date.desc())
         .limit(limit)
         .all()
@@ -40,8 +71,10 @@ def get_analysis_history(
 
 @router.get("/detail")
 def get_calendar_date(
+    request: Request,
+    response: Response,
     date_str: str = Query(..., description="조회할 날짜 (YYYY-MM-DD)"),
-    current_user: models.User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """특정 날짜의 분석 결과 상세 조회"""
@@ -49,6 +82,12 @@ def get_calendar_date(
         datetime.strptime(date_str, "%Y-%m-%d")
     except ValueError:
         raise HTTPException(status_code=400, detail="날짜 형식이 올바르지 않습니다.")
+    if date_str > date.today().isoformat():
+        raise HTTPException(status_code=404, detail="해당 날짜의 분석 결과가 없습니다.")
+
+    not_modified = _check_not_modified(request, response, db, current_user.username)
+    if not_modified:
+        return not_modified
 
     result = (
         db.query(models.AnalysisResult)
@@ -77,12 +116,18 @@ def get_calendar_date(
 
 @router.get("/month/{year}/{month}")
 def get_calendar_month(
+    request: Request,
+    response: Response,
     year: int = Path(..., ge=1950, le=2100),
     month: int = Path(..., ge=1, le=12),
-    current_user: models.User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """특정 월의 분석 결과 목록 조회"""
+    not_modified = _check_not_modified(request, response, db, current_user.username)
+    if not_modified:
+        return not_modified
+
     start_date = f"{year:04d}-{month:02d}-01"
     if month == 12:
         end_date = f"{year + 1:04d}-01-01"
@@ -95,6 +140,7 @@ def get_calendar_month(
             models.AnalysisResult.username == current_user.username,
             models.AnalysisResult.analysis_date >= start_date,
             models.AnalysisResult.analysis_date < end_date,
+            models.AnalysisResult.analysis_date <= date.today().isoformat(),
         )
         .all()
     )
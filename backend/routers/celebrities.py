@@ -1,18 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 import json
 import random
 
 from database import get_db
+from core.http_cache import make_etag, check_not_modified, PUBLIC_SHORT
 import models
+import crud
 
 router = APIRouter(prefix="/api/celebrities", tags=["유명인"])
 
 
+def _check_not_modified(request: Request, response: Response, db: Session):
+    """유명인 데이터 버전으로 조건부 요청 처리 (변경 없으면 304 응답 반환)"""
+    version, updated_at = crud.get_resource_version(db, crud.CELEBRITIES_VERSION_KEY)
+    etag = make_etag("celebrities", version, request.url.path)
+    return check_not_modified(request, response, etag, updated_at, PUBLIC_SHORT)
+
+
 @router.get("/tags/all")
-def get_all_tags(db: Session = Depends(get_db)):
+def get_all_tags(request: Request, response: Response, db: Session = Depends(get_db)):
     """모든 유명인의 태그 목록 조회 (중복 제거)"""
+    not_modified = _check_not_modified(request, response, db)
+    if not_modified:
+        return not_modified
+
     celebrities = db.query(models.MbtiCelebrity).all()
 
     all_tags = set()
@@ -99,6 +112,8 @@ def get_celebrity_by_mbti(
 
 @router.get("/{mbti}/all")
 def get_all_celebrities_by_mbti(
+    request: Request,
+    response: Response,
     mbti: str,
     db: Session = Depends(get_db),
 ):
@@ -108,6 +123,10 @@ def get_all_celebrities_by_mbti(
     if len(mbti) != 4 or not all(c in "EISNTFJP" for c in mbti):
         raise HTTPException(status_code=400, detail="유효하지 않은 MBTI 유형입니다.")
 
+    not_modified = _check_not_modified(request, response, db)
+    if not_modified:
+        return not_modified
+
     celebrities = (
         db.query(models.MbtiCelebrity).filter(models.MbtiCelebrity.mbti == mbti).all()
     )
@@ -73,6 +73,8 @@ def get_monthly_stats(
         .filter(
             models.AnalysisResult.analysis_date >= start_date,
             models.AnalysisResult.analysis_date < end_date,
+            # 야간 배치로 미리 계산된 미래 날짜 결과는 제외
+            models.AnalysisResult.analysis_date <= date.today().isoformat(),
         )
         .all()
     )
@@ -127,7 +129,11 @@ def get_monthly_stats(
 @router.get("/all-time")
 def get_all_time_stats(db: Session = Depends(get_db)):
     """전체 기간 통계 조회"""
-    results = db.query(models.AnalysisResult).all()
+    results = (
+        db.query(models.AnalysisResult)
+        .filter(models.AnalysisResult.analysis_date <= date.today().isoformat())
+        .all()
+    )
 
     if not results:
         return {
@@ -1,29 +1,52 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
+from datetime import date
 
 from database import get_db
-from core.security import get_current_user, verify_password, get_password_hash
+from core.security import (
+    get_current_user,
+    verify_password,
+    get_password_hash,
+    invalidate_user_cache,
+    UserPrincipal,
+)
+from core.accounts import remove_users
+from core.cache import analysis_cache
+from core.write_behind import analysis_write_buffer
 import models
+import saju_calendar
 import schemas
+import crud
 
 router = APIRouter(prefix="/api/users", tags=["사용자"])
 
 
+def get_db_user(db: Session, current_user: UserPrincipal) -> models.User:
+    """수정용 User 객체 조회 (인증 캐시의 UserPrincipal은 세션과 분리되어 있음)"""
+    user = (
+        db.query(models.User)
+        .filter(models.User.username == current_user.username)
+        .first()
+    )
+    if user is None:
+        raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
+    return user
+
+
 def validate_birthdate(date_str: str):
-    """생년월일 유효성 검사"""
-    try:
-        year = int(date_str.split("-")[0])
-        if not (1950 <= year <= 2050):
-            raise ValueError
-    except:
+    """생년월일 유효성 검사 (사주를 계산할 수 있는 날짜인지)"""
+    if not saju_calendar.is_supported_date(date_str):
         raise HTTPException(
             status_code=400,
-            detail="생년월일은 1950~2050년 사이여야 합니다.",
+            detail=(
+                f"생년월일은 {saju_calendar.MIN_DATE.year}~"
+                f"{saju_calendar.MAX_DATE.year}년 사이의 YYYY-MM-DD 형식이어야 합니다."
+            ),
         )
 
 
 @router.get("/me")
-def read_users_me(current_user: models.User = Depends(get_current_user)):
+def read_users_me(current_user: UserPrincipal = Depends(get_current_user)):
     """내 정보 조회"""
     return {
         "username": current_user.username,
@@ -36,18 +59,28 @@ def read_users_me(current_user: models.User = Depends(get_current_user)):
 @router.put("/profile")
 def update_profile(
     info: schemas.UserUpdate,
-    current_user: models.User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """프로필 수정"""
     validate_birthdate(info.birthdate)
 
-    current_user.nickname = info.nickname
-    current_user.birthdate = info.birthdate
-    current_user.gender = info.gender
+    user = get_db_user(db, current_user)
+    birthdate_changed = user.birthdate != info.birthdate
+    user.nickname = info.nickname
+    user.birthdate = info.birthdate
+    user.gender = info.gender
+
+    # 생년월일이 바뀌면 오늘/미리 계산된 이후 날짜의 분석 결과도 달라지므로 삭제
+    if birthdate_changed:
+        analysis_write_buffer.discard_user(user.username)
+        crud.delete_analyses_from(db, user.username, date.today().isoformat())
 
     db.commit()
-    db.refresh(current_user)
+
+    # 생년월일이 바뀌면 오늘의 분석 결과도 달라지므로 캐시 무효화
+    invalidate_user_cache(user.username)
+    analysis_cache.pop(user.username)
 
     return {"message": "프로필 업데이트 완료"}
 
@@ -55,25 +88,28 @@ def update_profile(
 @router.put("/password")
 def change_password(
     pw_data: schemas.PasswordChange,
-    current_user: models.User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """비밀번호 변경"""
-    if not verify_password(pw_data.old_password, current_user.hashed_password):
+    user = get_db_user(db, current_user)
+    if not verify_password(pw_data.old_password, user.hashed_password):
         raise HTTPException(status_code=400, detail="기존 비밀번호 불일치")
 
-    current_user.hashed_password = get_password_hash(pw_data.new_password)
+    user.hashed_password = get_password_hash(pw_data.new_password)
     db.commit()
+    invalidate_user_cache(user.username)
 
     return {"message": "비밀번호 변경 완료"}
 
 
 @router.delete("/me")
 def delete_account(
-    current_user: models.User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """계정 삭제"""
-    db.delete(current_user)
-    db.commit()
+    result = remove_users(db, [current_user.username])
+    if result["deleted_users"] == 0:
+        raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
     return {"message": "계정 삭제 완료"}
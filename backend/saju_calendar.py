@@ -0,0 +1,344 @@
+"""
+사주 간지 계산기 (saju_master_db.csv 없이 날짜 -> 연주/월주/일주)
+- 원본 데이터와 같은 규칙(한국 음력, UTC+9)으로 계산합니다.
+  - 일주: 날짜 번호(ordinal) mod 60
+  - 월주: 음력 달마다 1씩 증가 (윤달은 월주 없음)
+  - 연주: 음력 1월 1일(설날)에 바뀜
+- 음력 달 경계(합삭)와 윤달 판정용 중기(절기)는 Meeus 천문 알고리즘으로 한 번 계산해
+  표(lunar_month_table)로 만들어 두고, 날짜 범위 전체를 numpy로 한 번에 계산합니다.
+- 1950~2050년은 CSV의 모든 행과 일치함을 확인했습니다. (python saju_calendar.py)
+- numpy는 계산할 때만 import합니다. (앱 시작 시간)
+"""
+
+from datetime import date
+from functools import lru_cache
+import math
+
+# 지원 범위 (ΔT 근사식과 현재 한국 표준시 기준이 유효한 범위)
+MIN_DATE = date(1900, 1, 1)
+MAX_DATE = date(2100, 12, 31)
+
+TIMEZONE_HOURS = 9  # 한국 표준시
+MISSING = 255  # 윤달의 월주 (core.saju_file과 같은 값)
+
+# 날짜 ordinal -> 율리우스일(JDN) 차이
+_ORDINAL_TO_JDN = 1721425
+# 2000-01-06 합삭(k=0) 이후 평균 삭망월 수 / 년
+_LUNATIONS_PER_YEAR = 12.3685
+
+
+def _delta_t(year):
+    """ΔT (TT - UT, 초) 근사 (Espenak & Meeus 다항식)"""
+    import numpy as np
+
+    y = np.asarray(year, dtype=float)
+    u = (y - 1820) / 100
+    out = -20 + 32 * u**2
+    pieces = [
+        (1900, 1920, 1900, (-2.79, 1.494119, -0.0598939, 0.0061966, -0.000197)),
+        (1920, 1941, 1920, (21.20, 0.84493, -0.076100, 0.0020936)),
+        (1941, 1961, 1950, (29.07, 0.407, -1 / 233, 1 / 2547)),
+        (1961, 1986, 1975, (45.45, 1.067, -1 / 260, -1 / 718)),
+        (
+            1986,
+            2005,
+            2000,
+            (63.86, 0.3345, -0.060374, 0.0017275, 0.000651814, 0.00002373599),
+        ),
+        (2005, 2050, 2000, (62.92, 0.32217, 0.005589)),
+    ]
+    for start, end, base, coeffs in pieces:
+        t = y - base
+        value = sum(c * t**i for i, c in enumerate(coeffs))
+        out = np.where((y >= start) & (y < end), value, out)
+    late = (y >= 2050) & (y < 2150)
+    return np.where(late, -20 + 32 * u**2 - 0.5628 * (2150 - y), out)
+
+
+# 합삭 시각 보정항: (계수, E 차수, M 배수, M' 배수, F 배수)
+_NEW_MOON_TERMS = (
+    (-0.40720, 0, 0, 1, 0),
+    (0.17241, 1, 1, 0, 0),
+    (0.01608, 0, 0, 2, 0),
+    (0.01039, 0, 0, 0, 2),
+    (0.00739, 1, -1, 1, 0),
+    (-0.00514, 1, 1, 1, 0),
+    (0.00208, 2, 2, 0, 0),
+    (-0.00111, 0, 0, 1, -2),
+    (-0.00057, 0, 0, 1, 2),
+    (0.00056, 1, 1, 2, 0),
+    (-0.00042, 0, 0, 3, 0),
+    (0.00042, 1, 1, 0, 2),
+    (0.00038, 1, 1, 0, -2),
+    (-0.00024, 1, -1, 2, 0),
+    (-0.00007, 0, 2, 1, 0),
+    (0.00004, 0, 0, 2, -2),
+    (0.00004, 0, 3, 0, 0),
+    (0.00003, 0, 1, 1, -2),
+    (0.00003, 0, 0, 2, 2),
+    (-0.00003, 0, 1, 1, 2),
+    (0.00003, 0, -1, 1, 2),
+    (-0.00002, 0, -1, 1, -2),
+    (-0.00002, 0, 1, 3, 0),
+    (0.00002, 0, 0, 4, 0),
+)
+
+# 행성 섭동 보정항: (A0, k 계수, 진폭)
+_PLANETARY_TERMS = (
+    (251.88, 0.016321, 0.000165),
+    (251.83, 26.651886, 0.000164),
+    (349.42, 36.412478, 0.000126),
+    (84.66, 18.206239, 0.000110),
+    (141.74, 53.303771, 0.000062),
+    (207.14, 2.453732, 0.000060),
+    (154.84, 7.306860, 0.000056),
+    (34.52, 27.261239, 0.000047),
+    (207.19, 0.121824, 0.000042),
+    (291.34, 1.844379, 0.000040),
+    (161.72, 24.198154, 0.000037),
+    (239.56, 25.513099, 0.000035),
+    (331.55, 3.592518, 0.000023),
+)
+
+
+def _new_moon_jde(k):
+    """k번째 합삭 시각 (JDE, Meeus 49장), k=0은 2000-01-06"""
+    import numpy as np
+
+    k = np.asarray(k, dtype=float)
+    t = k / 1236.85
+    jde = (
+        2451550.09766
+        + 29.530588861 * k
+        + 0.00015437 * t**2
+        - 0.000000150 * t**3
+        + 0.00000000073 * t**4
+    )
+    e = 1 - 0.002516 * t - 0.0000074 * t**2
+    m = np.radians(2.5534 + 29.10535670 * k - 0.0000014 * t**2 - 0.00000011 * t**3)
+    mp = np.radians(
+        201.5643
+        + 385.81693528 * k
+        + 0.0107582 * t**2
+        + 0.00001238 * t**3
+        - 0.000000058 * t**4
+    )
+    f = np.radians(
+        160.7108
+        + 390.67050284 * k
+        - 0.0016118 * t**2
+        - 0.00000227 * t**3
+        + 0.000000011 * t**4
+    )
+    omega = np.radians(124.7746 - 1.56375588 * k + 0.0020672 * t**2)
+
+    for coeff, e_power, cm, cmp, cf in _NEW_MOON_TERMS:
+        jde = jde + coeff * e**e_power * np.sin(cm * m + cmp * mp + cf * f)
+    jde = jde - 0.00017 * np.sin(omega)
+    jde = jde + 0.000325 * np.sin(np.radians(299.77 + 0.107408 * k - 0.009173 * t**2))
+    for a0, ak, amplitude in _PLANETARY_TERMS:
+        jde = jde + amplitude * np.sin(np.radians(a0 + ak * k))
+    return jde
+
+
+def _sun_longitude(jde):
+    """태양 겉보기 황경 (도, Meeus 25장 저정밀도 식, 오차 약 0.01도)"""
+    import numpy as np
+
+    t = (jde - 2451545.0) / 36525
+    l0 = 280.46646 + 36000.76983 * t + 0.0003032 * t**2
+    m = np.radians(357.52911 + 35999.05029 * t - 0.0001537 * t**2)
+    c = (
+        (1.914602 - 0.004817 * t - 0.000014 * t**2) * np.sin(m)
+        + (0.019993 - 0.000101 * t) * np.sin(2 * m)
+        + 0.000289 * np.sin(3 * m)
+    )
+    omega = np.radians(125.04 - 1934.136 * t)
+    return (l0 + c - 0.00569 - 0.00478 * np.sin(omega)) % 360
+
+
+def _solar_term_jde(n):
+    """n번째 중기(태양 황경 30도 배수) 시각 (JDE), n=0은 2000년 춘분"""
+    import numpy as np
+
+    n = np.asarray(n)
+    angle = (n * 30) % 360
+    jde = 2451623.8 + n * 365.2422 / 12
+    for _ in range(6):
+        jde = jde + 58.13 * np.sin(np.radians(angle - _sun_longitude(jde)))
+    return jde, angle
+
+
+def _jde_to_local_ordinal(jde):
+    """JDE -> 한국 표준시 기준 날짜 ordinal"""
+    import numpy as np
+
+    year = 2000 + (jde - 2451545.0) / 365.25
+    jd = jde - _delta_t(year) / 86400 + TIMEZONE_HOURS / 24
+    return np.floor(jd + 0.5).astype(np.int64) - _ORDINAL_TO_JDN
+
+
+@lru_cache(maxsize=1)
+def lunar_month_table():
+    """
+    지원 범위의 음력 달 경계 표 (프로세스당 한 번 계산)
+    -> (시작 날짜 ordinal, 음력 월 1~12, 윤달 여부, 음력 연도) numpy 배열
+    - 동지가 든 달을 11월로 두고, 다음 동지 달까지 13개월이면
+      중기가 없는 첫 달을 윤달로 정합니다.
+    """
+    import numpy as np
+
+    first_year, last_year = MIN_DATE.year - 1, MAX_DATE.year + 1
+    ks = np.arange(
+        math.floor((first_year - 2000) * _LUNATIONS_PER_YEAR),
+        math.ceil((last_year + 1 - 2000) * _LUNATIONS_PER_YEAR) + 1,
+    )
+    starts = _jde_to_local_ordinal(_new_moon_jde(ks))
+
+    ns = np.arange((first_year - 2000) * 12 - 3, (last_year + 1 - 2000) * 12 + 3)
+    term_jde, angles = _solar_term_jde(ns)
+    term_month = np.searchsorted(starts, _jde_to_local_ordinal(term_jde), "right") - 1
+    valid = (term_month >= 0) & (term_month < len(starts) - 1)
+    has_term = np.zeros(len(starts), dtype=bool)
+    has_term[term_month[valid]] = True
+
+    solstice_months = term_month[valid & (angles == 270)]
+    month_no = np.zeros(len(starts), dtype=np.int64)
+    leap = np.zeros(len(starts), dtype=bool)
+    for a, b in zip(solstice_months[:-1], solstice_months[1:]):
+        leap_at = -1
+        if b - a == 13:
+            no_term = np.flatnonzero(~has_term[a + 1 : b])
+            if len(no_term):
+                leap_at = a + 1 + no_term[0]
+        number = 10
+        for j in range(a, b):
+            if j == leap_at:
+                leap[j] = True
+            else:
+                number = number % 12 + 1
+            month_no[j] = number
+
+    # 표의 앞뒤(첫 동지 이전, 마지막 동지 이후)는 번호가 없으므로 잘라냄
+    numbered = np.flatnonzero(month_no)
+    keep = slice(numbered[0], numbered[-1] + 1)
+    starts, month_no, leap = starts[keep], month_no[keep], leap[keep]
+
+    # 11·12월(윤달 포함)이 해를 넘겨 시작하면 전년도 음력
+    start_years = np.array(
+        [date.fromordinal(int(s)).year for s in starts], dtype=np.int64
+    )
+    start_months = np.array(
+        [date.fromordinal(int(s)).month for s in starts], dtype=np.int64
+    )
+    lunar_year = start_years - ((month_no >= 11) & (start_months < 6))
+    return starts, month_no, leap, lunar_year
+
+
+def pillars_for_ordinals(ordinals):
+    """
+    날짜 ordinal 배열 -> (연주, 월주, 일주) 60갑자 인덱스 uint8 배열
+    - 윤달의 월주는 MISSING, 지원 범위 밖의 날짜는 ValueError
+    """
+    import numpy as np
+
+    ordinals = np.asarray(ordinals, dtype=np.int64)
+    if len(ordinals) and (
+        ordinals.min() < MIN_DATE.toordinal() or ordinals.max() > MAX_DATE.toordinal()
+    ):
+        raise ValueError(f"지원 범위({MIN_DATE}~{MAX_DATE}) 밖의 날짜입니다.")
+
+    starts, month_no, leap, lunar_year = lunar_month_table()
+    month = np.searchsorted(starts, ordinals, "right") - 1
+    year_pillar = (lunar_year[month] - 4) % 60
+    # 1950년 음력 1월이 무인(戊寅, 14)월: 12 * 1950 ≡ 0 (mod 60)
+    month_pillar = np.where(
+        leap[month], MISSING, (12 * lunar_year[month] + month_no[month] + 13) % 60
+    )
+    # 1950-01-01(ordinal 711858)이 병신(丙申, 32)일
+    day_pillar = (ordinals + 14) % 60
+    return (
+        year_pillar.astype(np.uint8),
+        month_pillar.astype(np.uint8),
+        day_pillar.astype(np.uint8),
+    )
+
+
+def pillars_for_range(start: date, end: date):
+    """start~end(포함) 모든 날짜의 (연주, 월주, 일주) 배열"""
+    import numpy as np
+
+    return pillars_for_ordinals(np.arange(start.toordinal(), end.toordinal() + 1))
+
+
+def get_pillars(date_str: str):
+    """날짜 -> (연주, 월주, 일주) 60갑자 인덱스, 형식 오류/지원 범위 밖이면 None"""
+    try:
+        day = date.fromisoformat(date_str)
+    except (TypeError, ValueError):
+        return None
+    if not MIN_DATE <= day <= MAX_DATE:
+        return None
+    year, month, day_ = pillars_for_ordinals([day.toordinal()])
+    return int(year[0]), int(month[0]), int(day_[0])
+
+
+def get_saju(date_str: str):
+    """날짜 -> [연간, 연지, 월간, 월지, 일간, 일지], 지원 범위 밖이면 None"""
+    from core.saju_file import pillar_to_indices
+
+    pillars = get_pillars(date_str)
+    if pillars is None:
+        return None
+    return [i for p in pillars for i in pillar_to_indices(p)]
+
+
+def is_supported_date(date_str: str) -> bool:
+    """
+    0을 채운 YYYY-MM-DD 형식이고 지원 범위 안의 날짜인지
+    - fromisoformat은 19900505, 1990-W01-1 같은 다른 ISO 형식도 받으므로
+      길이와 다시 만든 문자열이 같은지도 확인 (저장/조회 키가 항상 같은 형식이 되도록)
+    """
+    if not isinstance(date_str, str) or len(date_str) != 10:
+        return False
+    try:
+        day = date.fromisoformat(date_str)
+    except ValueError:
+        return False
+    return day.isoformat() == date_str and MIN_DATE <= day <= MAX_DATE
+
+
+if __name__ == "__main__":
+    # CSV 전체 행과 계산 결과 비교
+    import time
+
+    import numpy as np
+
+    from core.saju_file import PILLAR_NAMES
+    from saju_loader import DEFAULT_CSV_PATH, read_saju_csv
+
+    df = read_saju_csv(DEFAULT_CSV_PATH)
+    ordinals = np.array([date.fromisoformat(d).toordinal() for d in df["solar_date"]])
+
+    started = time.perf_counter()
+    lunar_month_table()
+    table_elapsed = time.perf_counter() - started
+    started = time.perf_counter()
+    pillars = pillars_for_ordinals(ordinals)
+    elapsed = time.perf_counter() - started
+
+    names = np.array(PILLAR_NAMES + [None] * (256 - 60), dtype=object)
+    mismatched = 0
+    for col, pillar in zip(("year_ganji", "month_ganji", "day_ganji"), pillars):
+        expected = df[col].to_numpy(dtype=object)
+        diff = np.flatnonzero(names[pillar] != expected)
+        mismatched += len(diff)
+        for i in diff[:5]:
+            print(
+                f"❌ {df['solar_date'][i]} {col}: {names[pillar[i]]} != {expected[i]}"
+            )
+
+    print(
+        f"📊 {len(df)}일 비교, 불일치 {mismatched}건 "
+        f"(달 경계 표 {table_elapsed * 1000:.0f} ms, 계산 {elapsed * 1000:.1f} ms)"
+    )
@@ -0,0 +1,260 @@
+"""
+사주 데이터(saju_master_db.csv) 대량 적재
+- CSV 전체를 한 번에 벡터 연산으로 검증한 뒤, DB별 가장 빠른 경로로 적재합니다.
+  - PostgreSQL: COPY FROM STDIN
+  - SQLite: 한 트랜잭션 안에서 executemany (적재 동안만 PRAGMA 조정)
+- 파일 체크섬을 schema_meta에 기록해, 같은 파일이면 다시 적재하지 않습니다.
+- CSV를 날짜당 3바이트의 바이너리 파일(core.saju_file)로 변환할 수 있고,
+  바이너리 파일이 같은 CSV로 만들어졌으면 CSV 대신 그 파일에서 적재합니다.
+
+사용법:
+    python saju_loader.py [csv_path] [--force] [--build-bin]
+"""
+
+import argparse
+import csv
+import hashlib
+import io
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+# config가 먼저 로드되도록
+from core.config import BASE_DIR, settings
+from core import saju_file
+from migrations import get_meta, set_meta
+import logic
+import models
+
+DEFAULT_CSV_PATH = BASE_DIR / "data" / "saju_master_db.csv"
+CHECKSUM_KEY = "saju_checksum"
+COLUMNS = ("solar_date", "year_ganji", "month_ganji", "day_ganji")
+
+# "갑자(甲子)" 형식
+GANJI_PATTERN = "[%s][%s]\\([^()]{2}\\)" % (
+    "".join(logic.SKY_MAP),
+    "".join(logic.EARTH_MAP),
+)
+
+# 오류 메시지에 포함할 최대 행 수
+MAX_REPORTED_ROWS = 5
+
+
+def file_checksum(path) -> str:
+    """파일 SHA-256 (1MB 단위로 읽음)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_saju_csv(path) -> pd.DataFrame:
+    """
+    CSV 읽기 + 검증 (행 단위 반복 없이 컬럼 단위로 검사)
+    - 날짜 형식/중복, 간지 형식을 확인하고 문제가 있으면 ValueError
+    - month_ganji는 원본 데이터에 빈 값이 있어 비어 있는 것을 허용합니다. (NULL로 저장)
+    """
+    df = pd.read_csv(path, dtype=str, encoding="utf-8-sig", keep_default_na=False)
+    missing = [c for c in COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"CSV에 필요한 컬럼이 없습니다: {', '.join(missing)}")
+    df = df[list(COLUMNS)]
+    for col in COLUMNS:
+        df[col] = df[col].str.strip()
+
+    errors = []
+
+    def check(mask, message):
+        if mask.any():
+            lines = (df.index[mask][:MAX_REPORTED_ROWS] + 2).tolist()
+            errors.append(f"{message} ({int(mask.sum())}행, 예: {lines}행)")
+
+    dates = pd.to_datetime(df["solar_date"], format="%Y-%m-%d", errors="coerce")
+    check(dates.isna(), "solar_date 형식 오류")
+    check(df["solar_date"].duplicated(keep=False), "solar_date 중복")
+    check(~df["year_ganji"].str.fullmatch(GANJI_PATTERN), "year_ganji 형식 오류")
+    check(~df["day_ganji"].str.fullmatch(GANJI_PATTERN), "day_ganji 형식 오류")
+    month = df["month_ganji"]
+    check((month != "") & ~month.str.fullmatch(GANJI_PATTERN), "month_ganji 형식 오류")
+    if errors:
+        raise ValueError("사주 CSV 검증 실패: " + "; ".join(errors))
+
+    # NaN이 아닌 None으로 (COPY/INSERT 시 NULL)
+    df["month_ganji"] = month.astype(object).where(month != "", None)
+    return df
+
+
+def build_saju_file(csv_path=DEFAULT_CSV_PATH, bin_path=None, df=None) -> int:
+    """
+    CSV -> 사주 바이너리 파일 변환 후 날짜 수를 반환
+    - 간지 문자열을 60갑자 인덱스로 바꾼 뒤, 다시 문자열로 되돌려 원본과 같은지 확인합니다.
+    - df: 이미 read_saju_csv로 읽은 데이터가 있으면 전달 (다시 읽지 않음)
+    """
+    bin_path = bin_path or settings.SAJU_BIN_PATH
+    checksum = file_checksum(csv_path)
+    if df is None:
+        df = read_saju_csv(csv_path)
+
+    lookup = np.full((10, 12), saju_file.MISSING, dtype=np.uint8)
+    for i in range(60):
+        lookup[i % 10, i % 12] = i
+    stems = {c: i for i, c in enumerate(saju_file.STEMS_KO)}
+    branches = {c: i for i, c in enumerate(saju_file.BRANCHES_KO)}
+    names = np.array(saju_file.PILLAR_NAMES + [""] * (256 - 60), dtype=object)
+
+    pillars = []
+    for col in ("year_ganji", "month_ganji", "day_ganji"):
+        values = df[col].fillna("")
+        stem = values.str[0].map(stems)
+        branch = values.str[1].map(branches)
+        present = (values != "").to_numpy()
+        pillar = np.full(len(df), saju_file.MISSING, dtype=np.uint8)
+        pillar[present] = lookup[
+            stem[present].astype(int).to_numpy(), branch[present].astype(int).to_numpy()
+        ]
+        mismatch = names[pillar] != values.to_numpy(dtype=object)
+        if mismatch.any():
+            lines = (np.flatnonzero(mismatch)[:MAX_REPORTED_ROWS] + 2).tolist()
+            raise ValueError(f"{col}에 60갑자가 아닌 값이 있습니다. (예: {lines}행)")
+        pillars.append(pillar)
+
+    dates = pd.to_datetime(df["solar_date"], format="%Y-%m-%d")
+    first = dates.min().date()
+    days = (dates - dates.min()).dt.days.to_numpy()
+    # 원본에 빠진 날짜는 세 값 모두 MISSING (조회 시 없는 날짜로 처리)
+    records = np.full((int(days.max()) + 1, 3), saju_file.MISSING, dtype=np.uint8)
+    records[days] = np.stack(pillars, axis=1)
+
+    saju_file.write_saju_file(bin_path, first, records.tobytes(), checksum)
+    saju_file.reset_saju_file()
+    return len(records)
+
+
+def open_current_saju_file(csv_path=DEFAULT_CSV_PATH, bin_path=None, checksum=None):
+    """CSV와 같은 내용으로 만든 바이너리 파일이면 SajuFile, 아니면 None"""
+    bin_path = bin_path or settings.SAJU_BIN_PATH
+    if not os.path.exists(bin_path):
+        return None
+    try:
+        sf = saju_file.SajuFile(bin_path)
+    except ValueError:
+        return None
+    if sf.source_checksum != (checksum or file_checksum(csv_path)):
+        sf.close()
+        return None
+    return sf
+
+
+def _copy_postgresql(conn, rows: list) -> None:
+    """COPY FROM STDIN (psycopg2)"""
+    buf = io.StringIO()
+    # None은 따옴표 없는 빈 필드가 되어 COPY csv 형식에서 NULL로 들어감
+    csv.writer(buf, lineterminator="\n").writerows(rows)
+    buf.seek(0)
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY saju_table ({', '.join(COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+            buf,
+        )
+    finally:
+        cursor.close()
+
+
+def _insert_sqlite(conn, rows: list) -> None:
+    """executemany로 한 번에 INSERT (sqlite3)"""
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.executemany(
+            f"INSERT INTO saju_table ({', '.join(COLUMNS)}) VALUES (?, ?, ?, ?)",
+            rows,
+        )
+    finally:
+        cursor.close()
+
+
+def _sqlite_bulk_pragmas(conn) -> dict:
+    """적재용 PRAGMA 적용 후 이전 값을 반환 (트랜잭션 밖에서 호출)"""
+    tuned = {"synchronous": "OFF", "temp_store": "MEMORY", "cache_size": "-65536"}
+    previous = {}
+    for name, value in tuned.items():
+        previous[name] = conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+        conn.exec_driver_sql(f"PRAGMA {name} = {value}")
+    return previous
+
+
+def load_saju(
+    engine, csv_path=DEFAULT_CSV_PATH, force: bool = False, bin_path=None
+) -> int:
+    """
+    사주 CSV를 saju_table에 적재하고 적재한 행 수를 반환
+    - 기록된 체크섬과 파일 체크섬이 같으면 건너뜀 (0 반환, force=True면 무시)
+    - 같은 CSV로 만든 바이너리 파일이 있으면 CSV 파싱 대신 그 파일에서 읽습니다.
+    - 기존 행 삭제와 적재, 체크섬 기록은 한 트랜잭션으로 처리합니다.
+    """
+    models.Saju.__table__.create(bind=engine, checkfirst=True)
+    models.SchemaMeta.__table__.create(bind=engine, checkfirst=True)
+
+    checksum = file_checksum(csv_path)
+    if not force:
+        with engine.connect() as conn:
+            if get_meta(conn, CHECKSUM_KEY) == checksum:
+                return 0
+
+    dialect = engine.dialect.name
+    if dialect not in ("postgresql", "sqlite"):
+        raise NotImplementedError(f"대량 적재를 지원하지 않는 DB입니다: {dialect}")
+    sf = open_current_saju_file(csv_path, bin_path, checksum)
+    if sf is not None:
+        rows = [row for row in sf.iter_rows() if row[1] is not None]
+        sf.close()
+    else:
+        rows = list(read_saju_csv(csv_path).itertuples(index=False, name=None))
+
+    with engine.connect() as conn:
+        previous = _sqlite_bulk_pragmas(conn) if dialect == "sqlite" else {}
+        conn.commit()
+        try:
+            with conn.begin():
+                if dialect == "postgresql":
+                    conn.execute(text("TRUNCATE saju_table"))
+                    _copy_postgresql(conn, rows)
+                else:
+                    conn.execute(text("DELETE FROM saju_table"))
+                    _insert_sqlite(conn, rows)
+                set_meta(conn, CHECKSUM_KEY, checksum)
+        finally:
+            for name, value in previous.items():
+                conn.exec_driver_sql(f"PRAGMA {name} = {value}")
+            conn.commit()
+
+    return len(rows)
+
+
+if __name__ == "__main__":
+    from database import engine
+
+    parser = argparse.ArgumentParser(description="사주 CSV 대량 적재")
+    parser.add_argument("csv_path", nargs="?", default=str(DEFAULT_CSV_PATH))
+    parser.add_argument(
+        "--force", action="store_true", help="체크섬이 같아도 다시 적재"
+    )
+    parser.add_argument(
+        "--build-bin", action="store_true", help="바이너리 파일도 다시 생성"
+    )
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if args.build_bin:
+        days = build_saju_file(args.csv_path)
+        print(f"✅ {settings.SAJU_BIN_PATH} 생성 완료 ({days}일)")
+    loaded = load_saju(engine, args.csv_path, force=args.force)
+    elapsed = time.perf_counter() - started
+    if loaded:
+        print(f"✅ 사주 데이터 {loaded}행 적재 완료 ({elapsed:.2f}초)")
+    else:
+        print("✅ 사주 데이터가 최신입니다. (체크섬 일치)")
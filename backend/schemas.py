@@ -28,6 +28,34 @@ class PasswordChange(BaseModel):
     new_password: str
 
 
+class UserBulkDelete(BaseModel):
+    """관리자 유저 일괄 삭제 요청"""
+
+    usernames: List[str]
+
+
+class AlgorithmVersionCreate(BaseModel):
+    """알고리즘 파라미터 버전 생성 요청 (params는 기본값에서 바꿀 값만)"""
+
+    version: str = Field(..., min_length=1, max_length=20)
+    params: Dict[str, Any] = {}
+    description: Optional[str] = ""
+
+
+class AlgorithmSweepRequest(BaseModel):
+    """파라미터 스윕 요청 (grid: 파라미터 경로 -> 값 목록, 예: {"axes.E.fire": [0.8, 1.2]})"""
+
+    grid: Dict[str, List[float]]
+    version: Optional[str] = None  # 기준 버전 (기본: 운영 버전)
+    mode: str = Field(default="calendar", pattern="^(calendar|users)$")
+    sample: int = Field(default=200_000, ge=1000, le=2_000_000)
+    date_from: Optional[str] = None
+    date_to: Optional[str] = None
+    birth_from: Optional[str] = None
+    birth_to: Optional[str] = None
+    seed: int = 0
+
+
 # --- 응답 데이터 모델 (Response) ---
 class Token(BaseModel):
     access_token: str
@@ -0,0 +1,404 @@
+"""
+알고리즘 파라미터 스윕 (what-if 시뮬레이션)
+- 기준 파라미터(운영 버전 또는 --version)에서 일부 값을 격자(grid)로 바꿔 가며
+  페르소나/운명 MBTI/행운의 원소 분포가 어떻게 달라지는지 계산합니다. (저장하지 않음)
+- 대상:
+  - calendar: 생년월일 범위 x 날짜 범위의 사주 달력
+  - users: 실제 유저의 생년월일 x 날짜 범위
+  조합 수가 sample 이하면 전부, 넘으면 sample개를 무작위로 뽑습니다. (seed 고정)
+- 격자 점마다 logic_batch 배치 엔진으로 계산하고, 계산량이 많으면 프로세스 풀(core.batch)로
+  나눠 계산합니다.
+- 결과는 (파라미터, 대상) 해시로 캐시해 같은 점은 SWEEP_CACHE_TTL 동안 다시 계산하지 않습니다.
+
+사용법:
+    python simulate.py --grid birth_weight=0.3,0.4,0.5 --grid axes.E.fire=0.8,1.2
+                       [--mode users] [--sample 200000] [--from 2025-01-01]
+                       [--to 2025-12-31] [--version 2] [--workers 8] [--output out.json]
+"""
+
+import argparse
+import copy
+from datetime import date, datetime, timedelta
+import hashlib
+import itertools
+import json
+import math
+import os
+import time
+
+from sqlalchemy import func
+
+from core.batch import run_chunks
+from core.cache import TTLCache
+from core.config import settings
+from algorithm import active_algorithm, get_algorithm
+from database import SessionLocal
+import crud
+import logic
+import models
+import saju_calendar
+
+# 바꿀 수 있는 파라미터 경로 (axes는 axes.<축 글자>.<프로필 항목>)
+SCALAR_KEYS = [key for key in logic.DEFAULT_PARAMS if key != "axes"]
+# 격자 점 수 x 대상 수가 이보다 적으면 프로세스 풀 없이 계산 (풀 시작 비용이 더 큼)
+INLINE_LIMIT = 2_000_000
+
+# 해시 -> 격자 점 하나의 분포표
+sweep_cache = TTLCache(maxsize=4096, ttl=settings.SWEEP_CACHE_TTL)
+
+
+def _parse_date(name: str, value: str) -> date:
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} 값은 YYYY-MM-DD 형식이어야 합니다.")
+
+
+def _date_range(name: str, start: str, end: str) -> list:
+    """
+    start~end(포함) 날짜 문자열 목록
+    - 펼치기 전에 사주 지원 범위 안인지 확인 (요청 값으로 수백만 개를 만들지 않도록)
+    """
+    start, end = _parse_date(f"{name} 시작", start), _parse_date(f"{name} 끝", end)
+    if start > end:
+        raise ValueError(f"{name} 시작이 끝보다 늦습니다.")
+    if start < saju_calendar.MIN_DATE or end > saju_calendar.MAX_DATE:
+        raise ValueError(
+            f"{name}는 {saju_calendar.MIN_DATE}~{saju_calendar.MAX_DATE} "
+            "사이여야 합니다."
+        )
+    return [
+        (start + timedelta(days=i)).isoformat() for i in range((end - start).days + 1)
+    ]
+
+
+def set_param(params: dict, path: str, value) -> None:
+    """파라미터 경로(예: birth_weight, axes.E.fire)의 값 변경 (잘못된 경로면 ValueError)"""
+    if path in SCALAR_KEYS:
+        params[path] = value
+        return
+    parts = path.split(".")
+    if (
+        len(parts) != 3
+        or parts[0] != "axes"
+        or parts[1] not in params["axes"]
+        or parts[2] not in logic.PROFILE_KEYS
+    ):
+        raise ValueError(f"알 수 없는 파라미터 경로: {path}")
+    params["axes"][parts[1]][parts[2]] = value
+
+
+def expand_grid(base: dict, grid: dict) -> list:
+    """
+    격자 -> [(바꾼 값 dict, 전체 파라미터)] (모든 조합, 잘못된 값이면 ValueError)
+    - grid: 파라미터 경로 -> 값 목록
+    """
+    if not grid:
+        raise ValueError("grid가 비어 있습니다.")
+    for path, values in grid.items():
+        if not isinstance(values, list) or not values:
+            raise ValueError(f"{path}의 값 목록이 비어 있습니다.")
+    count = math.prod(len(values) for values in grid.values())
+    if count > settings.SWEEP_MAX_POINTS:
+        raise ValueError(
+            f"격자 점이 너무 많습니다. ({count} > {settings.SWEEP_MAX_POINTS})"
+        )
+
+    points = []
+    for combo in itertools.product(*grid.values()):
+        overrides = dict(zip(grid, combo))
+        params = copy.deepcopy(base)
+        for path, value in overrides.items():
+            set_param(params, path, value)
+        points.append((overrides, logic.normalize_params(params)))
+    return points
+
+
+def build_population(
+    db,
+    mode: str = "calendar",
+    sample: int = 200_000,
+    date_from: str = None,
+    date_to: str = None,
+    birth_from: str = None,
+    birth_to: str = None,
+    seed: int = 0,
+):
+    """
+    시뮬레이션 대상 (생일 사주, 날짜 사주) 쌍 -> (대상 dict, 정보 dict)
+    - 대상 dict: 고유 사주 배열과 쌍별 인덱스 (프로세스 풀에 넘기기 가벼운 형태)
+    """
+    import numpy as np
+
+    import logic_batch
+
+    today = date.today()
+    date_from = date_from or today.isoformat()
+    date_to = date_to or (today + timedelta(days=364)).isoformat()
+    days = _date_range("날짜 범위", date_from, date_to)
+
+    if mode == "calendar":
+        birth_from = birth_from or f"{today.year - 80}-01-01"
+        birth_to = birth_to or f"{today.year - 10}-12-31"
+        births = _date_range("생년월일 범위", birth_from, birth_to)
+        birth_weights = None
+    elif mode == "users":
+        counts = dict(
+            db.query(models.User.birthdate, func.count())
+            .group_by(models.User.birthdate)
+            .all()
+        )
+        births = sorted(b for b in counts if b)
+        birth_weights = [counts[b] for b in births]
+    else:
+        raise ValueError("mode는 calendar 또는 users여야 합니다.")
+
+    saju_map = crud.get_saju_map(db, births + days)
+    keep = [i for i, b in enumerate(births) if b in saju_map]
+    births = [births[i] for i in keep]
+    if birth_weights is not None:
+        birth_weights = np.asarray([birth_weights[i] for i in keep], dtype=float)
+    days = [d for d in days if d in saju_map]
+    if not births or not days:
+        raise ValueError("사주를 구할 수 있는 대상이 없습니다.")
+
+    n_births = len(births) if birth_weights is None else int(birth_weights.sum())
+    total = n_births * len(days)
+    exhaustive = total <= sample
+    if exhaustive:
+        birth_idx = np.arange(len(births)).repeat(len(days))
+        day_idx = np.tile(np.arange(len(days)), len(births))
+        if birth_weights is not None:
+            # 같은 생년월일의 유저 수만큼 반복
+            repeats = birth_weights.astype(np.int64).repeat(len(days))
+            birth_idx, day_idx = birth_idx.repeat(repeats), day_idx.repeat(repeats)
+    else:
+        rng = np.random.default_rng(seed)
+        p = None if birth_weights is None else birth_weights / birth_weights.sum()
+        birth_idx = rng.choice(len(births), size=sample, p=p)
+        day_idx = rng.integers(len(days), size=sample)
+
+    population = {
+        "birth_sajus": logic_batch.saju_array([saju_map[b] for b in births]),
+        "birth_idx": birth_idx.astype(np.int32),
+        "day_sajus": logic_batch.saju_array([saju_map[d] for d in days]),
+        "day_idx": day_idx.astype(np.int32),
+    }
+    info = {
+        "mode": mode,
+        "date_from": days[0],
+        "date_to": days[-1],
+        "birth_from": births[0],
+        "birth_to": births[-1],
+        "birthdates": len(births),
+        "people": n_births,
+        "combinations": total,
+        "pairs": len(birth_idx),
+        "exhaustive": exhaustive,
+        "seed": None if exhaustive else seed,
+    }
+    return population, info
+
+
+def distribution_tables(scored: dict) -> dict:
+    """배치 엔진 결과 -> 비율 분포표 (MBTI, 운명 MBTI, 행운의 원소, 축별 앞 글자)"""
+    import numpy as np
+
+    import logic_batch
+
+    total = len(scored["persona"])
+
+    def ratios(codes, labels):
+        counts = np.bincount(codes, minlength=len(labels))
+        return {label: round(int(n) / total, 4) for label, n in zip(labels, counts)}
+
+    elements = [logic.ELEMENT_KO[e][0] for e in logic.ELEMENT_LIST]
+    return {
+        "persona": ratios(scored["persona"], logic_batch.MBTI_TYPES),
+        "destiny": ratios(scored["destiny"], logic_batch.MBTI_TYPES),
+        "lucky_element": ratios(scored["lucky"], elements),
+        # 축별 앞 글자(E/S/T/P) 비율
+        "letters": {
+            k1: round(float(np.mean((scored["persona"] >> (3 - i)) & 1 == 0)), 4)
+            for i, (_, k1, _) in enumerate(logic.AXES)
+        },
+    }
+
+
+def score_points(points: list, population: dict) -> list:
+    """격자 점들의 분포표 (프로세스 풀에서 실행)"""
+    import logic_batch
+
+    tables = []
+    for params in points:
+        compiled = logic.AlgorithmParams("sweep", params).compiled()
+        scored = logic_batch.score(
+            compiled,
+            population["birth_sajus"],
+            population["day_sajus"],
+            population["birth_idx"],
+            population["day_idx"],
+        )
+        tables.append(distribution_tables(scored))
+    return tables
+
+
+def shift(before: dict, after: dict) -> dict:
+    """분포표 간 변화량 (표별 총변동거리: 바뀐 비율의 합 / 2)"""
+    return {
+        name: round(
+            sum(abs(after[name][k] - before[name][k]) for k in before[name]) / 2, 4
+        )
+        for name in ("persona", "destiny", "lucky_element")
+    }
+
+
+def _hash(params: dict, population_info: dict) -> str:
+    raw = json.dumps([params, population_info], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def sweep(
+    db,
+    grid: dict,
+    version: str = None,
+    workers: int = 1,
+    progress=None,
+    **population_options,
+) -> dict:
+    """
+    기준 버전(기본: 운영 버전)에서 grid의 모든 조합을 계산해 격자 점별 분포표를 반환
+    - population_options: build_population 인자 (mode, sample, date_from, ...)
+    - 잘못된 grid/대상이면 ValueError, 없는 버전이면 LookupError
+    """
+    started = time.perf_counter()
+    base = get_algorithm(db, version) if version else active_algorithm(db)
+    if base is None:
+        raise LookupError(f"알고리즘 버전을 찾을 수 없습니다: {version}")
+    points = [({}, base.params)] + expand_grid(base.params, grid)
+    population, info = build_population(db, **population_options)
+
+    hashes = [_hash(params, info) for _, params in points]
+    tables = [sweep_cache.get(h) for h in hashes]
+    pending = [i for i, t in enumerate(tables) if t is None]
+    cache_hits = len(points) - len(pending)
+
+    if pending:
+        if len(pending) * info["pairs"] < INLINE_LIMIT:
+            workers = 1
+        workers = max(1, min(workers, len(pending)))
+        size = math.ceil(len(pending) / (workers * 2)) if workers > 1 else 1
+
+        def chunks():
+            for i in range(0, len(pending), size):
+                group = pending[i : i + size]
+                yield group, ([points[j][1] for j in group], population)
+
+        def save(group, results):
+            for j, result in zip(group, results):
+                tables[j] = result
+                sweep_cache.set(hashes[j], result)
+            if progress:
+                progress(sum(t is not None for t in tables), len(points))
+
+        run_chunks(chunks(), score_points, save, workers)
+
+    baseline = tables[0]
+    return {
+        "base_version": base.version,
+        "population": info,
+        "baseline": {"hash": hashes[0], "tables": baseline},
+        "points": [
+            {
+                "params": overrides,
+                "hash": h,
+                "shift": shift(baseline, t),
+                "tables": t,
+            }
+            for (overrides, _), h, t in zip(points[1:], hashes[1:], tables[1:])
+        ],
+        "cache_hits": cache_hits,
+        "workers": workers if pending else 0,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def _parse_grid_arg(value: str):
+    """argparse 타입: 'path=v1,v2,...' -> (path, [v1, v2, ...])"""
+    path, sep, values = value.partition("=")
+    try:
+        if not sep:
+            raise ValueError
+        return path.strip(), [float(v) for v in values.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            "grid는 경로=값,값 형식이어야 합니다. (예: birth_weight=0.3,0.4)"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="알고리즘 파라미터 스윕 (what-if)")
+    parser.add_argument(
+        "--grid",
+        type=_parse_grid_arg,
+        action="append",
+        required=True,
+        help="바꿀 파라미터와 값 (여러 번 지정 가능, 예: axes.E.fire=0.8,1.2)",
+    )
+    parser.add_argument("--mode", choices=["calendar", "users"], default="calendar")
+    parser.add_argument("--sample", type=int, default=200_000)
+    parser.add_argument("--from", dest="date_from", default=None, help="날짜 범위 시작")
+    parser.add_argument("--to", dest="date_to", default=None, help="날짜 범위 끝")
+    parser.add_argument(
+        "--birth-from", default=None, help="생년월일 범위 시작 (calendar)"
+    )
+    parser.add_argument("--birth-to", default=None, help="생년월일 범위 끝 (calendar)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--version", default=None, help="기준 버전 (기본: 운영 버전)")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="계산 프로세스 수 (기본: CPU 수)"
+    )
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        result = sweep(
+            db,
+            dict(args.grid),
+            version=args.version,
+            workers=args.workers or os.cpu_count() or 1,
+            progress=lambda done, total: print(f"🧪 {done}/{total} 격자 점 계산"),
+            mode=args.mode,
+            sample=args.sample,
+            date_from=args.date_from,
+            date_to=args.date_to,
+            birth_from=args.birth_from,
+            birth_to=args.birth_to,
+            seed=args.seed,
+        )
+    except (ValueError, LookupError) as e:
+        print(f"❌ {e}")
+        raise SystemExit(1)
+    finally:
+        db.close()
+
+    info = result["population"]
+    print(
+        f"📊 기준 버전 {result['base_version']}, {info['mode']} {info['pairs']}쌍 "
+        f"({'전체' if info['exhaustive'] else '표본'}), {result['seconds']}s"
+    )
+    for point in [{"params": {}, **result["baseline"]}] + result["points"]:
+        persona = point["tables"]["persona"]
+        top = sorted(persona, key=persona.get, reverse=True)[:3]
+        label = ", ".join(f"{k}={v}" for k, v in point["params"].items()) or "(기준)"
+        moved = point.get("shift", {}).get("persona", 0)
+        print(
+            f"  {label:<40} 변화 {moved:.1%}  "
+            + " ".join(f"{m} {persona[m]:.1%}" for m in top)
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"✅ 결과 저장: {args.output}")
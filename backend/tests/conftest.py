@@ -0,0 +1,77 @@
+"""
+pytest 공통 설정
+- 앱 모듈을 import하기 전에 임시 디렉터리의 SQLite DB / 블랙리스트 / 메트릭 파일을 쓰도록
+  환경 변수를 지정합니다. (benchmarks/bench_pipeline.py와 같은 방식)
+- 실행: backend 폴더에서 python -m pytest -q
+"""
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TMP_DIR = tempfile.mkdtemp(prefix="saju-tests-")
+
+sys.path.insert(0, BACKEND_DIR)
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(TMP_DIR, 'test.db')}"
+os.environ["TOKEN_BLACKLIST_PATH"] = os.path.join(TMP_DIR, "blacklist.db")
+os.environ["MIGRATION_LOCK_PATH"] = os.path.join(TMP_DIR, ".migration.lock")
+os.environ["PRECOMPUTE_LOCK_PATH"] = os.path.join(TMP_DIR, ".precompute.lock")
+os.environ["METRICS_DIR"] = os.path.join(TMP_DIR, "metrics")
+os.environ["SAJU_BIN_PATH"] = os.path.join(TMP_DIR, "saju_master_db.bin")
+os.environ["AUTO_MIGRATE"] = "true"
+os.environ["SECRET_KEY"] = "test"
+os.environ["BCRYPT_ROUNDS"] = "4"
+
+
+@pytest.fixture(scope="session")
+def app_db():
+    """테이블 생성 / 마이그레이션 / 사주·유명인 시딩이 끝난 테스트 DB (세션당 한 번)"""
+    from init_db import init_db
+
+    init_db(only_if_stale=True)
+    return os.environ["DATABASE_URL"]
+
+
+@pytest.fixture(scope="session")
+def client(app_db):
+    """앱 TestClient (세션당 한 번 startup/shutdown)"""
+    from fastapi.testclient import TestClient
+
+    import main
+
+    with TestClient(main.app) as client:
+        yield client
+
+
+@pytest.fixture
+def make_user(app_db):
+    """유저를 추가하고 Bearer 인증 헤더를 반환하는 함수"""
+    from core.security import create_access_token
+    from database import SessionLocal
+    import crud
+
+    def make(username: str, birthdate: str = "1990-05-05") -> dict:
+        db = SessionLocal()
+        try:
+            crud.insert_users(
+                db,
+                [
+                    {
+                        "username": username,
+                        "hashed_password": "x",
+                        "nickname": username,
+                        "birthdate": birthdate,
+                        "gender": "F",
+                    }
+                ],
+            )
+            db.commit()
+        finally:
+            db.close()
+        token = create_access_token({"sub": username})
+        return {"Authorization": f"Bearer {token}"}
+
+    return make
@@ -0,0 +1,78 @@
+"""계정 삭제: 분석 결과를 로드하지 않고 집합 단위로 지우고, 삭제된 유저의 토큰은 401"""
+
+from core.query_monitor import assert_max_queries
+from database import SessionLocal, engine
+import crud
+import logic
+import models
+
+DATES = ["2024-01-01", "2024-01-02", "2024-01-03"]
+
+
+def _add_results(username: str) -> None:
+    db = SessionLocal()
+    saju_map = crud.get_saju_map(db, ["1990-05-05", *DATES])
+    rows = [
+        crud.analysis_row(
+            username,
+            day,
+            logic.analyze_daily(saju_map["1990-05-05"], saju_map[day]),
+        )
+        for day in DATES
+    ]
+    crud.upsert_analysis_results(db, rows)
+    db.commit()
+    db.close()
+
+
+def _count_rows(model, username: str) -> int:
+    db = SessionLocal()
+    try:
+        return db.query(model).filter_by(username=username).count()
+    finally:
+        db.close()
+
+
+def _assert_not_loaded(statements) -> None:
+    # 분석 결과는 DELETE ... WHERE username IN (...) 로만 다룸 (행을 SELECT하지 않음)
+    for statement in statements:
+        if "analysis_results" in statement:
+            assert statement.lstrip().upper().startswith("DELETE"), statement
+
+
+def test_delete_account_removes_results_without_loading(client, make_user):
+    headers = make_user("delete_me")
+    _add_results("delete_me")
+    assert client.get("/api/users/me", headers=headers).status_code == 200
+
+    with assert_max_queries(engine, 10) as statements:
+        response = client.delete("/api/users/me", headers=headers)
+    assert response.status_code == 200
+    _assert_not_loaded(statements)
+
+    assert _count_rows(models.AnalysisResult, "delete_me") == 0
+    assert _count_rows(models.User, "delete_me") == 0
+    assert client.get("/api/users/me", headers=headers).status_code == 401
+
+
+def test_admin_bulk_delete_removes_results_without_loading(client, make_user):
+    admin = make_user("admin")
+    victims = {name: make_user(name) for name in ("bulk_a", "bulk_b")}
+    for name, headers in victims.items():
+        _add_results(name)
+        assert client.get("/api/users/me", headers=headers).status_code == 200
+
+    with assert_max_queries(engine, 10) as statements:
+        response = client.post(
+            "/api/admin/users/delete",
+            json={"usernames": list(victims)},
+            headers=admin,
+        )
+    assert response.status_code == 200
+    assert response.json()["deleted_users"] == 2
+    assert response.json()["deleted_results"] == 2 * len(DATES)
+    _assert_not_loaded(statements)
+
+    for name, headers in victims.items():
+        assert _count_rows(models.AnalysisResult, name) == 0
+        assert client.get("/api/users/me", headers=headers).status_code == 401
@@ -0,0 +1,138 @@
+"""분석 알고리즘: 배치 엔진과 logic.analyze_daily의 결과 일치, 파라미터 검증, 버전 관리"""
+
+from datetime import date
+import random
+
+import pytest
+
+from algorithm import active_algorithm
+from database import SessionLocal
+import logic
+import logic_batch
+import saju_calendar
+
+PAIRS = 3000
+MODIFIED_PARAMS = {
+    "sky_weight": 0.9,
+    "earth_weight": 1.7,
+    "birth_weight": 0.65,
+    "strength": 1.3,
+    "axes": {
+        "E": {"fire": 0.8, "yang": 0.2},
+        "J": {"metal": 1.1, "earth": 0.4, "yin": 0.2},
+    },
+}
+
+
+def _random_sajus(rng, count: int) -> list:
+    low = saju_calendar.MIN_DATE.toordinal()
+    high = saju_calendar.MAX_DATE.toordinal()
+    return [
+        saju_calendar.get_saju(date.fromordinal(rng.randint(low, high)).isoformat())
+        for _ in range(count)
+    ]
+
+
+@pytest.mark.parametrize(
+    "algorithm",
+    [logic.DEFAULT_ALGORITHM, logic.AlgorithmParams("test-modified", MODIFIED_PARAMS)],
+    ids=["default", "modified"],
+)
+def test_batch_score_matches_analyze_daily(algorithm):
+    rng = random.Random(49)
+    births = _random_sajus(rng, PAIRS)
+    todays = _random_sajus(rng, PAIRS)
+
+    scores = logic_batch.score(
+        algorithm.compiled(),
+        logic_batch.saju_array(births),
+        logic_batch.saju_array(todays),
+    )
+
+    mismatched = []
+    for i, (birth, today) in enumerate(zip(births, todays)):
+        expected = logic.analyze_daily(birth, today, algorithm)
+        axes = [
+            expected["axes"][axis][letter]
+            for axis, *pair in logic.AXES
+            for letter in pair
+        ]
+        lucky = logic.ELEMENT_LIST[scores["lucky"][i]]
+        if (
+            logic_batch.MBTI_TYPES[scores["persona"][i]] != expected["my_persona"]
+            or logic_batch.MBTI_TYPES[scores["destiny"][i]] != expected["my_destiny"]
+            or logic.ELEMENT_KO[lucky][0] != expected["lucky_element"]
+            # 비트 단위로 같아야 함 (동점 비교가 부동소수점 오차로 바뀌지 않도록)
+            or scores["axes"][i].tolist() != axes
+        ):
+            mismatched.append((birth, today))
+    assert mismatched == []
+
+
+@pytest.mark.parametrize(
+    "params, message",
+    [
+        ("sky_weight=1", "객체"),
+        ({"unknown": 1}, "알 수 없는 파라미터"),
+        ({"sky_weight": "1"}, "숫자"),
+        ({"sky_weight": True}, "숫자"),
+        ({"earth_weight": -0.1}, "0.0 이상"),
+        ({"strength": float("nan")}, "0.0 이상"),
+        ({"birth_weight": 1.5}, "1.0 이하"),
+        ({"axes": []}, "axes는"),
+        ({"axes": {"X": {"fire": 1.0}}}, "알 수 없는 축 글자"),
+        ({"axes": {"E": {}}}, "비어 있지 않은"),
+        ({"axes": {"E": {"luck": 1.0}}}, "알 수 없는 항목"),
+        ({"axes": {"E": {"fire": -1}}}, "axes.E.fire"),
+    ],
+)
+def test_invalid_params_are_rejected(params, message):
+    with pytest.raises(ValueError, match=message):
+        logic.AlgorithmParams("bad", params)
+
+
+def test_partial_params_keep_defaults():
+    params = logic.AlgorithmParams("partial", {"axes": {"E": {"fire": 2}}}).params
+    assert params["axes"]["E"] == {"fire": 2.0}
+    assert params["axes"]["I"] == logic.DEFAULT_PARAMS["axes"]["I"]
+    assert params["sky_weight"] == logic.DEFAULT_PARAMS["sky_weight"]
+
+
+def _active_version() -> str:
+    db = SessionLocal()
+    try:
+        return active_algorithm(db).version
+    finally:
+        db.close()
+
+
+def test_admin_create_and_activate_version(client, make_user):
+    headers = make_user("admin")
+    path = "/api/admin/algorithm/versions"
+    previous = _active_version()
+
+    created = client.post(
+        path, json={"version": "t-049", "params": MODIFIED_PARAMS}, headers=headers
+    )
+    assert created.status_code == 201
+    assert created.json()["params"]["birth_weight"] == 0.65
+
+    # 만든 버전은 바꿀 수 없음
+    again = client.post(path, json={"version": "t-049", "params": {}}, headers=headers)
+    assert again.status_code == 409
+    invalid = client.post(
+        path, json={"version": "t-049-bad", "params": {"strength": -1}}, headers=headers
+    )
+    assert invalid.status_code == 400
+    missing = client.post(f"{path}/nope/activate", headers=headers)
+    assert missing.status_code == 404
+
+    try:
+        activated = client.post(f"{path}/t-049/activate", headers=headers)
+        assert activated.status_code == 200
+        assert activated.json()["active"] == "t-049"
+        assert _active_version() == "t-049"
+        assert client.get(path, headers=headers).json()["active"] == "t-049"
+    finally:
+        client.post(f"{path}/{previous}/activate", headers=headers)
+    assert _active_version() == previous
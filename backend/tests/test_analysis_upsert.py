@@ -0,0 +1,67 @@
+"""오늘의 분석 저장: 같은 유저/날짜의 동시 요청이 한 행으로 upsert되는지 확인"""
+
+import threading
+
+from core.security import UserPrincipal
+from database import SessionLocal
+from routers import analysis
+import crud
+import logic
+import models
+
+CONCURRENCY = 8
+
+
+def test_concurrent_compute_and_save_keeps_single_row(app_db):
+    user = UserPrincipal(
+        username="race_user", nickname="race", birthdate="1990-05-05", gender="M"
+    )
+    db = SessionLocal()
+    crud.insert_users(
+        db,
+        [
+            {
+                "username": user.username,
+                "hashed_password": "x",
+                "nickname": user.nickname,
+                "birthdate": user.birthdate,
+                "gender": user.gender,
+            }
+        ],
+    )
+    db.commit()
+    db.close()
+
+    barrier = threading.Barrier(CONCURRENCY)
+    errors = []
+
+    def request():
+        session = SessionLocal()
+        try:
+            barrier.wait()
+            analysis._compute_and_save(
+                session, user, "2024-03-01", logic.DEFAULT_ALGORITHM
+            )
+        except Exception as e:
+            errors.append(e)
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=request) for _ in range(CONCURRENCY)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(models.AnalysisResult)
+            .filter_by(username=user.username, analysis_date="2024-03-01")
+            .all()
+        )
+    finally:
+        db.close()
+    assert len(rows) == 1
+    assert rows[0].algorithm_version == logic.DEFAULT_ALGORITHM_VERSION
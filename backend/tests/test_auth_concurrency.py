@@ -0,0 +1,50 @@
+"""인증 의존성이 스레드풀에서 실행되어, 느린 사용자 조회가 다른 요청을 막지 않는지 확인"""
+
+import asyncio
+import time
+
+import httpx
+
+from core import security
+
+SLOW_LOOKUP = 0.5
+IN_FLIGHT = 4
+
+
+def test_slow_user_lookup_does_not_block_health(make_user, monkeypatch):
+    import main
+
+    headers = make_user("slow_lookup")
+    cached_get = security.principal_cache.get
+
+    def slow_get(key):
+        # 캐시를 비껴가 DB 조회까지 가는 느린 사용자 조회 (동기 블로킹)
+        time.sleep(SLOW_LOOKUP)
+        return cached_get(key)
+
+    monkeypatch.setattr(security.principal_cache, "get", slow_get)
+
+    async def run():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            started = time.perf_counter()
+            authed = [
+                asyncio.create_task(client.get("/api/users/me", headers=headers))
+                for _ in range(IN_FLIGHT)
+            ]
+            await asyncio.sleep(0.05)  # 인증 요청들이 조회 중인 상태에서
+            health = await client.get("/health")
+            health_elapsed = time.perf_counter() - started
+            finished_early = not any(task.done() for task in authed)
+            responses = await asyncio.gather(*authed)
+            return health, health_elapsed, finished_early, responses
+
+    health, health_elapsed, finished_early, responses = asyncio.run(run())
+
+    assert health.status_code == 200
+    assert health_elapsed < SLOW_LOOKUP / 2
+    # /health가 끝났을 때 인증 요청은 아직 진행 중이었음
+    assert finished_early
+    assert all(r.status_code == 200 for r in responses)
@@ -0,0 +1,40 @@
+"""토큰 블랙리스트: 만료 처리와 같은 파일을 쓰는 다른 인스턴스(워커) 간 공유"""
+
+import time
+
+from core.blacklist import TokenBlacklist
+
+
+def test_add_then_contains(tmp_path):
+    blacklist = TokenBlacklist(str(tmp_path / "blacklist.db"))
+    blacklist.add("token-a", time.time() + 60)
+
+    assert "token-a" in blacklist
+    assert "token-b" not in blacklist
+    assert len(blacklist) == 1
+
+
+def test_expired_entries_are_ignored_and_pruned(tmp_path):
+    blacklist = TokenBlacklist(str(tmp_path / "blacklist.db"))
+    blacklist.add("live", time.time() + 60)  # 첫 추가 때 정리 주기가 돌아감
+    blacklist.add("expired", time.time() - 10)
+
+    assert "expired" not in blacklist
+    assert "live" in blacklist
+    assert len(blacklist) == 2
+    assert blacklist.prune() == 1
+    assert len(blacklist) == 1
+    assert "live" in blacklist
+
+
+def test_second_instance_sees_entries(tmp_path):
+    # 워커마다 따로 만드는 인스턴스라도 같은 파일이면 같은 목록을 봄
+    path = str(tmp_path / "blacklist.db")
+    worker_a = TokenBlacklist(path)
+    worker_b = TokenBlacklist(path)
+    assert "shared" not in worker_b
+
+    worker_a.add("shared", time.time() + 60)
+
+    assert "shared" in worker_b
+    assert len(worker_b) == 1
@@ -0,0 +1,62 @@
+"""유명인 CSV 가져오기: 스레드풀에서 실행되고, 기존 행은 수정·새 행은 추가"""
+
+import inspect
+import json
+
+from database import SessionLocal
+from routers import admin
+import models
+
+HEADER = "id,mbti,name,tags,description,image_url\n"
+
+
+def _celebrity(name: str):
+    db = SessionLocal()
+    try:
+        return db.query(models.MbtiCelebrity).filter_by(name=name).one()
+    finally:
+        db.close()
+
+
+def _celebrity_any(mbti: str):
+    db = SessionLocal()
+    try:
+        return db.query(models.MbtiCelebrity).filter_by(mbti=mbti).first()
+    finally:
+        db.close()
+
+
+def test_import_runs_off_the_event_loop():
+    assert not inspect.iscoroutinefunction(admin.admin_import_celebrities)
+
+
+def test_import_updates_existing_and_inserts_new(client, make_user):
+    headers = make_user("admin")
+    existing = _celebrity_any("INTJ")
+    csv_text = HEADER + (
+        f'{existing.id},intj,{existing.name},"a, b",수정된 설명,\n'
+        ",ENFP,가져오기 새 유명인,[],새 설명,\n"
+    )
+
+    response = client.post(
+        "/api/admin/celebrities/import",
+        files={"file": ("celebs.csv", csv_text.encode("utf-8-sig"), "text/csv")},
+        headers=headers,
+    )
+
+    assert response.status_code == 200
+    assert response.json()["errors"] == []
+    updated = _celebrity(existing.name)
+    assert updated.description == "수정된 설명"
+    assert json.loads(updated.tags) == ["a", "b"]
+    assert _celebrity("가져오기 새 유명인").mbti == "ENFP"
+
+
+def test_import_rejects_non_csv(client, make_user):
+    headers = make_user("admin")
+    response = client.post(
+        "/api/admin/celebrities/import",
+        files={"file": ("celebs.txt", b"x", "text/plain")},
+        headers=headers,
+    )
+    assert response.status_code == 400
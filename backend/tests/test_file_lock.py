@@ -0,0 +1,65 @@
+"""잠금 파일: 종료된 프로세스의 잠금만 정리하고, 해제 시 남의 잠금은 지우지 않음"""
+
+import subprocess
+import sys
+import threading
+import time
+
+from core.file_lock import file_lock, release, try_acquire
+
+
+def _dead_pid() -> int:
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    return proc.pid
+
+
+def test_lock_of_dead_process_is_taken_over(tmp_path):
+    path = str(tmp_path / "job.lock")
+    with open(path, "w") as f:
+        f.write(f"{_dead_pid()} leftover")
+
+    token = try_acquire(path, stale_seconds=600)
+    assert token is not None
+    release(path, token)
+
+
+def test_long_running_holder_keeps_lock(tmp_path):
+    # stale_seconds보다 오래 잡고 있어도 mtime이 갱신되므로 빼앗기지 않음
+    path = str(tmp_path / "job.lock")
+    held = threading.Event()
+    done = threading.Event()
+
+    def holder():
+        with file_lock(path, stale_seconds=0.4) as locked:
+            assert locked
+            held.set()
+            done.wait()
+
+    thread = threading.Thread(target=holder)
+    thread.start()
+    try:
+        held.wait()
+        time.sleep(1.0)
+        assert try_acquire(path, stale_seconds=0.4) is None
+        with file_lock(path, stale_seconds=0.4, wait=0.3) as locked:
+            assert not locked
+    finally:
+        done.set()
+        thread.join()
+
+    with file_lock(path, stale_seconds=0.4) as locked:
+        assert locked
+
+
+def test_release_keeps_lock_taken_over_by_another_process(tmp_path):
+    path = str(tmp_path / "job.lock")
+    token = try_acquire(path, stale_seconds=600)
+    # 그 사이 다른 프로세스가 잠금을 정리하고 새로 잡은 상황
+    with open(path, "w") as f:
+        f.write("1 other-holder")
+
+    release(path, token)
+
+    with open(path) as f:
+        assert f.read() == "1 other-holder"
@@ -0,0 +1,116 @@
+"""조건부 GET: 같은 ETag면 304, 해당 유저 분석 결과나 유명인이 바뀌면 200"""
+
+from datetime import date
+
+from database import SessionLocal
+import crud
+import models
+
+
+def _revalidate(client, path, response, headers=None):
+    return client.get(
+        path,
+        headers={**(headers or {}), "If-None-Match": response.headers["ETag"]},
+    )
+
+
+def _today_row_id(username: str) -> int:
+    db = SessionLocal()
+    try:
+        return (
+            db.query(models.AnalysisResult.id)
+            .filter_by(username=username, analysis_date=date.today().isoformat())
+            .scalar()
+        )
+    finally:
+        db.close()
+
+
+def _first_celebrity_id(mbti: str) -> int:
+    db = SessionLocal()
+    try:
+        return db.query(models.MbtiCelebrity.id).filter_by(mbti=mbti).first()[0]
+    finally:
+        db.close()
+
+
+def test_today_revalidates_after_admin_edit(client, make_user):
+    headers = make_user("etag_today")
+    admin = make_user("admin")
+
+    first = client.get("/api/analyze/today", headers=headers)
+    assert first.status_code == 200
+    # 첫 요청에서 저장한 뒤의 ETag: 바로 다시 검증하면 304
+    assert _revalidate(client, "/api/analyze/today", first, headers).status_code == 304
+
+    row_id = _today_row_id("etag_today")
+    edited = client.put(
+        f"/api/admin/analysis-results/{row_id}",
+        json={"my_persona": "XXXX"},
+        headers=admin,
+    )
+    assert edited.status_code == 200
+    second = _revalidate(client, "/api/analyze/today", first, headers)
+    assert second.status_code == 200
+    assert second.json()["my_persona"] == "XXXX"
+
+    assert _revalidate(client, "/api/analyze/today", second, headers).status_code == 304
+    celebrity_id = _first_celebrity_id("INTJ")
+    edited = client.put(
+        f"/api/admin/celebrities/{celebrity_id}",
+        json={"description": "수정됨"},
+        headers=admin,
+    )
+    assert edited.status_code == 200
+    third = _revalidate(client, "/api/analyze/today", second, headers)
+    assert third.status_code == 200
+
+
+def test_calendar_revalidates_after_user_write(client, make_user):
+    headers = make_user("etag_calendar")
+    path = "/api/calendar/history"
+
+    first = client.get(path, headers=headers)
+    assert first.status_code == 200
+    assert "Last-Modified" not in first.headers
+    assert _revalidate(client, path, first, headers).status_code == 304
+
+    # 같은 유저의 분석 결과가 저장되면 버전이 올라감
+    assert client.get("/api/analyze/today", headers=headers).status_code == 200
+    second = _revalidate(client, path, first, headers)
+    assert second.status_code == 200
+    assert len(second.json()) == 1
+    assert "Last-Modified" in second.headers
+    since = client.get(
+        path,
+        headers={**headers, "If-Modified-Since": second.headers["Last-Modified"]},
+    )
+    assert since.status_code == 304
+
+    # 다른 유저의 쓰기는 영향 없음
+    other = make_user("etag_calendar_other")
+    assert client.get("/api/analyze/today", headers=other).status_code == 200
+    assert _revalidate(client, path, second, headers).status_code == 304
+
+
+def test_celebrities_revalidate_after_admin_edit(client, make_user):
+    admin = make_user("admin")
+    path = "/api/celebrities/INTJ/all"
+
+    first = client.get(path)
+    assert first.status_code == 200
+    assert first.headers["Cache-Control"].startswith("public")
+    assert _revalidate(client, path, first).status_code == 304
+
+    celebrity_id = _first_celebrity_id("INTJ")
+    edited = client.put(
+        f"/api/admin/celebrities/{celebrity_id}",
+        json={"description": "다시 수정됨"},
+        headers=admin,
+    )
+    assert edited.status_code == 200
+    second = _revalidate(client, path, first)
+    assert second.status_code == 200
+    celebrities = second.json()["celebrities"]
+    assert any(c["description"] == "다시 수정됨" for c in celebrities)
+    assert _revalidate(client, path, second).status_code == 304
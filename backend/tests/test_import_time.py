@@ -0,0 +1,57 @@
+"""앱 import 시간 예산: 새 프로세스에서 import main 시간과 무거운 모듈 import 여부 확인"""
+
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks.check_import_time import (
+    BACKEND_DIR,
+    BASELINE_MODULES,
+    FORBIDDEN_MODULES,
+    run_importtime,
+)
+
+# benchmarks/check_import_time.py 기본값과 같은 예산 (기준 import 대비 배수)
+MAX_RATIO = 2.0
+RUNS = 3
+
+
+def _self_ms(module: str) -> float:
+    return sum(entry[1] for entry in run_importtime(module)) / 1000
+
+
+def test_import_main_within_budget():
+    # 부하 영향을 줄이도록 번갈아 여러 번 실행해 가장 빠른 값으로 비교
+    totals = []
+    baselines = []
+    for _ in range(RUNS):
+        baselines.append(_self_ms(BASELINE_MODULES))
+        totals.append(_self_ms("main"))
+    ratio = min(totals) / min(baselines)
+
+    assert ratio <= MAX_RATIO, (
+        f"import main {min(totals):.0f} ms = 기준({BASELINE_MODULES}) "
+        f"{min(baselines):.0f} ms의 {ratio:.2f}배"
+    )
+
+
+def test_import_main_skips_heavy_modules():
+    code = (
+        "import json, sys, main; "
+        f"print(json.dumps([m for m in {list(FORBIDDEN_MODULES)!r} "
+        "if m in sys.modules]))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=BACKEND_DIR,
+        env=dict(os.environ),
+        capture_output=True,
+        text=True,
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    imported = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    assert "pandas" not in imported
+    assert "passlib" not in imported
+    assert imported == []
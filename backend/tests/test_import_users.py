@@ -0,0 +1,98 @@
+"""유저 CSV 대량 등록 (import_users)"""
+
+import io
+import threading
+
+from core.password_pool import PasswordHasher
+from database import SessionLocal
+import crud
+import import_users
+import models
+
+HEADER = "username,password,nickname,birthdate,gender\n"
+
+
+class FakeHasher:
+    """해싱 없이 고정 값 반환, 해싱 중에 다른 요청이 먼저 가입하는 상황을 흉내냄"""
+
+    def __init__(self, racing_user: dict = None):
+        self.racing_user = racing_user
+
+    def hash_many(self, passwords: list) -> list:
+        if self.racing_user:
+            db = SessionLocal()
+            crud.insert_users(db, [self.racing_user])
+            db.commit()
+            db.close()
+        return ["hashed"] * len(passwords)
+
+
+def test_import_rejects_non_canonical_birthdates(app_db):
+    csv_text = HEADER + (
+        "imp_ok,pw,ok,1990-05-05,F\n"
+        "imp_short,pw,short,1990-5-5,F\n"
+        "imp_compact,pw,compact,19900505,F\n"
+        "imp_week,pw,week,1990-W01-1,F\n"
+    )
+    report = import_users.import_users(io.StringIO(csv_text), FakeHasher())
+
+    assert report["created"] == 1
+    assert report["failed"] == 3
+    assert all("YYYY-MM-DD" in error for error in report["errors"])
+
+
+def test_import_precomputes_only_inserted_users(app_db):
+    racing_user = {
+        "username": "imp_race",
+        "hashed_password": "x",
+        "nickname": "race",
+        "birthdate": "1985-01-01",
+        "gender": "M",
+    }
+    csv_text = HEADER + "imp_new,pw,new,1991-06-06,F\nimp_race,pw,race,2000-12-12,F\n"
+    report = import_users.import_users(
+        io.StringIO(csv_text), FakeHasher(racing_user), precompute=True
+    )
+
+    assert report["created"] == 1
+    assert report["skipped"] == 1
+    assert report["precomputed"] == 1
+    db = SessionLocal()
+    try:
+        analysed = {
+            u
+            for (u,) in db.query(models.AnalysisResult.username).filter(
+                models.AnalysisResult.username.in_(["imp_new", "imp_race"])
+            )
+        }
+        birthdate = (
+            db.query(models.User.birthdate).filter_by(username="imp_race").scalar()
+        )
+    finally:
+        db.close()
+    assert analysed == {"imp_new"}
+    assert birthdate == "1985-01-01"
+
+
+def test_hash_many_counts_chunks_against_pending_budget():
+    hasher = PasswordHasher(workers=1, max_pending=4, rounds=4)
+    depths = []
+    hashes = []
+    worker = threading.Thread(
+        target=lambda: hashes.extend(hasher.hash_many([f"pw{i}" for i in range(200)]))
+    )
+    try:
+        worker.start()
+        while worker.is_alive():
+            depths.append(hasher.queue_depth())
+        worker.join()
+        # 묶음이 처리되는 동안에도 일반 요청은 한도 안에서 처리됨
+        assert hasher.verify_and_update("pw0", hashes[0])[0]
+    finally:
+        hasher.shutdown()
+
+    assert len(hashes) == 200
+    assert max(depths) >= 1
+    # 풀에 동시에 넣는 묶음은 workers(1)개까지
+    assert max(depths) <= 1
+    assert hasher.queue_depth() == 0
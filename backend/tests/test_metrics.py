@@ -0,0 +1,114 @@
+"""워커 스냅샷 파일 합산: 종료된 워커 정리와 누적 카운터 보존"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+from sqlalchemy import create_engine, text
+
+from core import metrics
+
+LABELS = {"method": "GET", "route": "/test", "status": "200"}
+
+
+def _dead_pid() -> int:
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    return proc.pid
+
+
+def _write_worker(directory, worker: str, pid: int, count: int, age: float = 0):
+    snap = {
+        "pid": pid,
+        "worker": worker,
+        "time": time.time() - age,
+        "counters": {metrics._key("http_requests_total", LABELS): count},
+        "histograms": {},
+        "buckets": {},
+        "gauges": {metrics._key("analysis_write_queue_depth", {}): 7},
+    }
+    path = os.path.join(directory, f"metrics-{worker}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(snap, f)
+    return path
+
+
+def _requests_total(text: str) -> int:
+    prefix = 'http_requests_total{method="GET",route="/test",status="200"} '
+    return int(
+        next(line for line in text.splitlines() if line.startswith(prefix))[
+            len(prefix) :
+        ]
+    )
+
+
+def test_dead_and_reused_pid_workers_are_folded(tmp_path):
+    directory = str(tmp_path)
+    dead = _write_worker(directory, "dead-a", _dead_pid(), 5)
+    # pid는 살아 있지만(재사용) 스냅샷이 오래 갱신되지 않은 워커
+    reused = _write_worker(directory, "reused-b", os.getpid(), 3, age=3600)
+    live = _write_worker(directory, "live-c", os.getpid(), 2)
+
+    text = metrics.render(directory, interval=5)
+
+    assert _requests_total(text) == 10
+    assert not os.path.exists(dead) and not os.path.exists(reused)
+    assert os.path.exists(live)
+    # 게이지는 살아 있는 워커 값만 합산 (이 프로세스 값 0 + live-c 7)
+    assert "analysis_write_queue_depth 7" in text.splitlines()
+
+    # 다시 수집해도 줄거나 두 번 세지 않음
+    assert _requests_total(metrics.render(directory, interval=5)) == 10
+
+    # 합친 뒤 같은 워커 ID로 다시 쓰인 파일은 무시
+    _write_worker(directory, "dead-a", _dead_pid(), 5)
+    assert _requests_total(metrics.render(directory, interval=5)) == 10
+
+
+def test_worker_id_is_unique_per_process():
+    assert metrics.worker_id() == metrics.worker_id()
+    assert metrics.worker_id().startswith(f"{os.getpid()}-")
+
+
+def _counter(name: str) -> float:
+    return metrics.registry.snapshot()["counters"].get(metrics._key(name, {}), 0)
+
+
+def test_pool_events_survive_dispose(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}")
+    metrics.instrument_pool(engine)
+    before = _counter("db_pool_checkouts_total")
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    engine.dispose()  # 풀이 새로 만들어져도 이벤트는 유지
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        gauges = metrics.registry.snapshot()["gauges"]
+        assert gauges[metrics._key("db_pool_checked_out", {})] == 1
+
+    assert _counter("db_pool_checkouts_total") - before == 2
+    engine.dispose()
+
+
+def test_metrics_endpoint_is_off_by_default_and_token_protected(client):
+    assert client.get("/metrics").status_code == 404
+
+    code = (
+        "from fastapi.testclient import TestClient; import main; "
+        "c = TestClient(main.app); "
+        "print(c.get('/metrics').status_code, "
+        "c.get('/metrics', headers={'Authorization': 'Bearer wrong'}).status_code, "
+        "c.get('/metrics', headers={'Authorization': 'Bearer s3cret'}).status_code)"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env={**os.environ, "METRICS_ENABLED": "true", "METRICS_TOKEN": "s3cret"},
+        capture_output=True,
+        text=True,
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    assert proc.stdout.strip().splitlines()[-1] == "401 401 200"
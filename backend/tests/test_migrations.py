@@ -0,0 +1,94 @@
+"""마이그레이션 후 분석 결과 조회가 (username, analysis_date) 인덱스를 쓰는지 확인"""
+
+from sqlalchemy import create_engine, select, text
+
+import migrations
+import models
+
+RESULT = models.AnalysisResult
+
+
+def _legacy_db(path):
+    """마이그레이션 전 스키마: username 단일 인덱스만 있고 중복 결과가 있는 DB"""
+    engine = create_engine(f"sqlite:///{path}")
+    models.Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_analysis_results_username_date"))
+        conn.execute(
+            text(
+                "CREATE INDEX ix_analysis_results_username "
+                "ON analysis_results (username)"
+            )
+        )
+        conn.execute(
+            models.User.__table__.insert(),
+            [
+                {
+                    "username": f"user{i}",
+                    "hashed_password": "x",
+                    "nickname": f"user{i}",
+                    "birthdate": "1990-05-05",
+                }
+                for i in range(20)
+            ],
+        )
+        conn.execute(
+            RESULT.__table__.insert(),
+            [
+                {"username": f"user{i}", "analysis_date": f"2024-01-{day:02d}"}
+                for i in range(20)
+                for day in range(1, 29)
+            ]
+            # 같은 날짜 중복 (마이그레이션이 최신 행만 남김)
+            + [{"username": "user0", "analysis_date": "2024-01-01"}],
+        )
+    return engine
+
+
+def _plan(engine, query) -> str:
+    sql = query.compile(engine, compile_kwargs={"literal_binds": True})
+    with engine.connect() as conn:
+        rows = conn.execute(text(f"EXPLAIN QUERY PLAN {sql}")).fetchall()
+    return "\n".join(row[-1] for row in rows)
+
+
+def test_migrations_index_history_and_today_lookups(tmp_path):
+    engine = _legacy_db(tmp_path / "legacy.db")
+    for _, migration in migrations.MIGRATIONS:
+        with engine.begin() as conn:
+            migration(conn)
+
+    with engine.connect() as conn:
+        indexes = {
+            row[0]
+            for row in conn.execute(
+                text("SELECT name FROM sqlite_master WHERE type = 'index'")
+            )
+        }
+        duplicates = conn.execute(
+            text(
+                "SELECT COUNT(*) FROM analysis_results "
+                "WHERE username = 'user0' AND analysis_date = '2024-01-01'"
+            )
+        ).scalar()
+    assert "ix_analysis_results_username_date" in indexes
+    assert "ix_analysis_results_username" not in indexes
+    assert duplicates == 1
+
+    # routers/calendar.py get_analysis_history
+    history = (
+        select(RESULT)
+        .where(RESULT.username == "user3", RESULT.analysis_date <= "2024-01-20")
+        .order_by(RESULT.analysis_date.desc())
+        .limit(30)
+    )
+    # crud.get_analysis_result (오늘의 분석 / 저장된 결과 확인)
+    today = select(RESULT).where(
+        RESULT.username == "user3", RESULT.analysis_date == "2024-01-20"
+    )
+    for query in (history, today):
+        plan = _plan(engine, query)
+        assert "USING INDEX ix_analysis_results_username_date" in plan, plan
+        assert "SCAN" not in plan, plan
+        # 정렬도 인덱스 순서로 처리 (임시 B-tree 정렬 없음)
+        assert "TEMP B-TREE" not in plan, plan
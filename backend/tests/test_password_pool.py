@@ -0,0 +1,91 @@
+"""비밀번호 해싱 풀: 대기 작업 한도 초과 시 503, 해시 비용 변경 시 로그인에서 재해싱"""
+
+import pytest
+
+from core import security
+from core.password_pool import PasswordHasher, PasswordHasherBusy, _hash
+from database import SessionLocal
+import crud
+import models
+
+
+def _add_user(username: str, hashed_password: str) -> None:
+    db = SessionLocal()
+    crud.insert_users(
+        db,
+        [
+            {
+                "username": username,
+                "hashed_password": hashed_password,
+                "nickname": username,
+                "birthdate": "1990-05-05",
+                "gender": "F",
+            }
+        ],
+    )
+    db.commit()
+    db.close()
+
+
+def _stored_hash(username: str) -> str:
+    db = SessionLocal()
+    try:
+        return (
+            db.query(models.User.hashed_password).filter_by(username=username).scalar()
+        )
+    finally:
+        db.close()
+
+
+def _login(client, username: str, password: str):
+    return client.post("/api/login", data={"username": username, "password": password})
+
+
+def test_hasher_rejects_when_pending_limit_reached():
+    hasher = PasswordHasher(workers=0, max_pending=1, rounds=4)
+    hasher._reserve()
+    try:
+        with pytest.raises(PasswordHasherBusy):
+            hasher.hash("pw")
+        assert hasher.queue_depth() == 1
+    finally:
+        hasher._release()
+    assert hasher.hash("pw").startswith("$2b$04$")
+    assert hasher.queue_depth() == 0
+
+
+def test_login_sheds_load_with_503(client, monkeypatch):
+    hasher = PasswordHasher(workers=0, max_pending=2, rounds=4)
+    monkeypatch.setattr(security, "password_hasher", hasher)
+    _add_user("busy_user", _hash("pw", 4))
+
+    for _ in range(hasher.max_pending):
+        hasher._reserve()
+    try:
+        response = _login(client, "busy_user", "pw")
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+    finally:
+        for _ in range(hasher.max_pending):
+            hasher._release()
+    assert _login(client, "busy_user", "pw").status_code == 200
+
+
+def test_login_rehashes_when_rounds_change(client, monkeypatch):
+    # BCRYPT_ROUNDS=4 (conftest) 인데 예전 비용 5로 저장된 해시
+    monkeypatch.setattr(
+        security, "password_hasher", PasswordHasher(workers=0, max_pending=4, rounds=4)
+    )
+    _add_user("rehash_user", _hash("pw", 5))
+    assert _stored_hash("rehash_user").startswith("$2b$05$")
+
+    assert _login(client, "rehash_user", "wrong").status_code == 401
+    assert _stored_hash("rehash_user").startswith("$2b$05$")
+
+    assert _login(client, "rehash_user", "pw").status_code == 200
+    rehashed = _stored_hash("rehash_user")
+    assert rehashed.startswith("$2b$04$")
+
+    # 이미 현재 비용이면 다시 저장하지 않음
+    assert _login(client, "rehash_user", "pw").status_code == 200
+    assert _stored_hash("rehash_user") == rehashed
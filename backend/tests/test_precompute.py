@@ -0,0 +1,82 @@
+"""다음 날 분석 결과 사전 계산: 중단 후 이어서 실행, 샤드 분할"""
+
+from sqlalchemy import func
+
+from database import SessionLocal
+import models
+import precompute
+
+
+def _users() -> set:
+    db = SessionLocal()
+    try:
+        return {u for (u,) in db.query(models.User.username)}
+    finally:
+        db.close()
+
+
+def _rows_per_user(target_date: str) -> dict:
+    db = SessionLocal()
+    try:
+        return dict(
+            db.query(models.AnalysisResult.username, func.count())
+            .filter(models.AnalysisResult.analysis_date == target_date)
+            .group_by(models.AnalysisResult.username)
+            .all()
+        )
+    finally:
+        db.close()
+
+
+def _ensure_users(make_user, count: int = 6) -> set:
+    for i in range(count):
+        make_user(f"precompute_{i}", birthdate=f"19{80 + i}-0{i + 1}-1{i}")
+    return _users()
+
+
+def test_stopped_run_resumes_without_gaps_or_duplicates(make_user):
+    users = _ensure_users(make_user)
+    target_date = "2030-01-01"
+    checks = iter([False, True])  # 첫 청크만 저장하고 중단
+
+    first = precompute.precompute(
+        target_date, chunk_size=2, should_stop=lambda: next(checks)
+    )
+    assert first["stopped"]
+    assert first["chunks"] == 1
+    assert 0 < len(_rows_per_user(target_date)) < len(users)
+
+    second = precompute.precompute(target_date, chunk_size=2)
+    assert not second["stopped"]
+    assert second["resumed_after"] is not None
+    # 이미 저장한 유저는 다시 읽지 않음
+    assert first["scanned"] + second["scanned"] == len(users)
+
+    rows = _rows_per_user(target_date)
+    assert set(rows) == users
+    assert set(rows.values()) == {1}
+
+
+def test_shards_cover_every_user_once(make_user):
+    users = _ensure_users(make_user)
+    target_date = "2030-01-02"
+
+    shard0 = precompute.precompute(target_date, chunk_size=3, shard=0, shards=2)
+    covered0 = set(_rows_per_user(target_date))
+    shard1 = precompute.precompute(target_date, chunk_size=3, shard=1, shards=2)
+    covered1 = set(_rows_per_user(target_date)) - covered0
+
+    assert covered0 and covered1
+    assert covered0 | covered1 == users
+    # 두 샤드가 같은 유저를 계산했다면 저장 행 수 합이 유저 수보다 많음
+    assert shard0["rows"] + shard1["rows"] == len(users)
+    assert set(_rows_per_user(target_date).values()) == {1}
+
+
+def test_job_lock_is_exclusive_and_released():
+    with precompute.job_lock() as acquired:
+        assert acquired
+        with precompute.job_lock() as again:
+            assert not again
+    with precompute.job_lock() as acquired:
+        assert acquired
@@ -0,0 +1,82 @@
+"""Server-Timing: 설정이 켜져 있을 때만 헤더가 붙고, SQL 횟수와 구간(span)이 기록되는지 확인"""
+
+import os
+import re
+import subprocess
+import sys
+
+from fastapi.testclient import TestClient
+import pytest
+
+from core.config import settings
+from core.profiling import ServerTimingMiddleware, install_query_hooks
+from core.query_monitor import assert_max_queries
+from database import engine
+
+
+def _timings(header: str) -> dict:
+    """'name;dur=1.0;desc="..."' 목록 -> {name: (dur, desc)}"""
+    timings = {}
+    for part in header.split(", "):
+        name, *params = part.split(";")
+        values = dict(p.split("=", 1) for p in params)
+        timings[name] = (float(values["dur"]), values.get("desc", "").strip('"'))
+    return timings
+
+
+@pytest.fixture(scope="module")
+def timed_client(client):
+    # main.py가 SERVER_TIMING=true일 때와 같은 구성: 엔진 이벤트 + 가장 바깥 미들웨어
+    import main
+
+    install_query_hooks(engine)
+    return TestClient(ServerTimingMiddleware(main.app, log=False))
+
+
+def test_server_timing_absent_when_disabled(client, make_user):
+    assert not settings.SERVER_TIMING
+    headers = make_user("timing_off")
+
+    response = client.get("/api/analyze/today", headers=headers)
+    assert response.status_code == 200
+    assert "server-timing" not in response.headers
+
+
+def test_server_timing_setting_registers_outermost_middleware():
+    code = "import main; print([m.cls.__name__ for m in main.app.user_middleware])"
+    outputs = {}
+    for value in ("true", "false"):
+        proc = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            env={**os.environ, "SERVER_TIMING": value},
+            capture_output=True,
+            text=True,
+        )
+        assert proc.returncode == 0, proc.stderr[-2000:]
+        outputs[value] = proc.stdout.strip().splitlines()[-1]
+
+    assert outputs["true"].startswith("['ServerTimingMiddleware'")
+    assert "ServerTimingMiddleware" not in outputs["false"]
+
+
+def test_server_timing_reports_queries_and_spans(timed_client, make_user):
+    headers = make_user("timing_on")
+
+    with assert_max_queries(engine, 20) as statements:
+        response = timed_client.get("/api/analyze/today", headers=headers)
+    assert response.status_code == 200
+    timings = _timings(response.headers["server-timing"])
+
+    db_count = int(re.match(r"(\d+) queries", timings["db"][1]).group(1))
+    assert db_count == sum(statements.values()) > 0
+    for name in ("saju", "pipeline", "celebrity", "total"):
+        assert name in timings
+    assert timings["total"][0] >= timings["db"][0]
+
+    # 캐시된 결과 재사용: 사주 조회/계산 구간 없이 유명인 조회만
+    cached = _timings(
+        timed_client.get("/api/analyze/today", headers=headers).headers["server-timing"]
+    )
+    assert "celebrity" in cached
+    assert "saju" not in cached
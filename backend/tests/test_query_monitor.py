@@ -0,0 +1,103 @@
+"""SQL 모니터링 (core.query_monitor)"""
+
+import pytest
+from sqlalchemy import create_engine, text, update
+
+from core import query_monitor
+from core.query_monitor import assert_max_queries
+from core.security import create_access_token
+from database import SessionLocal, engine
+import crud
+import models
+
+
+def test_slow_query_log_redacts_user_columns(tmp_path, capsys):
+    engine = create_engine(f"sqlite:///{tmp_path / 'monitor.db'}")
+    models.User.__table__.create(bind=engine)
+    query_monitor.install(engine, slow_ms=1e-9, log_params=True)
+
+    users = [
+        {
+            "username": f"monitor{i}",
+            "hashed_password": "$2b$secret-hash",
+            "nickname": "private-nick",
+            "birthdate": "1990-05-05",
+            "gender": "F",
+        }
+        for i in range(2)
+    ]
+    with engine.begin() as conn:
+        crud.insert_users(conn, users)
+        conn.execute(
+            update(models.User.__table__)
+            .where(models.User.username == "monitor0")
+            .values(hashed_password="$2b$new-secret-hash")
+        )
+        conn.execute(
+            text("UPDATE users SET hashed_password = :pw"), {"pw": "$2b$raw-hash"}
+        )
+        conn.execute(
+            text("SELECT username FROM users WHERE username = :name"),
+            {"name": "monitor1"},
+        )
+
+    out = capsys.readouterr().out
+    assert "🐢" in out
+    for secret in ("secret-hash", "raw-hash", "private-nick", "1990-05-05"):
+        assert secret not in out
+    # 가릴 컬럼이 없는 쿼리의 파라미터는 그대로 기록
+    assert "monitor1" in out
+
+
+@pytest.fixture(scope="module")
+def client(app_db):
+    from fastapi.testclient import TestClient
+
+    import main
+
+    with TestClient(main.app) as client:
+        yield client
+
+
+def _auth_headers(username: str) -> dict:
+    db = SessionLocal()
+    crud.insert_users(
+        db,
+        [
+            {
+                "username": username,
+                "hashed_password": "x",
+                "nickname": username,
+                "birthdate": "1990-05-05",
+                "gender": "F",
+            }
+        ],
+    )
+    db.commit()
+    db.close()
+    return {"Authorization": f"Bearer {create_access_token({'sub': username})}"}
+
+
+def test_analyze_today_query_count(client):
+    headers = _auth_headers("query_today")
+
+    # 사용자 조회, 운영 알고리즘 버전, ETag 버전(저장 전/후), 저장된 결과,
+    # upsert + 버전, 유명인 2번
+    with assert_max_queries(engine, 9):
+        response = client.get("/api/analyze/today", headers=headers)
+    assert response.status_code == 200
+
+    # 캐시된 결과 재사용: ETag 버전 확인과 유명인 조회만 남음
+    with assert_max_queries(engine, 3):
+        response = client.get("/api/analyze/today", headers=headers)
+    assert response.status_code == 200
+
+
+def test_celebrity_list_query_count(client):
+    # 유명인 수와 관계없이 버전 확인 + 목록 조회 (N+1 없음)
+    for path in ("/api/celebrities/INTJ/all", "/api/celebrities/tags/all"):
+        with assert_max_queries(engine, 2) as statements:
+            response = client.get(path)
+        assert response.status_code == 200
+        assert len(response.json()) > 0
+        assert max(statements.values()) == 1
@@ -0,0 +1,98 @@
+"""저장된 분석 결과 재계산: 예전 버전 행만 다시 계산하고, 다시 실행하면 남은 행만 처리"""
+
+from algorithm import active_algorithm
+from database import SessionLocal
+import crud
+import logic
+import models
+import recompute
+
+BIRTHDATE = "1988-08-08"
+DATES = ["2023-11-01", "2023-11-02", "2023-11-03", "2023-11-04"]
+
+
+def _seed_old_rows(username: str) -> None:
+    db = SessionLocal()
+    saju_map = crud.get_saju_map(db, [BIRTHDATE, *DATES])
+    crud.upsert_analysis_results(
+        db,
+        [
+            crud.analysis_row(
+                username,
+                day,
+                logic.analyze_daily(saju_map[BIRTHDATE], saju_map[day]),
+            )
+            for day in DATES
+        ],
+    )
+    # 예전 알고리즘으로 계산된 행처럼 보이도록
+    db.query(models.AnalysisResult).filter_by(username=username).update(
+        {"algorithm_version": "old-v0", "my_persona": "ZZZZ"}
+    )
+    db.commit()
+    db.close()
+
+
+def _rows(username: str) -> list:
+    db = SessionLocal()
+    try:
+        return (
+            db.query(models.AnalysisResult)
+            .filter_by(username=username)
+            .order_by(models.AnalysisResult.id)
+            .all()
+        )
+    finally:
+        db.close()
+
+
+def test_recompute_updates_old_versions_and_resumes_by_version(make_user):
+    make_user("recompute_user", birthdate=BIRTHDATE)
+    _seed_old_rows("recompute_user")
+
+    report = recompute.recompute(usernames=["recompute_user"], chunk_size=3)
+    assert report["updated"] == len(DATES)
+
+    db = SessionLocal()
+    algorithm = active_algorithm(db)
+    saju_map = crud.get_saju_map(db, [BIRTHDATE, *DATES])
+    db.close()
+    for row in _rows("recompute_user"):
+        expected = logic.analyze_daily(
+            saju_map[BIRTHDATE], saju_map[row.analysis_date], algorithm
+        )
+        assert row.algorithm_version == algorithm.version
+        assert row.my_persona == expected["my_persona"]
+        assert row.my_destiny == expected["my_destiny"]
+        assert row.lucky_element == expected["lucky_element"]
+
+    # 이미 현재 버전인 행은 다시 대상이 되지 않음
+    again = recompute.recompute(usernames=["recompute_user"])
+    assert again["total"] == 0
+    assert again["updated"] == 0
+
+
+def test_force_continues_after_id(make_user):
+    make_user("recompute_force", birthdate=BIRTHDATE)
+    _seed_old_rows("recompute_force")
+    recompute.recompute(usernames=["recompute_force"])
+
+    rows = _rows("recompute_force")
+    after_id = rows[1].id
+    db = SessionLocal()
+    db.query(models.AnalysisResult).filter_by(username="recompute_force").update(
+        {"my_persona": "ZZZZ"}
+    )
+    db.commit()
+    db.close()
+
+    report = recompute.recompute(
+        usernames=["recompute_force"], force=True, after_id=after_id
+    )
+
+    assert report["updated"] == len(DATES) - 2
+    assert report["last_id"] == rows[-1].id
+    personas = [row.my_persona for row in _rows("recompute_force")]
+    # after_id까지는 그대로, 그 다음 행부터 다시 계산
+    assert personas[:2] == ["ZZZZ", "ZZZZ"]
+    assert "ZZZZ" not in personas[2:]
@@ -0,0 +1,84 @@
+"""사주 계산 (saju_calendar): 생년월일 검증과 번들 CSV와의 일치"""
+
+from datetime import date
+import csv
+import os
+
+import pytest
+
+from core.saju_file import PILLAR_NAMES, pillar_to_indices
+import saju_calendar
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COLUMNS = ("year_ganji", "month_ganji", "day_ganji")
+
+
+@pytest.mark.parametrize("value", ["1990-05-05", "1900-01-01", "2100-12-31"])
+def test_is_supported_date_accepts_canonical_dates(value):
+    assert saju_calendar.is_supported_date(value)
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "19900505",
+        "1990-W01-1",
+        "1990-5-5",
+        "1990-05-5",
+        " 1990-05-05",
+        "1990-02-30",
+        "1899-12-31",
+        "2101-01-01",
+        "",
+        None,
+    ],
+)
+def test_is_supported_date_rejects_other_forms(value):
+    assert not saju_calendar.is_supported_date(value)
+
+
+def _csv_rows() -> list:
+    path = os.path.join(BACKEND_DIR, "data", "saju_master_db.csv")
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def _pillar_index(name: str) -> int:
+    # 원본 CSV는 윤달의 월주가 비어 있음
+    return PILLAR_NAMES.index(name) if name else saju_calendar.MISSING
+
+
+def test_pillars_match_bundled_csv():
+    rows = _csv_rows()
+    ordinals = [date.fromisoformat(r["solar_date"]).toordinal() for r in rows]
+    pillars = saju_calendar.pillars_for_ordinals(ordinals)
+
+    for col, computed in zip(COLUMNS, pillars):
+        expected = [_pillar_index(r[col]) for r in rows]
+        mismatched = [
+            rows[i]["solar_date"]
+            for i, (a, b) in enumerate(zip(computed.tolist(), expected))
+            if a != b
+        ]
+        assert mismatched == [], f"{col}: {len(mismatched)}건 불일치"
+
+
+def test_get_saju_matches_csv_around_month_boundaries():
+    # 절기/음력 달이 바뀌는 날과 그 앞뒤 날짜 (월주·연주가 바뀌는 경계)
+    rows = _csv_rows()
+    boundaries = [
+        i
+        for i in range(1, len(rows))
+        if rows[i]["month_ganji"] != rows[i - 1]["month_ganji"]
+    ]
+    sample = sorted({j for i in boundaries for j in (i - 1, i, i + 1) if j < len(rows)})
+    assert len(sample) > 1000
+
+    for i in sample:
+        row = rows[i]
+        expected = [
+            index
+            for col in COLUMNS
+            for index in pillar_to_indices(_pillar_index(row[col]))
+        ]
+        assert saju_calendar.get_saju(row["solar_date"]) == expected, row
@@ -0,0 +1,52 @@
+"""인증 캐시 무효화: 계정 삭제/변경 후 캐시된 토큰과 사용자 정보가 남지 않는지 확인"""
+
+from fastapi import HTTPException
+import pytest
+
+from core.security import (
+    create_access_token,
+    get_current_user,
+    invalidate_user_cache,
+    principal_cache,
+    token_cache,
+)
+from database import SessionLocal
+import crud
+import models
+
+
+def test_invalidate_user_cache_drops_tokens_and_principal(app_db):
+    db = SessionLocal()
+    try:
+        crud.insert_users(
+            db,
+            [
+                {
+                    "username": "cache_user",
+                    "hashed_password": "x",
+                    "nickname": "cache",
+                    "birthdate": "1990-05-05",
+                    "gender": "F",
+                }
+            ],
+        )
+        db.commit()
+        tokens = [create_access_token({"sub": "cache_user"}) for _ in range(2)]
+        other = create_access_token({"sub": "other_user"})
+        token_cache.set(other, "other_user")
+        for token in tokens:
+            assert get_current_user(token, db).username == "cache_user"
+        assert all(token_cache.get(token) == "cache_user" for token in tokens)
+
+        db.query(models.User).filter_by(username="cache_user").delete()
+        db.commit()
+        invalidate_user_cache("cache_user")
+
+        assert principal_cache.get("cache_user") is None
+        assert all(token_cache.get(token) is None for token in tokens)
+        assert token_cache.get(other) == "other_user"
+        with pytest.raises(HTTPException) as exc:
+            get_current_user(tokens[0], db)
+        assert exc.value.status_code == 401
+    finally:
+        db.close()
@@ -0,0 +1,148 @@
+"""파라미터 스윕: 격자/경로 검증, 날짜 범위 제한, 결과 캐시, 분포 변화량"""
+
+import pytest
+
+from core.config import settings
+from database import SessionLocal
+import logic
+import simulate
+
+# 작은 대상 (생년월일 10일 x 날짜 10일 = 100쌍, 전수 계산)
+POPULATION = {
+    "sample": 1000,
+    "date_from": "2025-01-01",
+    "date_to": "2025-01-10",
+    "birth_from": "1990-01-01",
+    "birth_to": "1990-01-10",
+}
+
+
+@pytest.mark.parametrize(
+    "path",
+    ["axes.X.fire", "axes.E", "axes.E.luck", "unknown", "axes.E.fire.extra"],
+)
+def test_set_param_rejects_unknown_path(path):
+    params = logic.normalize_params({})
+    with pytest.raises(ValueError, match="알 수 없는 파라미터 경로"):
+        simulate.set_param(params, path, 1.0)
+
+
+def test_set_param_changes_scalar_and_axis_values():
+    params = logic.normalize_params({})
+    simulate.set_param(params, "birth_weight", 0.4)
+    simulate.set_param(params, "axes.E.fire", 0.9)
+    assert params["birth_weight"] == 0.4
+    assert params["axes"]["E"]["fire"] == 0.9
+
+
+@pytest.mark.parametrize(
+    "grid, message",
+    [
+        ({}, "grid가 비어 있습니다"),
+        ({"birth_weight": []}, "값 목록이 비어 있습니다"),
+        ({"birth_weight": 0.4}, "값 목록이 비어 있습니다"),
+        ({"nope": [1.0]}, "알 수 없는 파라미터 경로"),
+        ({"strength": [-1]}, "strength"),
+    ],
+)
+def test_expand_grid_errors(grid, message):
+    with pytest.raises(ValueError, match=message):
+        simulate.expand_grid(logic.normalize_params({}), grid)
+
+
+def test_expand_grid_point_limit(monkeypatch):
+    monkeypatch.setattr(settings, "SWEEP_MAX_POINTS", 4)
+    base = logic.normalize_params({})
+    grid = {"birth_weight": [0.3, 0.4], "strength": [1.0, 1.2]}
+    points = simulate.expand_grid(base, grid)
+    assert [overrides for overrides, _ in points] == [
+        {"birth_weight": 0.3, "strength": 1.0},
+        {"birth_weight": 0.3, "strength": 1.2},
+        {"birth_weight": 0.4, "strength": 1.0},
+        {"birth_weight": 0.4, "strength": 1.2},
+    ]
+    assert base["birth_weight"] == logic.DEFAULT_PARAMS["birth_weight"]
+
+    grid["sky_weight"] = [0.9]
+    grid["earth_weight"] = [1.0, 1.1]
+    with pytest.raises(ValueError, match="격자 점이 너무 많습니다"):
+        simulate.expand_grid(base, grid)
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"date_from": "0001-01-01", "date_to": "9999-12-31"},
+        {"birth_from": "1800-01-01", "birth_to": "1990-01-10"},
+        {"date_from": "2025-01-01", "date_to": "2101-01-01"},
+    ],
+)
+def test_date_range_outside_calendar_is_rejected(app_db, options):
+    db = SessionLocal()
+    try:
+        with pytest.raises(ValueError, match="사이여야 합니다"):
+            simulate.build_population(db, **{**POPULATION, **options})
+    finally:
+        db.close()
+
+
+def test_admin_sweep_rejects_huge_date_range(client, make_user):
+    response = client.post(
+        "/api/admin/algorithm/sweep",
+        json={
+            "grid": {"birth_weight": [0.4]},
+            "date_from": "0001-01-01",
+            "date_to": "9999-12-31",
+        },
+        headers=make_user("admin"),
+    )
+    assert response.status_code == 400
+
+
+def test_sweep_reuses_cached_tables(app_db):
+    grid = {"birth_weight": [0.3, 0.5], "strength": [1.2]}
+    db = SessionLocal()
+    try:
+        first = simulate.sweep(db, grid, **POPULATION)
+        second = simulate.sweep(db, grid, **POPULATION)
+    finally:
+        db.close()
+
+    assert first["population"]["pairs"] == 100
+    assert first["population"]["exhaustive"] is True
+    assert second["cache_hits"] == len(second["points"]) + 1  # 기준 버전 포함
+    assert second["workers"] == 0
+    assert second["baseline"] == first["baseline"]
+    assert second["points"] == first["points"]
+
+    # 대상이 바뀌면 다시 계산
+    db = SessionLocal()
+    try:
+        other = simulate.sweep(db, grid, **{**POPULATION, "date_to": "2025-01-11"})
+    finally:
+        db.close()
+    assert other["cache_hits"] == 0
+    assert other["workers"] == 1
+
+
+def test_shift_is_total_variation_distance():
+    before = {
+        "persona": {"ENFP": 0.5, "ISTJ": 0.5},
+        "destiny": {"ENFP": 0.25, "ISTJ": 0.75},
+        "lucky_element": {"목": 0.2, "화": 0.3, "토": 0.5},
+    }
+    after = {
+        "persona": {"ENFP": 1.0, "ISTJ": 0.0},
+        "destiny": {"ENFP": 0.25, "ISTJ": 0.75},
+        "lucky_element": {"목": 0.3, "화": 0.1, "토": 0.6},
+    }
+    assert simulate.shift(before, before) == {
+        "persona": 0,
+        "destiny": 0,
+        "lucky_element": 0,
+    }
+    assert simulate.shift(before, after) == {
+        "persona": 0.5,
+        "destiny": 0,
+        "lucky_element": 0.2,
+    }
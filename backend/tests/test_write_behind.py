@@ -0,0 +1,55 @@
+"""write-behind 버퍼: 저장 중인 결과와 계정 정리(discard_user) 사이의 경쟁"""
+
+import threading
+import time
+
+import crud
+from core.write_behind import AnalysisWriteBuffer
+from database import SessionLocal
+import models
+
+
+def _row(username: str, analysis_date: str) -> dict:
+    return {
+        "username": username,
+        "analysis_date": analysis_date,
+        "my_persona": "INTJ",
+        "algorithm_version": "1",
+    }
+
+
+def test_discard_user_waits_for_inflight_flush(app_db, monkeypatch):
+    buffer = AnalysisWriteBuffer(flush_ms=1000, batch_size=100)
+    buffer.add(_row("wb_user", "2024-02-01"))
+    buffer.add(_row("wb_other", "2024-02-01"))
+
+    # 큐에서 꺼낸 뒤 커밋 전에 멈춰 있는 플러시
+    writing = threading.Event()
+    upsert = crud.upsert_analysis_results
+
+    def slow_upsert(db, rows):
+        writing.set()
+        time.sleep(0.3)
+        upsert(db, rows)
+
+    monkeypatch.setattr(crud, "upsert_analysis_results", slow_upsert)
+    flusher = threading.Thread(target=buffer.flush)
+    flusher.start()
+    assert writing.wait(5)
+
+    # 저장 중인 행이 커밋된 뒤에 반환되므로, 이어지는 DELETE가 그 행을 지움
+    buffer.discard_user("wb_user")
+    db = SessionLocal()
+    try:
+        crud.delete_analyses_from(db, "wb_user", "2024-01-01")
+        db.commit()
+        flusher.join()
+        remaining = (
+            db.query(models.AnalysisResult.username)
+            .filter(models.AnalysisResult.analysis_date == "2024-02-01")
+            .all()
+        )
+    finally:
+        db.close()
+    assert [r[0] for r in remaining] == ["wb_other"]
+    assert buffer.flushed_rows == 2